@@ -0,0 +1,2167 @@
+"""Estatísticas dos jogos do Vasco sem dependência de interface.
+
+Usado tanto pelo app Tk (`main.py`) quanto pelo servidor web (`web_app.py`).
+`analisar_jogos` percorre a lista uma única vez, em ordem cronológica, e monta
+os índices de resumo, confrontos por adversário, passagens de técnicos,
+estádios e campanhas por competição/ano. As demais funções só leem esses
+índices. Sequências (invencibilidade, jejum etc.) ficam em `MotorSequencias` e
+os filtros combináveis por dimensão em `IndiceBitmap`; fatias e roll-ups
+agregados em `CuboAgregados`; duplas de jogadores em `MatrizParcerias`.
+`CacheIndices` guarda esses índices por versão dos jogos para os dois apps.
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime
+from heapq import heappush, heapreplace, nsmallest
+from itertools import accumulate, chain
+from operator import add, eq, gt, lt, sub
+
+from storage_sqlite import player_key
+
+try:
+    import numpy as np
+    NUMPY_OK = True
+except Exception:
+    np = None
+    NUMPY_OK = False
+
+# Sem NumPy o sorteio roda em Python puro (~1 s para 100 mil temporadas de 38
+# jogos); a tela de Jogos Futuros limita a projeção a este total para não travar a interface.
+SIMULACOES_MAX_SEM_NUMPY = 20_000
+
+SEM_TECNICO = "(Sem Técnico)"
+SEM_ESTADIO = "Não informado"
+GOLEADOR_DESCONHECIDO = "Desconhecido"
+RESULTADO_TEXTO = {"V": "Vitória", "E": "Empate", "D": "Derrota"}
+
+
+def _inteiro(valor) -> int:
+    try:
+        return int(valor or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_data(texto) -> datetime | None:
+    try:
+        return datetime.strptime(str(texto or "").strip(), "%d/%m/%Y")
+    except ValueError:
+        return None
+
+
+def data_ordinal(jogo: dict) -> int | None:
+    """Ordinal da data do jogo; usa o valor pré-calculado por `load_matches` quando existe."""
+    if "data_ordinal" in jogo:
+        return jogo["data_ordinal"]
+    data = parse_data(jogo.get("data"))
+    return data.toordinal() if data else None
+
+
+def temporada_jogo(jogo: dict) -> int | None:
+    if "temporada" in jogo:
+        return jogo["temporada"]
+    ordinal = data_ordinal(jogo)
+    return date.fromordinal(ordinal).year if ordinal else None
+
+
+def placar_jogo(jogo: dict) -> tuple[int, int]:
+    placar = jogo.get("placar") or {}
+    return _inteiro(placar.get("vasco")), _inteiro(placar.get("adversario"))
+
+
+def resultado_jogo(jogo: dict) -> str:
+    """Sigla do resultado do ponto de vista do Vasco: "V", "E" ou "D"."""
+    gols_vasco, gols_adv = placar_jogo(jogo)
+    if gols_vasco > gols_adv:
+        return "V"
+    if gols_vasco < gols_adv:
+        return "D"
+    return "E"
+
+
+def normalizar_tecnico(nome) -> str:
+    return str(nome or "").strip() or SEM_TECNICO
+
+
+def chave_cronologica(jogo: dict):
+    return (
+        data_ordinal(jogo) or 0,
+        str(jogo.get("adversario", "")).casefold(),
+    )
+
+
+def ordenar_jogos_por_data(jogos: list[dict]) -> list[dict]:
+    return sorted(jogos, key=chave_cronologica)
+
+
+def contar_goleadores(gols_lista) -> Counter:
+    contagem = Counter()
+    if not isinstance(gols_lista, list):
+        return contagem
+    for item in gols_lista:
+        if isinstance(item, dict):
+            nome = str(item.get("nome", "")).strip() or GOLEADOR_DESCONHECIDO
+            try:
+                qtd = int(item.get("gols", 1))
+            except (TypeError, ValueError):
+                qtd = 1
+            contagem[nome] += max(1, qtd)
+        elif isinstance(item, str):
+            nome = item.strip()
+            if nome:
+                contagem[nome] += 1
+    return contagem
+
+
+def formatar_goleadores(contagem: Counter) -> str:
+    if not contagem:
+        return "—"
+    partes = []
+    for nome, qtd in contagem.most_common():
+        partes.append(f"{nome} x{qtd}" if qtd > 1 else nome)
+    return ", ".join(partes)
+
+
+def texto_artilheiro(artilheiros: Counter) -> str:
+    top = artilheiros.most_common(1)
+    if not top:
+        return "—"
+    nome, gols = top[0]
+    return f"{nome} ({gols})"
+
+
+def posicao_mais_recente(jogos: list[dict]):
+    posicao = None
+    for jogo in jogos:
+        valor = jogo.get("posicao_tabela")
+        if valor in (None, ""):
+            continue
+        try:
+            posicao = int(valor)
+        except (ValueError, TypeError):
+            continue
+    return posicao
+
+
+def novo_resumo() -> dict:
+    return {
+        "jogos": 0,
+        "casa": 0,
+        "fora": 0,
+        "vitorias": 0,
+        "empates": 0,
+        "derrotas": 0,
+        "gols_pro": 0,
+        "gols_contra": 0,
+    }
+
+
+def acumular_resumo(stats: dict, jogo: dict, sinal: int = 1):
+    """Soma (`sinal=1`) ou desfaz (`sinal=-1`) a contribuição de um jogo."""
+    gols_vasco, gols_adv = placar_jogo(jogo)
+    stats["jogos"] += sinal
+    if jogo.get("local", "casa") == "fora":
+        stats["fora"] += sinal
+    else:
+        stats["casa"] += sinal
+    stats["gols_pro"] += gols_vasco * sinal
+    stats["gols_contra"] += gols_adv * sinal
+    if gols_vasco > gols_adv:
+        stats["vitorias"] += sinal
+    elif gols_vasco < gols_adv:
+        stats["derrotas"] += sinal
+    else:
+        stats["empates"] += sinal
+
+
+def finalizar_resumo(stats: dict) -> dict:
+    """Devolve uma cópia com pontos, saldo, aproveitamento e médias calculados."""
+    final = dict(stats)
+    jogos = final["jogos"]
+    final["pontos"] = final["vitorias"] * 3 + final["empates"]
+    final["saldo"] = final["gols_pro"] - final["gols_contra"]
+    final["aproveitamento"] = round((final["pontos"] / (jogos * 3)) * 100, 1) if jogos else 0.0
+    final["media_gols_pro"] = round(final["gols_pro"] / jogos, 2) if jogos else 0.0
+    final["media_gols_contra"] = round(final["gols_contra"] / jogos, 2) if jogos else 0.0
+    return final
+
+
+def resumir_jogos(jogos: list[dict]) -> dict:
+    stats = novo_resumo()
+    for jogo in jogos:
+        acumular_resumo(stats, jogo)
+    final = finalizar_resumo(stats)
+    final["posicao"] = posicao_mais_recente(jogos)
+    return final
+
+
+# Ordem dos campos nas somas de prefixo de `analisar_jogos`.
+CAMPOS_PREFIXO = ("jogos", "casa", "fora", "vitorias", "empates", "derrotas", "gols_pro", "gols_contra")
+
+
+def _linha_prefixo(anterior: tuple, jogo: dict) -> tuple:
+    jogos, casa, fora, vitorias, empates, derrotas, gols_pro, gols_contra = anterior
+    gols_vasco, gols_adv = placar_jogo(jogo)
+    if jogo.get("local", "casa") == "fora":
+        fora += 1
+    else:
+        casa += 1
+    if gols_vasco > gols_adv:
+        vitorias += 1
+    elif gols_vasco < gols_adv:
+        derrotas += 1
+    else:
+        empates += 1
+    return (jogos + 1, casa, fora, vitorias, empates, derrotas, gols_pro + gols_vasco, gols_contra + gols_adv)
+
+
+def resumo_intervalo(analise: dict, inicio: int, fim: int) -> dict:
+    """Resumo das posições cronológicas `inicio..fim` (inclusivas) via somas de prefixo."""
+    prefixos = analise["prefixos"]
+    return dict(zip(CAMPOS_PREFIXO, (b - a for a, b in zip(prefixos[inicio], prefixos[fim + 1]))))
+
+
+def _novo_grupo(**extras) -> dict:
+    grupo = {"resumo": novo_resumo(), "artilheiros": Counter(), "partidas": []}
+    grupo.update(extras)
+    return grupo
+
+
+def _acumular_adversario(adversarios: dict, idx: int, jogo: dict, goleadores_vasco: Counter):
+    nome_adv = str(jogo.get("adversario", "")).strip()
+    if not nome_adv:
+        return
+    grupo = adversarios.get(nome_adv.casefold())
+    if grupo is None:
+        grupo = adversarios[nome_adv.casefold()] = _novo_grupo(adversario=nome_adv, carrascos=Counter())
+    acumular_resumo(grupo["resumo"], jogo)
+    grupo["artilheiros"].update(goleadores_vasco)
+    grupo["carrascos"].update(contar_goleadores(jogo.get("gols_adversario", [])))
+    grupo["partidas"].append(idx)
+
+
+def indexar_adversarios(jogos: list[dict]) -> dict:
+    """Só o índice de confrontos de `analisar_jogos`, para quem não precisa do resto.
+
+    O resultado serve direto para `retrospecto` e `listar_adversarios`.
+    """
+    jogos = list(jogos)
+    ordem = sorted(range(len(jogos)), key=lambda idx: chave_cronologica(jogos[idx]))
+    adversarios = {}
+    for idx in ordem:
+        jogo = jogos[idx]
+        _acumular_adversario(adversarios, idx, jogo, contar_goleadores(jogo.get("gols_vasco", [])))
+    return {"jogos": jogos, "ordem": ordem, "adversarios": adversarios}
+
+
+def analisar_jogos(jogos: list[dict]) -> dict:
+    """Monta todos os índices de estatística em uma única passada cronológica.
+
+    `partidas` de cada grupo guarda índices na lista original (`analise["jogos"]`),
+    que é como as telas endereçam os jogos para edição.
+
+    As passagens de técnicos são segmentos `(tecnico, inicio, fim)` sobre as
+    posições de `ordem`, achados por run-length na mesma passada; os números de
+    cada segmento saem de `prefixos` (somas acumuladas de `CAMPOS_PREFIXO`).
+    """
+    jogos = list(jogos)
+    ordem = sorted(range(len(jogos)), key=lambda idx: chave_cronologica(jogos[idx]))
+    total = novo_resumo()
+    adversarios = {}
+    tecnicos = {}
+    campanhas = {}
+    prefixos = [(0,) * len(CAMPOS_PREFIXO)]
+    passagens = []
+    artilheiros_passagens = []
+    tecnico_anterior = None
+
+    for posicao, idx in enumerate(ordem):
+        jogo = jogos[idx]
+        goleadores_vasco = contar_goleadores(jogo.get("gols_vasco", []))
+        acumular_resumo(total, jogo)
+        prefixos.append(_linha_prefixo(prefixos[-1], jogo))
+
+        _acumular_adversario(adversarios, idx, jogo, goleadores_vasco)
+
+        tecnico = normalizar_tecnico(jogo.get("tecnico"))
+        grupo = tecnicos.get(tecnico)
+        if grupo is None:
+            grupo = tecnicos[tecnico] = _novo_grupo(tecnico=tecnico, passagens=[])
+        acumular_resumo(grupo["resumo"], jogo)
+        grupo["artilheiros"].update(goleadores_vasco)
+        grupo["partidas"].append(idx)
+        if tecnico != tecnico_anterior:
+            grupo["passagens"].append(len(passagens))
+            passagens.append((tecnico, posicao, posicao))
+            artilheiros_passagens.append(Counter())
+            tecnico_anterior = tecnico
+        else:
+            passagens[-1] = (tecnico, passagens[-1][1], posicao)
+        artilheiros_passagens[-1].update(goleadores_vasco)
+
+        ano = temporada_jogo(jogo)
+        competicao = str(jogo.get("competicao", "")).strip()
+        if ano and competicao:
+            chave = (ano, competicao.casefold())
+            grupo = campanhas.get(chave)
+            if grupo is None:
+                grupo = campanhas[chave] = _novo_grupo(ano=ano, competicao=competicao)
+            acumular_resumo(grupo["resumo"], jogo)
+            grupo["artilheiros"].update(goleadores_vasco)
+            grupo["partidas"].append(idx)
+
+    return {
+        "jogos": jogos,
+        "ordem": ordem,
+        "resumo": total,
+        "prefixos": prefixos,
+        "passagens": passagens,
+        "artilheiros_passagens": artilheiros_passagens,
+        "adversarios": adversarios,
+        "tecnicos": tecnicos,
+        "campanhas": campanhas,
+    }
+
+
+DIMENSOES_BITMAP = {
+    "competicao": lambda jogo: str(jogo.get("competicao", "")).strip(),
+    "tecnico": lambda jogo: normalizar_tecnico(jogo.get("tecnico")),
+    "local": lambda jogo: "fora" if jogo.get("local", "casa") == "fora" else "casa",
+    "estadio": lambda jogo: str(jogo.get("estadio", "")).strip() or SEM_ESTADIO,
+    "adversario": lambda jogo: str(jogo.get("adversario", "")).strip(),
+    "temporada": temporada_jogo,
+    "resultado": resultado_jogo,
+    "placar": lambda jogo: "{}x{}".format(*placar_jogo(jogo)),
+}
+
+
+def _bitset(posicoes, tamanho: int) -> int:
+    """Monta o inteiro de uma vez por bytearray (OR bit a bit seria quadrático)."""
+    buffer = bytearray((tamanho + 7) // 8)
+    for posicao in posicoes:
+        buffer[posicao >> 3] |= 1 << (posicao & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _posicoes(mascara: int):
+    """Posições dos bits ligados, da menor para a maior."""
+    bits = bin(mascara)[:1:-1]
+    posicao = bits.find("1")
+    while posicao != -1:
+        yield posicao
+        posicao = bits.find("1", posicao + 1)
+
+
+class IndiceBitmap:
+    """Filtros combináveis sobre os jogos usando um bitset (int) por valor de dimensão.
+
+    O bit `p` representa o `p`-ésimo jogo em ordem cronológica. Combinar filtros
+    é um AND entre inteiros; contagens saem de `int.bit_count` e as somas de gols
+    de planos de bits (o plano `k` marca os jogos cujo placar tem o bit `k`
+    ligado), então nenhum resumo precisa revisitar os jogos.
+    """
+
+    def __init__(self, jogos: list[dict]):
+        self.jogos = list(jogos)
+        self.ordem = sorted(range(len(self.jogos)), key=lambda idx: chave_cronologica(self.jogos[idx]))
+        self.todos = (1 << len(self.ordem)) - 1
+        self.posicao_de = {idx: posicao for posicao, idx in enumerate(self.ordem)}
+        posicoes = {dimensao: {} for dimensao in DIMENSOES_BITMAP}
+        posicoes_planos = {"gols_pro": [], "gols_contra": []}
+        for posicao, idx in enumerate(self.ordem):
+            jogo = self.jogos[idx]
+            for dimensao, extrair in DIMENSOES_BITMAP.items():
+                posicoes[dimensao].setdefault(extrair(jogo), []).append(posicao)
+            for campo, gols in zip(("gols_pro", "gols_contra"), placar_jogo(jogo)):
+                planos = posicoes_planos[campo]
+                gols = max(0, gols)
+                while gols.bit_length() > len(planos):
+                    planos.append([])
+                for k in range(gols.bit_length()):
+                    if gols >> k & 1:
+                        planos[k].append(posicao)
+        tamanho = len(self.ordem)
+        self.bitmaps = {
+            dimensao: {chave: _bitset(lista, tamanho) for chave, lista in valores.items()}
+            for dimensao, valores in posicoes.items()
+        }
+        self._planos = {
+            campo: [_bitset(lista, tamanho) for lista in planos] for campo, planos in posicoes_planos.items()
+        }
+        self._por_texto = {
+            dimensao: self._agrupar_por_texto(valores) for dimensao, valores in self.bitmaps.items()
+        }
+
+    @staticmethod
+    def _agrupar_por_texto(valores: dict) -> dict:
+        por_texto = {}
+        for chave, bitmap in valores.items():
+            texto = str(chave).strip().casefold()
+            por_texto[texto] = por_texto.get(texto, 0) | bitmap
+        return por_texto
+
+    def valores(self, dimensao: str, mascara: int | None = None) -> list:
+        """Valores da dimensão presentes em `mascara` (todos, se omitida)."""
+        mascara = self.todos if mascara is None else mascara
+        return [chave for chave, bitmap in self.bitmaps[dimensao].items() if bitmap & mascara]
+
+    def mascara(self, **filtros) -> int:
+        """AND entre as dimensões; uma lista/conjunto de valores vira OR dentro da dimensão.
+
+        A comparação ignora caixa; filtros vazios (`None`, "", "Todos") são ignorados.
+        """
+        resultado = self.todos
+        for dimensao, valor in filtros.items():
+            if valor is None or valor == "" or valor == "Todos":
+                continue
+            if dimensao not in self.bitmaps:
+                raise ValueError(f"Dimensão de filtro desconhecida: {dimensao}")
+            valores = valor if isinstance(valor, (list, tuple, set, frozenset)) else (valor,)
+            por_texto = self._por_texto[dimensao]
+            uniao = 0
+            for item in valores:
+                uniao |= por_texto.get(str(item).strip().casefold(), 0)
+            resultado &= uniao
+        return resultado
+
+    def buscar_texto(self, termo: str, dimensoes=("adversario", "competicao", "tecnico"), sem_acentos: bool = False) -> int:
+        """OR dos valores de `dimensoes` que contêm `termo` (só os valores distintos são testados)."""
+        termo_cf = str(termo or "").strip().casefold()
+        if not termo_cf:
+            return self.todos
+        termo_chave = player_key(termo_cf) if sem_acentos else None
+        resultado = 0
+        for dimensao in dimensoes:
+            for chave, bitmap in self.bitmaps[dimensao].items():
+                texto = str(chave)
+                if termo_cf in texto.casefold() or (termo_chave and termo_chave in player_key(texto)):
+                    resultado |= bitmap
+        return resultado
+
+    def mascara_de(self, indices) -> int:
+        """Máscara dos jogos cujos índices (na lista original) estão em `indices`."""
+        posicao_de = self.posicao_de
+        return _bitset((posicao_de[idx] for idx in indices if idx in posicao_de), len(self.ordem))
+
+    def contar(self, mascara: int) -> int:
+        return mascara.bit_count()
+
+    def indices(self, mascara: int) -> list[int]:
+        """Índices na lista original dos jogos da máscara, em ordem cronológica."""
+        ordem = self.ordem
+        return [ordem[posicao] for posicao in _posicoes(mascara)]
+
+    def _soma(self, campo: str, mascara: int) -> int:
+        return sum((mascara & plano).bit_count() << k for k, plano in enumerate(self._planos[campo]))
+
+    def resumo(self, mascara: int | None = None) -> dict:
+        mascara = self.todos if mascara is None else mascara
+        locais = self.bitmaps["local"]
+        resultados = self.bitmaps["resultado"]
+        return finalizar_resumo({
+            "jogos": mascara.bit_count(),
+            "casa": (mascara & locais.get("casa", 0)).bit_count(),
+            "fora": (mascara & locais.get("fora", 0)).bit_count(),
+            "vitorias": (mascara & resultados.get("V", 0)).bit_count(),
+            "empates": (mascara & resultados.get("E", 0)).bit_count(),
+            "derrotas": (mascara & resultados.get("D", 0)).bit_count(),
+            "gols_pro": self._soma("gols_pro", mascara),
+            "gols_contra": self._soma("gols_contra", mascara),
+        })
+
+    def linhas_por(self, dimensao: str, mascara: int | None = None) -> list[dict]:
+        """Uma linha por valor da dimensão em `mascara`, com `partidas` como pares (índice, jogo)."""
+        mascara = self.todos if mascara is None else mascara
+        rows = []
+        for chave, bitmap in self.bitmaps[dimensao].items():
+            recorte = bitmap & mascara
+            if not recorte:
+                continue
+            stats = self.resumo(recorte)
+            rows.append({
+                dimensao: chave,
+                "jogos": stats["jogos"],
+                "vitorias": stats["vitorias"],
+                "empates": stats["empates"],
+                "derrotas": stats["derrotas"],
+                "gols_pro": stats["gols_pro"],
+                "gols_contra": stats["gols_contra"],
+                "saldo": stats["saldo"],
+                "partidas": [(idx, self.jogos[idx]) for idx in self.indices(recorte)],
+            })
+        rows.sort(key=lambda item: str(item[dimensao]).casefold())
+        return rows
+
+
+DIMENSOES_CUBO = ("temporada", "competicao", "tecnico", "local", "estadio")
+_MEDIDAS_VAZIAS = (0,) * len(CAMPOS_PREFIXO)
+
+
+class CuboAgregados:
+    """Cubo OLAP dos jogos: uma célula por combinação de temporada, competição,
+    técnico, local e estádio, com as medidas de `CAMPOS_PREFIXO`.
+
+    Os valores de cada dimensão são codificados em inteiros (dicionário por
+    dimensão), então a chave de uma célula é uma tupla curta de códigos. Fatias
+    e roll-ups somam só as células que casam com os filtros, encontradas pela
+    interseção dos índices valor -> células; os jogos não são relidos. Inclusão,
+    exclusão e edição de jogos atualizam uma única célula.
+    """
+
+    def __init__(self, jogos=()):
+        self.valores = {dimensao: [] for dimensao in DIMENSOES_CUBO}
+        self._codigos = {dimensao: {} for dimensao in DIMENSOES_CUBO}
+        self._por_texto = {dimensao: {} for dimensao in DIMENSOES_CUBO}
+        self._celulas_de = {dimensao: {} for dimensao in DIMENSOES_CUBO}
+        self.celulas = {}
+        extratores = [DIMENSOES_BITMAP[dimensao] for dimensao in DIMENSOES_CUBO]
+        celulas = self.celulas
+        for jogo in jogos:
+            chave = self._chave(extrair(jogo) for extrair in extratores)
+            medidas = _linha_prefixo(_MEDIDAS_VAZIAS, jogo)
+            celula = celulas.get(chave)
+            if celula is None:
+                celulas[chave] = list(medidas)
+                self._indexar(chave)
+            else:
+                for posicao, valor in enumerate(medidas):
+                    celula[posicao] += valor
+
+    def __len__(self) -> int:
+        return len(self.celulas)
+
+    def _chave(self, valores) -> tuple:
+        chave = []
+        for dimensao, valor in zip(DIMENSOES_CUBO, valores):
+            codigos = self._codigos[dimensao]
+            codigo = codigos.get(valor)
+            if codigo is None:
+                codigo = codigos[valor] = len(self.valores[dimensao])
+                self.valores[dimensao].append(valor)
+                self._por_texto[dimensao].setdefault(str(valor).strip().casefold(), []).append(codigo)
+            chave.append(codigo)
+        return tuple(chave)
+
+    def _indexar(self, chave: tuple):
+        for dimensao, codigo in zip(DIMENSOES_CUBO, chave):
+            self._celulas_de[dimensao].setdefault(codigo, set()).add(chave)
+
+    def aplicar(self, jogo: dict, sinal: int = 1):
+        chave = self._chave(DIMENSOES_BITMAP[dimensao](jogo) for dimensao in DIMENSOES_CUBO)
+        celula = self.celulas.get(chave)
+        if celula is None:
+            if sinal < 0:
+                return
+            celula = self.celulas[chave] = list(_MEDIDAS_VAZIAS)
+            self._indexar(chave)
+        for posicao, valor in enumerate(_linha_prefixo(_MEDIDAS_VAZIAS, jogo)):
+            celula[posicao] += valor * sinal
+        if celula[0] <= 0:
+            del self.celulas[chave]
+            for dimensao, codigo in zip(DIMENSOES_CUBO, chave):
+                self._celulas_de[dimensao][codigo].discard(chave)
+
+    def adicionar(self, jogo: dict):
+        self.aplicar(jogo, 1)
+
+    def remover(self, jogo: dict):
+        self.aplicar(jogo, -1)
+
+    def substituir(self, antigo: dict | None, novo: dict | None):
+        """Aplica uma edição; `antigo=None` é inclusão e `novo=None` é exclusão."""
+        if antigo is not None:
+            self.remover(antigo)
+        if novo is not None:
+            self.adicionar(novo)
+
+    def _codigos_filtro(self, dimensao: str, valor) -> list[int]:
+        valores = valor if isinstance(valor, (list, tuple, set, frozenset)) else (valor,)
+        por_texto = self._por_texto[dimensao]
+        codigos = []
+        for item in valores:
+            codigos.extend(por_texto.get(str(item).strip().casefold(), ()))
+        return codigos
+
+    def celulas_filtradas(self, temporada_inicio=None, temporada_fim=None, **filtros) -> list[tuple]:
+        """Chaves das células que passam nos filtros.
+
+        Cada filtro aceita um valor ou uma lista (OR dentro da dimensão), sem
+        diferenciar caixa; `None`, "" e "Todos" são ignorados.
+        `temporada_inicio`/`temporada_fim` recortam as temporadas (inclusive).
+        """
+        candidatos = []
+        for dimensao, valor in filtros.items():
+            if valor is None or valor == "" or valor == "Todos":
+                continue
+            if dimensao not in self._celulas_de:
+                raise ValueError(f"Dimensão de filtro desconhecida: {dimensao}")
+            celulas_de = self._celulas_de[dimensao]
+            candidatos.append(set().union(*(celulas_de.get(codigo, ()) for codigo in self._codigos_filtro(dimensao, valor))))
+        if temporada_inicio is not None or temporada_fim is not None:
+            inicio = _inteiro(temporada_inicio) if temporada_inicio is not None else None
+            fim = _inteiro(temporada_fim) if temporada_fim is not None else None
+            celulas_de = self._celulas_de["temporada"]
+            candidatos.append(set().union(*(
+                celulas_de.get(codigo, ())
+                for codigo, ano in enumerate(self.valores["temporada"])
+                if ano is not None and (inicio is None or ano >= inicio) and (fim is None or ano <= fim)
+            )))
+        if not candidatos:
+            return list(self.celulas)
+        candidatos.sort(key=len)
+        return list(candidatos[0].intersection(*candidatos[1:]))
+
+    def _somar(self, chaves) -> list[int]:
+        total = list(_MEDIDAS_VAZIAS)
+        celulas = self.celulas
+        for chave in chaves:
+            for posicao, valor in enumerate(celulas[chave]):
+                total[posicao] += valor
+        return total
+
+    def resumo(self, **filtros) -> dict:
+        """Resumo (formato de `finalizar_resumo`) da fatia definida pelos filtros."""
+        return finalizar_resumo(dict(zip(CAMPOS_PREFIXO, self._somar(self.celulas_filtradas(**filtros)))))
+
+    def agrupar(self, dimensoes, **filtros) -> dict:
+        """Roll-up da fatia pelos eixos em `dimensoes`.
+
+        Com uma dimensão (str) a chave do resultado é o próprio valor; com uma
+        tupla de dimensões, a tupla de valores.
+        """
+        unica = isinstance(dimensoes, str)
+        eixos = [DIMENSOES_CUBO.index(dimensao) for dimensao in ((dimensoes,) if unica else dimensoes)]
+        grupos = {}
+        for chave in self.celulas_filtradas(**filtros):
+            grupo = tuple(chave[eixo] for eixo in eixos)
+            grupos.setdefault(grupo, []).append(chave)
+        resultado = {}
+        for grupo, chaves in grupos.items():
+            valores = tuple(self.valores[DIMENSOES_CUBO[eixo]][codigo] for eixo, codigo in zip(eixos, grupo))
+            resultado[valores[0] if unica else valores] = finalizar_resumo(dict(zip(CAMPOS_PREFIXO, self._somar(chaves))))
+        return resultado
+
+
+# Nó da árvore de sequências: (início, tamanho, prefixo, sufixo, melhor, início do melhor).
+_NO_VAZIO = (0, 0, 0, 0, 0, None)
+
+
+def _juntar_nos(a: tuple, b: tuple) -> tuple:
+    if not a[1]:
+        return b
+    if not b[1]:
+        return a
+    inicio_a, tam_a, pref_a, suf_a, melhor, melhor_inicio = a
+    _inicio_b, tam_b, pref_b, suf_b, melhor_b, melhor_inicio_b = b
+    pref = pref_a if pref_a < tam_a else tam_a + pref_b
+    suf = suf_b if suf_b < tam_b else tam_b + suf_a
+    cruzando = suf_a + pref_b
+    if cruzando > melhor:
+        melhor, melhor_inicio = cruzando, inicio_a + tam_a - suf_a
+    if melhor_b > melhor:
+        melhor, melhor_inicio = melhor_b, melhor_inicio_b
+    return (inicio_a, tam_a + tam_b, pref, suf, melhor, melhor_inicio)
+
+
+def _folha(posicao: int, valor: bool) -> tuple:
+    return (posicao, 1, 1, 1, 1, posicao) if valor else (posicao, 1, 0, 0, 0, None)
+
+
+class ArvoreSequencias:
+    """Árvore de segmentos sobre uma sequência de booleanos.
+
+    `consultar(lo, hi)` devolve `(tamanho, início)` da maior corrida de `True`
+    em `[lo, hi)` em O(log n); `atualizar` troca um valor em O(log n). Em caso
+    de empate vale a corrida mais antiga.
+    """
+
+    def __init__(self, valores):
+        valores = list(valores)
+        self.n = len(valores)
+        self.tamanho = 1
+        while self.tamanho < self.n:
+            self.tamanho *= 2
+        self.nos = [_NO_VAZIO] * (2 * self.tamanho)
+        for posicao, valor in enumerate(valores):
+            self.nos[self.tamanho + posicao] = _folha(posicao, valor)
+        for no in range(self.tamanho - 1, 0, -1):
+            self.nos[no] = _juntar_nos(self.nos[2 * no], self.nos[2 * no + 1])
+
+    def atualizar(self, posicao: int, valor: bool):
+        no = self.tamanho + posicao
+        self.nos[no] = _folha(posicao, valor)
+        no //= 2
+        while no:
+            self.nos[no] = _juntar_nos(self.nos[2 * no], self.nos[2 * no + 1])
+            no //= 2
+
+    def consultar(self, lo: int = 0, hi: int | None = None) -> tuple[int, int | None]:
+        hi = self.n if hi is None else min(hi, self.n)
+        esquerda = direita = _NO_VAZIO
+        lo += self.tamanho
+        hi += self.tamanho
+        while lo < hi:
+            if lo & 1:
+                esquerda = _juntar_nos(esquerda, self.nos[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                direita = _juntar_nos(self.nos[hi], direita)
+            lo //= 2
+            hi //= 2
+        resultado = _juntar_nos(esquerda, direita)
+        return resultado[4], resultado[5]
+
+
+CRITERIOS_SEQUENCIA = {
+    "invicto": lambda gols_pro, gols_contra: gols_pro >= gols_contra,
+    "sem_vitoria": lambda gols_pro, gols_contra: gols_pro <= gols_contra,
+    "vitorias": lambda gols_pro, gols_contra: gols_pro > gols_contra,
+    "derrotas": lambda gols_pro, gols_contra: gols_pro < gols_contra,
+    "marcando": lambda gols_pro, gols_contra: gols_pro > 0,
+    "sem_sofrer": lambda gols_pro, gols_contra: gols_contra == 0,
+}
+
+FILTROS_SEQUENCIA = {
+    "competicao": lambda jogo: str(jogo.get("competicao", "")).strip().casefold(),
+    "tecnico": lambda jogo: normalizar_tecnico(jogo.get("tecnico")).casefold(),
+    "local": lambda jogo: str(jogo.get("local", "")).strip().casefold(),
+    "adversario": lambda jogo: str(jogo.get("adversario", "")).strip().casefold(),
+}
+
+
+def _ordinal_limite(valor) -> int | None:
+    if valor is None or valor == "":
+        return None
+    if isinstance(valor, int):
+        return valor
+    if isinstance(valor, (date, datetime)):
+        return valor.toordinal()
+    data = parse_data(valor)
+    return data.toordinal() if data else None
+
+
+class MotorSequencias:
+    """Maiores sequências (invicta, sem vitória, marcando...) por período e recorte.
+
+    Cada combinação de filtros (competição, técnico, mando, adversário) vira um
+    recorte cronológico montado uma vez; cada critério ganha uma
+    `ArvoreSequencias` sobre esse recorte. Depois disso, qualquer intervalo de
+    datas é respondido com duas bissecções e uma consulta O(log n).
+    """
+
+    def __init__(self, jogos: list[dict]):
+        self.jogos = list(jogos)
+        self._ordem = sorted(range(len(self.jogos)), key=lambda idx: chave_cronologica(self.jogos[idx]))
+        self._recortes = {}
+        self._arvores = {}
+
+    def _recorte(self, filtros: dict) -> tuple:
+        chave = tuple(sorted((campo, str(valor).strip().casefold()) for campo, valor in filtros.items()))
+        recorte = self._recortes.get(chave)
+        if recorte is None:
+            extratores = [(FILTROS_SEQUENCIA[campo], valor) for campo, valor in chave]
+            indices = [
+                idx for idx in self._ordem
+                if all(extrair(self.jogos[idx]) == valor for extrair, valor in extratores)
+            ]
+            ordinais = [data_ordinal(self.jogos[idx]) or 0 for idx in indices]
+            recorte = self._recortes[chave] = (chave, indices, ordinais)
+        return recorte
+
+    def maior_sequencia(self, criterio: str, data_inicio=None, data_fim=None, **filtros) -> dict:
+        """Maior corrida do `criterio` entre `data_inicio` e `data_fim` (inclusivas).
+
+        As datas aceitam ordinal, `date`/`datetime` ou texto dd/mm/aaaa. `inicio`
+        e `fim` são índices na lista original de jogos.
+        """
+        if criterio not in CRITERIOS_SEQUENCIA:
+            raise ValueError(f"Critério de sequência desconhecido: {criterio}")
+        desconhecidos = set(filtros) - set(FILTROS_SEQUENCIA)
+        if desconhecidos:
+            raise ValueError(f"Filtro de sequência desconhecido: {', '.join(sorted(desconhecidos))}")
+        chave, indices, ordinais = self._recorte({campo: valor for campo, valor in filtros.items() if valor})
+        arvore = self._arvores.get((criterio, chave))
+        if arvore is None:
+            teste = CRITERIOS_SEQUENCIA[criterio]
+            arvore = self._arvores[(criterio, chave)] = ArvoreSequencias(
+                teste(*placar_jogo(self.jogos[idx])) for idx in indices
+            )
+        ordinal_inicio = _ordinal_limite(data_inicio)
+        ordinal_fim = _ordinal_limite(data_fim)
+        lo = bisect_left(ordinais, ordinal_inicio) if ordinal_inicio is not None else 0
+        hi = bisect_right(ordinais, ordinal_fim) if ordinal_fim is not None else len(ordinais)
+        tamanho, posicao = arvore.consultar(lo, hi)
+        if not tamanho:
+            return {"tamanho": 0, "inicio": None, "fim": None, "inicio_data": "", "fim_data": "", "em_andamento": False}
+        inicio = indices[posicao]
+        fim = indices[posicao + tamanho - 1]
+        return {
+            "tamanho": tamanho,
+            "inicio": inicio,
+            "fim": fim,
+            "inicio_data": str(self.jogos[inicio].get("data", "")).strip(),
+            "fim_data": str(self.jogos[fim].get("data", "")).strip(),
+            "em_andamento": posicao + tamanho == hi,
+        }
+
+
+CATEGORIAS_RECORDE = {
+    "maiores_vitorias": "Maiores vitórias",
+    "maiores_derrotas": "Maiores derrotas",
+    "mais_gols_partida": "Jogos com mais gols",
+    "mais_gols_jogador": "Mais gols de um jogador numa partida",
+    "hat_tricks": "Mais hat-tricks",
+    "jejum_gols": "Maiores jejuns de gols",
+    "pontos_rapidos": "Menos jogos para chegar à meta de pontos na temporada",
+}
+ESCOPOS_RECORDE = ("competicao", "tecnico", "adversario")
+
+
+def _empilhar(heap: list, limite: int, chave: tuple, idx: int, extra=None):
+    """Mantém em `heap` só os `limite` itens de maior chave (min-heap)."""
+    if len(heap) < limite:
+        heappush(heap, (chave, idx, extra))
+    elif chave > heap[0][0]:
+        heapreplace(heap, (chave, idx, extra))
+
+
+class MotorRecordes:
+    """Recordes históricos (goleadas, jejuns, hat-tricks...) em uma única passada.
+
+    Os jogos são percorridos uma vez em ordem cronológica; cada jogo alimenta o
+    escopo geral e os escopos da sua competição, técnico e adversário. Cada
+    categoria de cada escopo guarda só um heap com os `limite` melhores
+    (chave, índice do jogo, extra); os dicionários de saída só são montados na
+    consulta. Empates ficam com quem chegou primeiro. Goleadores são agrupados
+    por `player_key`, com a grafia de `_nome_preferido`, como no ranking SQL.
+    """
+
+    def __init__(self, jogos: list[dict], limite: int = 10, meta_pontos: int = 20):
+        self.jogos = list(jogos)
+        self.limite = limite
+        self.meta_pontos = meta_pontos
+        self._escopos = {}
+        self._nomes = {dimensao: {} for dimensao in ESCOPOS_RECORDE}
+        self._jogadores = {}
+        hat_tricks = {}
+        jejuns = {}
+        campanhas = {}
+        ordem = sorted(range(len(self.jogos)), key=lambda idx: chave_cronologica(self.jogos[idx]))
+        for posicao, idx in enumerate(ordem):
+            jogo = self.jogos[idx]
+            gols_vasco, gols_adv = placar_jogo(jogo)
+            saldo = gols_vasco - gols_adv
+            pontos = 3 if saldo > 0 else (1 if saldo == 0 else 0)
+            temporada = temporada_jogo(jogo)
+            goleadores = Counter()
+            for nome, gols in contar_goleadores(jogo.get("gols_vasco", [])).items():
+                chave = player_key(nome)
+                if chave:
+                    goleadores[chave] += gols
+                    self._jogadores[chave] = _nome_preferido(self._jogadores.get(chave), nome)
+            for escopo in self._escopos_do_jogo(jogo):
+                heaps = self._heaps(escopo)
+                if saldo > 0:
+                    _empilhar(heaps["maiores_vitorias"], limite, (saldo, gols_vasco, -posicao), idx)
+                elif saldo < 0:
+                    _empilhar(heaps["maiores_derrotas"], limite, (-saldo, gols_adv, -posicao), idx)
+                _empilhar(heaps["mais_gols_partida"], limite, (gols_vasco + gols_adv, -posicao), idx)
+                for jogador, gols in goleadores.items():
+                    _empilhar(heaps["mais_gols_jogador"], limite, (gols, -posicao), idx, jogador)
+                    if gols >= 3:
+                        contagem = hat_tricks.setdefault(escopo, {})
+                        quantidade, primeiro = contagem.get(jogador, (0, idx))
+                        contagem[jogador] = (quantidade + 1, primeiro)
+
+                jejum = jejuns.get(escopo)
+                if gols_vasco == 0:
+                    jejuns[escopo] = [posicao, idx, 1, idx] if jejum is None else [jejum[0], jejum[1], jejum[2] + 1, idx]
+                elif jejum is not None:
+                    self._fechar_jejum(heaps, jejum, em_andamento=False)
+                    del jejuns[escopo]
+
+                if temporada is not None:
+                    campanha = campanhas.setdefault((escopo, temporada), [0, 0])
+                    if campanha[0] < meta_pontos:
+                        campanha[0] += pontos
+                        campanha[1] += 1
+                        if campanha[0] >= meta_pontos:
+                            _empilhar(heaps["pontos_rapidos"], limite, (-campanha[1], -posicao), idx,
+                                      (temporada, campanha[0]))
+        for escopo, jejum in jejuns.items():
+            self._fechar_jejum(self._heaps(escopo), jejum, em_andamento=True)
+        posicao_de = {idx: posicao for posicao, idx in enumerate(ordem)}
+        for escopo, contagem in hat_tricks.items():
+            heap = self._heaps(escopo)["hat_tricks"]
+            for jogador, (quantidade, primeiro) in contagem.items():
+                _empilhar(heap, limite, (quantidade, -posicao_de[primeiro]), primeiro, jogador)
+
+    def _escopos_do_jogo(self, jogo: dict) -> list[tuple]:
+        escopos = [("geral", "")]
+        for dimensao in ESCOPOS_RECORDE:
+            valor = DIMENSOES_BITMAP[dimensao](jogo)
+            if not valor:
+                continue
+            chave = valor.casefold()
+            self._nomes[dimensao].setdefault(chave, valor)
+            escopos.append((dimensao, chave))
+        return escopos
+
+    def _heaps(self, escopo: tuple) -> dict:
+        heaps = self._escopos.get(escopo)
+        if heaps is None:
+            heaps = self._escopos[escopo] = {categoria: [] for categoria in CATEGORIAS_RECORDE}
+        return heaps
+
+    def _fechar_jejum(self, heaps: dict, jejum: list, em_andamento: bool):
+        posicao, idx_inicio, tamanho, idx_fim = jejum
+        _empilhar(heaps["jejum_gols"], self.limite, (tamanho, -posicao), idx_inicio, (idx_fim, em_andamento))
+
+    def _entrada(self, categoria: str, item: tuple) -> dict:
+        chave, idx, extra = item
+        jogo = self.jogos[idx]
+        entrada = {"valor": chave[0], "idx": idx, "data": str(jogo.get("data", "")).strip()}
+        if categoria == "jejum_gols":
+            idx_fim, em_andamento = extra
+            fim_data = str(self.jogos[idx_fim].get("data", "")).strip()
+            descricao = f"{chave[0]} jogos sem marcar: {entrada['data']} até {fim_data}"
+            entrada.update(
+                fim=idx_fim,
+                fim_data=fim_data,
+                em_andamento=em_andamento,
+                descricao=f"{descricao} (em andamento)" if em_andamento else descricao,
+            )
+        elif categoria == "pontos_rapidos":
+            temporada, pontos = extra
+            entrada.update(
+                valor=-chave[0],
+                temporada=temporada,
+                descricao=f"{temporada}: {pontos} pontos em {-chave[0]} jogos (até {entrada['data']})",
+            )
+        elif categoria == "hat_tricks":
+            jogador = self._jogadores[extra]
+            entrada.update(jogador=jogador, descricao=f"{jogador} (primeiro em {entrada['data']})")
+        elif categoria == "mais_gols_jogador":
+            jogador = self._jogadores[extra]
+            entrada.update(jogador=jogador, descricao=f"{jogador} — {resumo_partida(jogo)}")
+        else:
+            entrada["descricao"] = resumo_partida(jogo)
+        return entrada
+
+    def valores(self, dimensao: str) -> list[str]:
+        """Valores (como gravados) da dimensão que têm recordes."""
+        return sorted(self._nomes[dimensao].values(), key=str.casefold)
+
+    def recordes(self, categoria: str, dimensao: str | None = None, valor=None) -> list[dict]:
+        """Os recordes da categoria, do melhor para o pior, no geral ou num escopo."""
+        if categoria not in CATEGORIAS_RECORDE:
+            raise ValueError(f"Categoria de recorde desconhecida: {categoria}")
+        if dimensao is None:
+            escopo = ("geral", "")
+        elif dimensao in ESCOPOS_RECORDE:
+            escopo = (dimensao, str(valor or "").strip().casefold())
+        else:
+            raise ValueError(f"Escopo de recorde desconhecido: {dimensao}")
+        heaps = self._escopos.get(escopo)
+        if heaps is None:
+            return []
+        return [self._entrada(categoria, item) for item in sorted(heaps[categoria], reverse=True)]
+
+
+DIMENSOES_CARRASCOS = ("clube", "temporada", "competicao")
+
+
+def _nome_preferido(atual: str | None, novo: str) -> str:
+    """Mesma escolha do ranking SQL: grafia com acento, depois a mais longa, depois a alfabética."""
+    if atual is None:
+        return novo
+
+    def peso(nome):
+        return (nome != nome.encode("ascii", "ignore").decode(), len(nome), [-ord(c) for c in nome])
+
+    return max(atual, novo, key=peso)
+
+
+def _ordem_carrasco(item) -> tuple:
+    """Mais gols primeiro; empates pela chave do jogador, como em `load_scorer_leaderboard`."""
+    grupo, (gols, _jogos) = item
+    return (-gols, grupo)
+
+
+class IndiceCarrascos:
+    """Gols sofridos por (chave do jogador, clube, temporada, competição).
+
+    O clube é o `clube` gravado no gol (`match_goals.club_name`) ou, na falta
+    dele, o adversário da partida. Cada célula guarda gols e jogos em que o
+    jogador marcou; um índice valor -> células por dimensão resolve os filtros,
+    e o top-N sai de `heapq.nsmallest` sobre os totais da fatia, com a chave
+    negada de `_ordem_carrasco` (mais gols primeiro).
+    """
+
+    def __init__(self, jogos: list[dict]):
+        self.celulas = {}
+        self.nomes = {}
+        self._clubes = {}
+        self._celulas_de = {dimensao: {} for dimensao in DIMENSOES_CARRASCOS}
+        for jogo in jogos:
+            adversario = str(jogo.get("adversario", "")).strip()
+            temporada = temporada_jogo(jogo)
+            competicao = str(jogo.get("competicao", "")).strip()
+            por_jogador = {}
+            for item in jogo.get("gols_adversario", []) or []:
+                if isinstance(item, dict):
+                    nome = str(item.get("nome", "")).strip()
+                    clube = str(item.get("clube", "") or "").strip() or adversario
+                    try:
+                        gols = max(1, int(item.get("gols", 1)))
+                    except (TypeError, ValueError):
+                        gols = 1
+                elif isinstance(item, str):
+                    nome, clube, gols = item.strip(), adversario, 1
+                else:
+                    continue
+                chave = player_key(nome)
+                if not chave:
+                    continue
+                self.nomes[chave] = _nome_preferido(self.nomes.get(chave), nome)
+                celula = (chave, clube.casefold(), temporada, competicao.casefold())
+                self._clubes.setdefault(celula[1], clube)
+                por_jogador[celula] = por_jogador.get(celula, 0) + gols
+            for celula, gols in por_jogador.items():
+                atual = self.celulas.get(celula)
+                if atual is None:
+                    self.celulas[celula] = [gols, 1]
+                    for dimensao, valor in zip(DIMENSOES_CARRASCOS, celula[1:]):
+                        self._celulas_de[dimensao].setdefault(valor, set()).add(celula)
+                else:
+                    atual[0] += gols
+                    atual[1] += 1
+
+    def clubes(self) -> list[str]:
+        return sorted(self._clubes.values(), key=str.casefold)
+
+    def _filtrar(self, filtros: dict):
+        candidatos = []
+        for dimensao, valor in filtros.items():
+            if valor is None or valor == "" or valor == "Todos":
+                continue
+            if dimensao not in self._celulas_de:
+                raise ValueError(f"Filtro de carrascos desconhecido: {dimensao}")
+            chave = _inteiro(valor) if dimensao == "temporada" else str(valor).strip().casefold()
+            candidatos.append(self._celulas_de[dimensao].get(chave, set()))
+        if not candidatos:
+            return self.celulas.keys()
+        candidatos.sort(key=len)
+        return candidatos[0].intersection(*candidatos[1:])
+
+    def ranking(self, limite: int | None = None, por_clube: bool = False, **filtros) -> list[dict]:
+        """Maiores carrascos da fatia (`clube`, `temporada`, `competicao`).
+
+        Com `por_clube=True` cada jogador aparece uma vez por clube pelo qual marcou.
+        """
+        totais = {}
+        for celula in self._filtrar(filtros):
+            grupo = (celula[0], celula[1]) if por_clube else (celula[0],)
+            gols, jogos = self.celulas[celula]
+            atual = totais.setdefault(grupo, [0, 0])
+            atual[0] += gols
+            atual[1] += jogos
+        selecionados = (
+            nsmallest(limite, totais.items(), key=_ordem_carrasco)
+            if limite is not None
+            else sorted(totais.items(), key=_ordem_carrasco)
+        )
+        linhas = []
+        for grupo, (gols, jogos) in selecionados:
+            linha = {"nome": self.nomes[grupo[0]], "chave": grupo[0], "gols": gols, "jogos": jogos}
+            if por_clube:
+                linha["clube"] = self._clubes[grupo[1]]
+            linhas.append(linha)
+        return linhas
+
+    def top_por_clube(self, limite: int = 1, **filtros) -> dict:
+        """Clube -> os `limite` jogadores que mais marcaram contra o Vasco por ele."""
+        resultado = {}
+        for clube in self.clubes():
+            linhas = self.ranking(limite, clube=clube, **filtros)
+            if linhas:
+                resultado[clube] = linhas
+        return resultado
+
+
+def resumo_geral(analise: dict) -> dict:
+    return finalizar_resumo(analise["resumo"])
+
+
+def listar_adversarios(analise: dict) -> list[str]:
+    return sorted((grupo["adversario"] for grupo in analise["adversarios"].values()), key=str.casefold)
+
+
+def retrospecto(analise: dict, adversario: str) -> dict:
+    """Confronto direto com um adversário; `partidas` em ordem cronológica."""
+    nome = str(adversario or "").strip()
+    grupo = analise["adversarios"].get(nome.casefold()) if nome else None
+    if grupo is None:
+        grupo = _novo_grupo(adversario=nome, carrascos=Counter())
+    stats = grupo["resumo"]
+    partidas = []
+    for idx in grupo["partidas"]:
+        jogo = analise["jogos"][idx]
+        gols_vasco, gols_adv = placar_jogo(jogo)
+        sigla = resultado_jogo(jogo)
+        data_txt = str(jogo.get("data", "")).strip()
+        partidas.append({
+            "idx": idx,
+            "data": data_txt or "—",
+            "data_ord": data_ordinal(jogo),
+            "competicao": str(jogo.get("competicao", "")).strip() or "—",
+            "local": "Casa" if str(jogo.get("local", "casa")).strip() == "casa" else "Fora",
+            "placar": f"{gols_vasco} x {gols_adv}",
+            "resultado": sigla,
+            "resultado_texto": RESULTADO_TEXTO[sigla],
+            "gols_vasco": formatar_goleadores(contar_goleadores(jogo.get("gols_vasco", []))),
+            "gols_adversario": formatar_goleadores(contar_goleadores(jogo.get("gols_adversario", []))),
+        })
+    return {
+        "adversario": grupo["adversario"],
+        "partidas": partidas,
+        "vitorias": stats["vitorias"],
+        "empates": stats["empates"],
+        "derrotas": stats["derrotas"],
+        "gols_vasco": stats["gols_pro"],
+        "gols_adversario": stats["gols_contra"],
+        "artilheiros_vasco": Counter(grupo["artilheiros"]),
+        "artilheiros_adversario": Counter(grupo["carrascos"]),
+    }
+
+
+def resumo_partida(jogo: dict) -> str:
+    adversario = str(jogo.get("adversario", "Adversário não informado")).strip() or "Adversário não informado"
+    gols_vasco, gols_adv = placar_jogo(jogo)
+    competicao = str(jogo.get("competicao", "")).strip()
+    resumo = f"Vasco {gols_vasco} x {gols_adv} {adversario}"
+    if competicao:
+        resumo = f"{resumo} | {competicao}"
+    return resumo
+
+
+def _linha_passagem(analise: dict, segmento: int, numero: int) -> dict:
+    tecnico, inicio, fim = analise["passagens"][segmento]
+    jogos_passagem = [analise["jogos"][idx] for idx in analise["ordem"][inicio:fim + 1]]
+    primeiro = jogos_passagem[0]
+    ultimo = jogos_passagem[-1]
+    inicio_data = str(primeiro.get("data", "—")).strip() or "—"
+    fim_data = str(ultimo.get("data", "—")).strip() or "—"
+    stats = finalizar_resumo(resumo_intervalo(analise, inicio, fim))
+    return {
+        "tecnico": tecnico,
+        "passagem": numero,
+        "periodo": f"{inicio_data} a {fim_data}",
+        "inicio_data": inicio_data,
+        "primeiro_jogo": resumo_partida(primeiro),
+        "fim_data": fim_data,
+        "ultimo_jogo": resumo_partida(ultimo),
+        "jogos_lista": jogos_passagem,
+        "jogos": stats["jogos"],
+        "casa": stats["casa"],
+        "fora": stats["fora"],
+        "vitorias": stats["vitorias"],
+        "empates": stats["empates"],
+        "derrotas": stats["derrotas"],
+        "gols_pro": stats["gols_pro"],
+        "gols_contra": stats["gols_contra"],
+        "saldo": stats["saldo"],
+        "aproveitamento": stats["aproveitamento"],
+        "artilheiro": texto_artilheiro(analise["artilheiros_passagens"][segmento]),
+    }
+
+
+def passagens_tecnico(analise: dict, tecnico: str) -> list[dict]:
+    grupo = analise["tecnicos"].get(normalizar_tecnico(tecnico))
+    if grupo is None:
+        return []
+    return [
+        _linha_passagem(analise, segmento, numero)
+        for numero, segmento in enumerate(grupo["passagens"], start=1)
+    ]
+
+
+def campanha_titulo(analise: dict, campeonato: str, ano) -> dict:
+    """Resumo da campanha em (competição, ano), memorizado dentro da própria análise."""
+    chave = (int(ano), str(campeonato).strip().casefold())
+    memo = analise.setdefault("campanhas_resumo", {})
+    resumo = memo.get(chave)
+    if resumo is None:
+        resumo = memo[chave] = _resumir_campanha(analise["campanhas"].get(chave), campeonato, ano)
+    return dict(resumo, campeonato=campeonato)
+
+
+def campanhas_titulos(analise: dict, titulos) -> list[dict]:
+    """Linhas da tabela de títulos, ordenadas por ano e campeonato."""
+    campanhas = [campanha_titulo(analise, item["campeonato"], item["ano"]) for item in titulos]
+    campanhas.sort(key=lambda x: (x["ano"], x["campeonato"].casefold()))
+    return campanhas
+
+
+def _resumir_campanha(grupo: dict | None, campeonato: str, ano) -> dict:
+    if grupo is None:
+        return {
+            "campeonato": campeonato,
+            "ano": int(ano),
+            "vitorias": "Sem registro",
+            "empates": "Sem registro",
+            "derrotas": "Sem registro",
+            "artilheiro": "Sem registro",
+        }
+    artilheiros = grupo["artilheiros"]
+    if not artilheiros:
+        artilheiro_txt = "—"
+    else:
+        max_gols = max(artilheiros.values())
+        nomes = sorted([nome for nome, gols in artilheiros.items() if gols == max_gols], key=str.casefold)
+        artilheiro_txt = " / ".join(nomes) + f" ({max_gols})"
+    stats = grupo["resumo"]
+    return {
+        "campeonato": campeonato,
+        "ano": int(ano),
+        "vitorias": stats["vitorias"],
+        "empates": stats["empates"],
+        "derrotas": stats["derrotas"],
+        "artilheiro": artilheiro_txt,
+    }
+
+
+class RegistroJogadores:
+    """Resolve nomes de jogadores para ids inteiros pequenos, um por chave normalizada.
+
+    Laços em massa resolvem cada nome uma vez e depois comparam inteiros.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self.chaves = []
+
+    def __len__(self) -> int:
+        return len(self.chaves)
+
+    def id_de(self, nome, criar: bool = True) -> int | None:
+        chave = player_key(nome)
+        if not chave:
+            return None
+        jogador_id = self._ids.get(chave)
+        if jogador_id is None and criar:
+            jogador_id = self._ids[chave] = len(self.chaves)
+            self.chaves.append(chave)
+        return jogador_id
+
+    def ids_de(self, nomes) -> list:
+        return [self.id_de(nome) for nome in nomes]
+
+    def chave_de(self, jogador_id: int) -> str:
+        return self.chaves[jogador_id]
+
+
+# Papéis na escalação em ordem de prioridade: quem aparece como titular e
+# também como reserva conta como titular, como na tela de jogadores.
+PAPEIS_ESCALACAO = (
+    ("titulares", "titular"),
+    ("reservas", "reserva"),
+    ("nao_relacionados", "nao_relacionado"),
+    ("lesionados", "lesionado"),
+)
+
+
+def _papeis_escalacao(escalacao, registro: RegistroJogadores) -> dict:
+    papeis = {}
+    if not isinstance(escalacao, dict):
+        return papeis
+    titulares = []
+    tit_por_pos = escalacao.get("titulares_por_posicao", {})
+    if isinstance(tit_por_pos, dict):
+        for nomes in tit_por_pos.values():
+            if isinstance(nomes, list):
+                titulares.extend(nomes)
+    for campo, papel in PAPEIS_ESCALACAO:
+        nomes = escalacao.get(campo, [])
+        if campo == "titulares":
+            nomes = titulares + (nomes if isinstance(nomes, list) else [])
+        if not isinstance(nomes, list):
+            continue
+        for jogador_id in registro.ids_de(nomes):
+            if jogador_id is not None:
+                papeis.setdefault(jogador_id, papel)
+    return papeis
+
+
+def indexar_jogadores(jogos: list[dict], registro: RegistroJogadores | None = None) -> dict:
+    """Índice invertido id do jogador -> aparições ordenadas por data.
+
+    Cada aparição é a tupla `(ordinal da data, índice do jogo, papel, gols,
+    gols saindo do banco, capitão, resultado)`. Jogos sem data válida ficam em
+    `sem_data` e entram em qualquer período, como na contagem original.
+    """
+    registro = registro if registro is not None else RegistroJogadores()
+    jogadores = {}
+    for idx, jogo in enumerate(jogos):
+        ordinal = data_ordinal(jogo)
+        papeis = _papeis_escalacao(jogo.get("escalacao_partida", jogo.get("escalacao")), registro)
+        gols = {}
+        for g in jogo.get("gols_vasco", []):
+            if isinstance(g, dict):
+                try:
+                    qtd = int(g.get("gols", 0))
+                except (TypeError, ValueError):
+                    qtd = 0
+                if qtd <= 0:
+                    continue
+                jogador_id = registro.id_de(g.get("nome", ""))
+                banco = bool(g.get("saiu_do_banco", False)) or papeis.get(jogador_id) == "reserva"
+            elif isinstance(g, str):
+                qtd = 1
+                jogador_id = registro.id_de(g)
+                banco = papeis.get(jogador_id) == "reserva"
+            else:
+                continue
+            if jogador_id is None:
+                continue
+            atual = gols.setdefault(jogador_id, [0, 0])
+            atual[0] += qtd
+            if banco:
+                atual[1] += qtd
+        capitao = registro.id_de(jogo.get("capitao", ""))
+        resultado = resultado_jogo(jogo)
+        envolvidos = papeis.keys() | gols.keys()
+        if capitao is not None:
+            envolvidos.add(capitao)
+        for jogador_id in envolvidos:
+            qtd, banco = gols.get(jogador_id, (0, 0))
+            entrada = jogadores.setdefault(jogador_id, {"ordinais": [], "aparicoes": [], "sem_data": []})
+            aparicao = (ordinal, idx, papeis.get(jogador_id), qtd, banco, jogador_id == capitao, resultado)
+            entrada["sem_data" if ordinal is None else "aparicoes"].append(aparicao)
+    for entrada in jogadores.values():
+        entrada["aparicoes"].sort(key=lambda item: (item[0], item[1]))
+        entrada["ordinais"] = [item[0] for item in entrada["aparicoes"]]
+    return {"registro": registro, "jogadores": jogadores}
+
+
+def indexar_capitaes(jogos: list[dict]) -> dict:
+    """Chave normalizada do jogador -> jogos como capitão.
+
+    Cada entrada tem o nome como gravado na primeira vez, os ordinais ordenados
+    dos jogos com data, quantos jogos sem data, o total e a primeira e a última
+    data em que foi capitão.
+    """
+    capitaes = {}
+    for jogo in jogos:
+        nome = str(jogo.get("capitao", "") or "").strip()
+        chave = player_key(nome)
+        if not chave:
+            continue
+        entrada = capitaes.setdefault(chave, {"nome": nome, "ordinais": [], "sem_data": 0})
+        ordinal = data_ordinal(jogo)
+        if ordinal is None:
+            entrada["sem_data"] += 1
+        else:
+            entrada["ordinais"].append(ordinal)
+    for entrada in capitaes.values():
+        ordinais = entrada["ordinais"]
+        ordinais.sort()
+        entrada["jogos"] = len(ordinais) + entrada["sem_data"]
+        entrada["primeira_data"] = date.fromordinal(ordinais[0]).strftime("%d/%m/%Y") if ordinais else ""
+        entrada["ultima_data"] = date.fromordinal(ordinais[-1]).strftime("%d/%m/%Y") if ordinais else ""
+    return capitaes
+
+
+def jogos_como_capitao(capitaes: dict, nome: str, data_entrada: str = "", data_saida: str = "") -> int:
+    """Jogos como capitão entre duas datas (inclusivas); jogos sem data contam sempre."""
+    entrada = capitaes.get(player_key(nome))
+    if entrada is None:
+        return 0
+    inicio = parse_data(data_entrada) if data_entrada else None
+    fim = parse_data(data_saida) if data_saida else None
+    ordinais = entrada["ordinais"]
+    lo = bisect_left(ordinais, inicio.toordinal()) if inicio else 0
+    hi = bisect_right(ordinais, fim.toordinal()) if fim else len(ordinais)
+    return max(0, hi - lo) + entrada["sem_data"]
+
+
+def estatisticas_jogador_periodo(
+    indice: dict,
+    nome: str,
+    data_entrada: str = "",
+    data_saida: str = "",
+    capitaes: dict | None = None,
+) -> dict:
+    """Números do jogador entre duas datas (inclusivas), por bissecção no índice.
+
+    Com `capitaes` (de `indexar_capitaes`), os jogos como capitão saem dele.
+    """
+    stats = {
+        "jogos_com_participacao": 0,
+        "jogos_titular": 0,
+        "jogos_reserva": 0,
+        "jogos_nao_rel": 0,
+        "jogos_lesionado": 0,
+        "gols": 0,
+        "jogos_como_capitao": 0,
+        "partidas_com_gol": 0,
+        "gols_titular": 0,
+        "gols_banco": 0,
+    }
+    ved = Counter()
+    jogador_id = indice["registro"].id_de(nome, criar=False)
+    entrada = indice["jogadores"].get(jogador_id)
+    if entrada is not None:
+        inicio = parse_data(data_entrada) if data_entrada else None
+        fim = parse_data(data_saida) if data_saida else None
+        ordinais = entrada["ordinais"]
+        lo = bisect_left(ordinais, inicio.toordinal()) if inicio else 0
+        hi = bisect_right(ordinais, fim.toordinal()) if fim else len(ordinais)
+        contadores_papel = {
+            "titular": "jogos_titular",
+            "reserva": "jogos_reserva",
+            "nao_relacionado": "jogos_nao_rel",
+            "lesionado": "jogos_lesionado",
+        }
+        for _ordinal, _idx, papel, gols, banco, capitao, resultado in chain(
+            entrada["aparicoes"][lo:hi], entrada["sem_data"]
+        ):
+            if papel:
+                stats[contadores_papel[papel]] += 1
+            if capitao:
+                stats["jogos_como_capitao"] += 1
+            if gols > 0:
+                stats["gols"] += gols
+                stats["partidas_com_gol"] += 1
+                stats["gols_banco"] += banco
+                stats["gols_titular"] += max(0, gols - banco)
+            if gols > 0 or papel in ("titular", "reserva"):
+                stats["jogos_com_participacao"] += 1
+                ved[resultado] += 1
+    if capitaes is not None:
+        stats["jogos_como_capitao"] = jogos_como_capitao(capitaes, nome, data_entrada, data_saida)
+    jogos = stats["jogos_com_participacao"]
+    stats["media_gols"] = round(stats["gols"] / jogos, 2) if jogos else 0.0
+    stats["participacao_ved"] = f"{ved['V']}/{ved['E']}/{ved['D']}"
+    return stats
+
+
+class MatrizParcerias:
+    """Jogos juntos e campanha de cada dupla, via bitsets de titularidade e participação.
+
+    Cada jogador tem dois inteiros sobre as posições cronológicas dos jogos: um
+    com os jogos em que foi titular e outro com os jogos em que participou
+    (titular, reserva relacionado ou autor de gol, como em
+    `estatisticas_jogador_periodo`). Qualquer dupla sai de popcounts das
+    interseções, sem revisitar as escalações.
+    """
+
+    def __init__(self, jogos: list[dict], registro: RegistroJogadores | None = None):
+        self.jogos = list(jogos)
+        self.registro = registro if registro is not None else RegistroJogadores()
+        self.ordem = sorted(range(len(self.jogos)), key=lambda idx: chave_cronologica(self.jogos[idx]))
+        self.nomes = {}
+        titular = {}
+        participou = {}
+        resultados = {"V": [], "E": [], "D": []}
+        for posicao, idx in enumerate(self.ordem):
+            jogo = self.jogos[idx]
+            resultados[resultado_jogo(jogo)].append(posicao)
+            escalacao = jogo.get("escalacao_partida", jogo.get("escalacao"))
+            papeis = _papeis_escalacao(escalacao, self.registro)
+            for jogador_id, papel in papeis.items():
+                if papel == "titular":
+                    titular.setdefault(jogador_id, []).append(posicao)
+            participantes = {jogador_id for jogador_id, papel in papeis.items() if papel in ("titular", "reserva")}
+            for g in jogo.get("gols_vasco", []):
+                nome = g.get("nome", "") if isinstance(g, dict) else g
+                if not isinstance(nome, str):
+                    continue
+                jogador_id = self.registro.id_de(nome)
+                if jogador_id is not None:
+                    participantes.add(jogador_id)
+                    self.nomes.setdefault(jogador_id, nome.strip())
+            for jogador_id in participantes:
+                participou.setdefault(jogador_id, []).append(posicao)
+            self._registrar_nomes(escalacao)
+        tamanho = len(self.ordem)
+        self.titular = {jogador_id: _bitset(lista, tamanho) for jogador_id, lista in titular.items()}
+        self.participou = {jogador_id: _bitset(lista, tamanho) for jogador_id, lista in participou.items()}
+        self.resultados = {sigla: _bitset(lista, tamanho) for sigla, lista in resultados.items()}
+
+    def _registrar_nomes(self, escalacao):
+        if not isinstance(escalacao, dict):
+            return
+        grupos = list(escalacao.get("titulares_por_posicao", {}).values()) if isinstance(
+            escalacao.get("titulares_por_posicao"), dict
+        ) else []
+        grupos += [escalacao.get(campo, []) for campo, _papel in PAPEIS_ESCALACAO]
+        for nomes in grupos:
+            if not isinstance(nomes, list):
+                continue
+            for nome in nomes:
+                jogador_id = self.registro.id_de(nome, criar=False)
+                if jogador_id is not None:
+                    self.nomes.setdefault(jogador_id, str(nome).strip())
+
+    def _linha(self, id_a: int, id_b: int) -> dict:
+        juntos = self.participou.get(id_a, 0) & self.participou.get(id_b, 0)
+        titulares = self.titular.get(id_a, 0) & self.titular.get(id_b, 0)
+        vitorias = (titulares & self.resultados["V"]).bit_count()
+        empates = (titulares & self.resultados["E"]).bit_count()
+        derrotas = (titulares & self.resultados["D"]).bit_count()
+        jogos_titulares = titulares.bit_count()
+        return {
+            "jogador": self.nomes.get(id_a, self.registro.chave_de(id_a)),
+            "parceiro": self.nomes.get(id_b, self.registro.chave_de(id_b)),
+            "jogos_juntos": juntos.bit_count(),
+            "titulares_juntos": jogos_titulares,
+            "vitorias": vitorias,
+            "empates": empates,
+            "derrotas": derrotas,
+            "aproveitamento": round(((vitorias * 3 + empates) / (jogos_titulares * 3)) * 100, 1)
+            if jogos_titulares else 0.0,
+        }
+
+    def parceiros(self, nome: str, minimo: int = 1) -> list[dict]:
+        """Todos os companheiros de `nome` com pelo menos `minimo` jogos juntos."""
+        jogador_id = self.registro.id_de(nome, criar=False)
+        base = self.participou.get(jogador_id, 0) if jogador_id is not None else 0
+        if not base:
+            return []
+        rows = [
+            self._linha(jogador_id, outro)
+            for outro, bits in self.participou.items()
+            if outro != jogador_id and (base & bits).bit_count() >= minimo
+        ]
+        rows.sort(key=lambda item: (-item["jogos_juntos"], -item["titulares_juntos"], item["parceiro"].casefold()))
+        return rows
+
+    def matriz(self, nomes=None, minimo: int = 1) -> list[dict]:
+        """Todas as duplas entre `nomes` (ou entre todos os jogadores, se omitido)."""
+        if nomes is None:
+            ids = sorted(self.participou)
+        else:
+            ids = sorted({
+                jogador_id for jogador_id in (self.registro.id_de(nome, criar=False) for nome in nomes)
+                if jogador_id is not None and jogador_id in self.participou
+            })
+        rows = []
+        for posicao, id_a in enumerate(ids):
+            bits_a = self.participou[id_a]
+            for id_b in ids[posicao + 1:]:
+                if (bits_a & self.participou[id_b]).bit_count() >= minimo:
+                    rows.append(self._linha(id_a, id_b))
+        rows.sort(key=lambda item: (-item["jogos_juntos"], -item["titulares_juntos"], item["jogador"].casefold()))
+        return rows
+
+
+def _posicao_tabela(jogo: dict):
+    valor = jogo.get("posicao_tabela")
+    if valor is None or valor == "":
+        return None
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def series_evolucao(jogos: list[dict], usar_numpy: bool | None = None) -> dict:
+    """Séries acumuladas (gols, saldo, V/E/D, pontos) e posição na tabela jogo a jogo.
+
+    Com NumPy usa `cumsum` sobre os vetores de gols e o sinal do saldo como
+    código do resultado; sem NumPy (ou com `usar_numpy=False`) usa
+    `itertools.accumulate` sobre `map`. Os dois caminhos devolvem listas de `int`.
+    """
+    ordenados = sorted(jogos, key=lambda jogo: data_ordinal(jogo) or 0)
+    if not ordenados:
+        return {"x": []}
+    pro = []
+    contra = []
+    for jogo in ordenados:
+        placar = jogo.get("placar") or {}
+        gols_vasco = placar.get("vasco")
+        gols_adv = placar.get("adversario")
+        pro.append(gols_vasco if type(gols_vasco) is int else _inteiro(gols_vasco))
+        contra.append(gols_adv if type(gols_adv) is int else _inteiro(gols_adv))
+    posicoes = [_posicao_tabela(jogo) for jogo in ordenados]
+    x = list(range(1, len(ordenados) + 1))
+    if usar_numpy is None:
+        usar_numpy = NUMPY_OK
+    if usar_numpy and NUMPY_OK:
+        gols_pro = np.cumsum(np.asarray(pro, dtype=np.int64))
+        gols_contra = np.cumsum(np.asarray(contra, dtype=np.int64))
+        codigos = np.sign(np.asarray(pro, dtype=np.int64) - np.asarray(contra, dtype=np.int64))
+        vitorias = np.cumsum(codigos == 1)
+        empates = np.cumsum(codigos == 0)
+        return {
+            "x": x,
+            "gols_pro_acum": gols_pro.tolist(),
+            "gols_contra_acum": gols_contra.tolist(),
+            "saldo_acum": (gols_pro - gols_contra).tolist(),
+            "vit_acum": vitorias.tolist(),
+            "emp_acum": empates.tolist(),
+            "der_acum": np.cumsum(codigos == -1).tolist(),
+            "pontos_acum": (vitorias * 3 + empates).tolist(),
+            "posicao_rodada": posicoes,
+        }
+    gols_pro = list(accumulate(pro))
+    gols_contra = list(accumulate(contra))
+    vitorias = list(accumulate(map(gt, pro, contra), initial=0))[1:]
+    empates = list(accumulate(map(eq, pro, contra), initial=0))[1:]
+    return {
+        "x": x,
+        "gols_pro_acum": gols_pro,
+        "gols_contra_acum": gols_contra,
+        "saldo_acum": list(map(sub, gols_pro, gols_contra)),
+        "vit_acum": vitorias,
+        "emp_acum": empates,
+        "der_acum": list(accumulate(map(lt, pro, contra), initial=0))[1:],
+        "pontos_acum": [v * 3 + e for v, e in zip(vitorias, empates)],
+        "posicao_rodada": posicoes,
+    }
+
+
+JANELAS_FORMA = (5, 10)
+
+
+def _somas_moveis(valores: list, janela: int) -> list:
+    """Soma dos últimos `janela` valores em cada ponto (janela parcial no início), em O(n)."""
+    if NUMPY_OK and valores:
+        return np.convolve(np.asarray(valores, dtype=float), np.ones(janela), mode="full")[:len(valores)].tolist()
+    somas = []
+    acumulado = 0
+    for posicao, valor in enumerate(valores):
+        acumulado += valor
+        if posicao >= janela:
+            acumulado -= valores[posicao - janela]
+        somas.append(acumulado)
+    return somas
+
+
+def series_forma(jogos: list[dict], janelas=JANELAS_FORMA) -> dict:
+    """Forma recente em cada ponto da história, para cada tamanho de janela.
+
+    Para cada `w` em `janelas` devolve `pontos_w`, `aproveitamento_w` (%),
+    `saldo_w` e `gols_por_jogo_w` sobre os últimos `w` jogos (ou menos, no
+    começo da série). Todas as séries saem de somas móveis em uma passada.
+    """
+    ordenados = ordenar_jogos_por_data(jogos)
+    pontos = []
+    saldo = []
+    gols_pro = []
+    for jogo in ordenados:
+        gols_vasco, gols_adv = placar_jogo(jogo)
+        pontos.append(3 if gols_vasco > gols_adv else 1 if gols_vasco == gols_adv else 0)
+        saldo.append(gols_vasco - gols_adv)
+        gols_pro.append(gols_vasco)
+    series = {"x": list(range(1, len(ordenados) + 1)), "datas": [str(jogo.get("data", "")) for jogo in ordenados]}
+    for janela in janelas:
+        tamanhos = [min(posicao + 1, janela) for posicao in range(len(ordenados))]
+        somas_pontos = _somas_moveis(pontos, janela)
+        series[f"pontos_{janela}"] = [int(round(valor)) for valor in somas_pontos]
+        series[f"aproveitamento_{janela}"] = [
+            round(valor / (tamanho * 3) * 100, 1) for valor, tamanho in zip(somas_pontos, tamanhos)
+        ]
+        series[f"saldo_{janela}"] = [int(round(valor)) for valor in _somas_moveis(saldo, janela)]
+        series[f"gols_por_jogo_{janela}"] = [
+            round(valor / tamanho, 2) for valor, tamanho in zip(_somas_moveis(gols_pro, janela), tamanhos)
+        ]
+    return series
+
+
+def series_forma_por(jogos: list[dict], dimensao: str, janelas=JANELAS_FORMA) -> dict:
+    """`series_forma` dentro de cada valor de `dimensao` (técnico, competição...)."""
+    extrair = DIMENSOES_BITMAP[dimensao]
+    grupos = {}
+    for jogo in jogos:
+        grupos.setdefault(extrair(jogo), []).append(jogo)
+    return {chave: series_forma(grupo, janelas) for chave, grupo in grupos.items() if chave not in (None, "")}
+
+
+class ComparativoPrefixos:
+    """Somas de prefixo por temporada, por (temporada, competição) e por técnico.
+
+    `resumo_ate(tipo, chave, k)` devolve o resumo dos `k` primeiros jogos do
+    recorte em O(1): basta ler a linha `k` das somas acumuladas. Isso permite
+    comparar quaisquer dois recortes no mesmo número de jogos.
+    """
+
+    TIPOS = ("temporada", "competicao", "tecnico")
+
+    def __init__(self, jogos: list[dict]):
+        self.grupos = {tipo: {} for tipo in self.TIPOS}
+        for jogo in ordenar_jogos_por_data(jogos):
+            ano = temporada_jogo(jogo)
+            chaves = {"tecnico": normalizar_tecnico(jogo.get("tecnico"))}
+            if ano:
+                chaves["temporada"] = ano
+                chaves["competicao"] = (ano, jogo.get("competicao") or "Competição desconhecida")
+            for tipo, chave in chaves.items():
+                grupo = self.grupos[tipo].get(chave)
+                if grupo is None:
+                    grupo = self.grupos[tipo][chave] = {
+                        "jogos": [],
+                        "prefixos": [(0,) * len(CAMPOS_PREFIXO)],
+                        "posicoes": [None],
+                    }
+                grupo["jogos"].append(jogo)
+                grupo["prefixos"].append(_linha_prefixo(grupo["prefixos"][-1], jogo))
+                posicao = posicao_mais_recente([jogo])
+                grupo["posicoes"].append(grupo["posicoes"][-1] if posicao is None else posicao)
+
+    def chaves(self, tipo: str) -> list:
+        return sorted(self.grupos[tipo], key=lambda chave: str(chave).casefold())
+
+    def competicoes(self, ano, quantidade: int | None = None) -> dict:
+        """Competições da temporada -> jogos em ordem cronológica.
+
+        Com `quantidade`, só entram os jogos entre os `quantidade` primeiros da
+        temporada (cada lista continua sendo um prefixo da competição).
+        """
+        temporada = self.grupos["temporada"].get(ano)
+        primeiros = None
+        if temporada is not None and quantidade is not None:
+            primeiros = {id(jogo) for jogo in temporada["jogos"][:max(0, quantidade)]}
+        resultado = {}
+        for (ano_grupo, competicao), grupo in self.grupos["competicao"].items():
+            if ano_grupo != ano:
+                continue
+            jogos = grupo["jogos"] if primeiros is None else [jogo for jogo in grupo["jogos"] if id(jogo) in primeiros]
+            if jogos:
+                resultado[competicao] = jogos
+        return resultado
+
+    def total(self, tipo: str, chave) -> int:
+        grupo = self.grupos[tipo].get(chave)
+        return len(grupo["jogos"]) if grupo else 0
+
+    def resumo_ate(self, tipo: str, chave, quantidade: int | None = None) -> dict:
+        grupo = self.grupos[tipo].get(chave)
+        if grupo is None:
+            return resumir_jogos([])
+        total = len(grupo["jogos"])
+        quantidade = total if quantidade is None else max(0, min(quantidade, total))
+        stats = finalizar_resumo(dict(zip(CAMPOS_PREFIXO, grupo["prefixos"][quantidade])))
+        stats["posicao"] = grupo["posicoes"][quantidade]
+        return stats
+
+    def series_ate(self, tipo: str, chave, quantidade: int | None = None) -> dict:
+        """Séries acumuladas (mesmo formato de `_montar_series_evolucao`) dos primeiros jogos."""
+        grupo = self.grupos[tipo].get(chave)
+        if grupo is None:
+            return {"x": []}
+        total = len(grupo["jogos"])
+        quantidade = total if quantidade is None else max(0, min(quantidade, total))
+        linhas = [dict(zip(CAMPOS_PREFIXO, linha)) for linha in grupo["prefixos"][1:quantidade + 1]]
+        return {
+            "x": list(range(1, quantidade + 1)),
+            "gols_pro_acum": [linha["gols_pro"] for linha in linhas],
+            "gols_contra_acum": [linha["gols_contra"] for linha in linhas],
+            "saldo_acum": [linha["gols_pro"] - linha["gols_contra"] for linha in linhas],
+            "vit_acum": [linha["vitorias"] for linha in linhas],
+            "emp_acum": [linha["empates"] for linha in linhas],
+            "der_acum": [linha["derrotas"] for linha in linhas],
+            "pontos_acum": [linha["vitorias"] * 3 + linha["empates"] for linha in linhas],
+            "posicao_rodada": [posicao_mais_recente([jogo]) for jogo in grupo["jogos"][:quantidade]],
+        }
+
+
+class HistoricoAteData:
+    """Consultas "como estava em dd/mm/aaaa" sobre todo o histórico.
+
+    Guarda somas de prefixo indexadas pelo ordinal da data e, para os
+    artilheiros, uma foto acumulada a cada `intervalo` jogos mais o `Counter`
+    de cada jogo (o delta). Uma consulta faz uma bissecção na lista de ordinais
+    e soma no máximo `intervalo` deltas à foto anterior: O(log n + K).
+    """
+
+    def __init__(self, jogos: list[dict], intervalo: int = 50):
+        self.intervalo = max(1, int(intervalo))
+        self.jogos = ordenar_jogos_por_data(jogos)
+        self.ordinais = [data_ordinal(jogo) or 0 for jogo in self.jogos]
+        self.prefixos = [_MEDIDAS_VAZIAS]
+        self._deltas = []
+        self._fotos = [Counter()]
+        acumulado = Counter()
+        for posicao, jogo in enumerate(self.jogos, start=1):
+            self.prefixos.append(_linha_prefixo(self.prefixos[-1], jogo))
+            goleadores = contar_goleadores(jogo.get("gols_vasco", []))
+            self._deltas.append(goleadores)
+            acumulado.update(goleadores)
+            if posicao % self.intervalo == 0:
+                self._fotos.append(Counter(acumulado))
+
+    def __len__(self) -> int:
+        return len(self.jogos)
+
+    def posicao(self, data) -> int:
+        """Quantidade de jogos disputados até `data` (inclusive); `None` é o histórico todo."""
+        ordinal = _ordinal_limite(data)
+        return len(self.ordinais) if ordinal is None else bisect_right(self.ordinais, ordinal)
+
+    def _resumo_entre(self, inicio: int, fim: int) -> dict:
+        antes, depois = self.prefixos[inicio], self.prefixos[fim]
+        return finalizar_resumo(dict(zip(CAMPOS_PREFIXO, (b - a for a, b in zip(antes, depois)))))
+
+    def _inicio_temporada(self, fim: int) -> int:
+        if not fim or not self.ordinais[fim - 1]:
+            return 0
+        ano = date.fromordinal(self.ordinais[fim - 1]).year
+        return bisect_left(self.ordinais, date(ano, 1, 1).toordinal())
+
+    def _artilheiros_na(self, posicao: int) -> Counter:
+        foto = posicao // self.intervalo
+        contagem = Counter(self._fotos[foto])
+        for delta in self._deltas[foto * self.intervalo:posicao]:
+            contagem.update(delta)
+        return contagem
+
+    def foto(self, data=None, limite: int = 10) -> dict:
+        """Recorde geral, da temporada e artilharia (geral e da temporada) até `data`."""
+        fim = self.posicao(data)
+        inicio_temporada = self._inicio_temporada(fim)
+        artilheiros = self._artilheiros_na(fim)
+        artilheiros_temporada = artilheiros - self._artilheiros_na(inicio_temporada)
+        ultimo = self.jogos[fim - 1] if fim else None
+        return {
+            "jogos": fim,
+            "ultimo_jogo": ultimo,
+            "data": str(ultimo.get("data", "")).strip() if ultimo else "",
+            "temporada": temporada_jogo(ultimo) if ultimo else None,
+            "geral": self._resumo_entre(0, fim),
+            "temporada_resumo": self._resumo_entre(inicio_temporada, fim),
+            "artilheiros": artilheiros.most_common(limite),
+            "artilheiros_temporada": artilheiros_temporada.most_common(limite),
+        }
+
+
+# Peso (em jogos) da taxa geral por mando usada como prior do confronto direto.
+PESO_PRIOR_PROJECAO = 5
+# V, E e D empacotados num só inteiro: somar os códigos dos jogos de uma
+# simulação conta as três coisas de uma vez (até 65535 jogos por temporada).
+_CODIGO_RESULTADO = {"V": 1 << 32, "E": 1 << 16, "D": 1}
+
+
+def _taxas(contagem: Counter) -> tuple[float, float, float]:
+    total = sum(contagem.values())
+    if not total:
+        return (1 / 3, 1 / 3, 1 / 3)
+    return tuple(contagem[resultado] / total for resultado in ("V", "E", "D"))
+
+
+def _resumir_distribuicao(contagem: Counter, total: int) -> dict:
+    """Média, percentis 5/50/95 e a distribuição (valor, %, % acumulado de >= valor)."""
+    valores = sorted(contagem)
+    percentis = {}
+    acumulado = 0
+    for valor in valores:
+        acumulado += contagem[valor]
+        for rotulo, corte in (("p5", 0.05), ("p50", 0.5), ("p95", 0.95)):
+            if rotulo not in percentis and acumulado >= corte * total:
+                percentis[rotulo] = valor
+    distribuicao = []
+    restante = total
+    for valor in valores:
+        distribuicao.append({
+            "valor": valor,
+            "percentual": round(contagem[valor] / total * 100, 2),
+            "pelo_menos": round(restante / total * 100, 2),
+        })
+        restante -= contagem[valor]
+    return {
+        "media": round(sum(valor * freq for valor, freq in contagem.items()) / total, 2) if total else 0.0,
+        **percentis,
+        "distribuicao": distribuicao,
+    }
+
+
+class ProjecaoTemporada:
+    """Projeção Monte Carlo dos jogos futuros a partir do histórico.
+
+    A chance de V/E/D de cada jogo é o confronto direto com o adversário no
+    mesmo mando, suavizado pela taxa geral do Vasco naquele mando (que pesa
+    como `peso_prior` jogos). `simular` sorteia os jogos restantes
+    `simulacoes` vezes: com NumPy, em blocos de matrizes uniformes; sem NumPy,
+    um `random.choices(k=simulacoes)` por jogo somado com `map`.
+    """
+
+    def __init__(self, jogos: list[dict], futuros: list[dict], peso_prior: float = PESO_PRIOR_PROJECAO):
+        por_mando = {None: Counter(), "casa": Counter(), "fora": Counter()}
+        confrontos = {}
+        for jogo in jogos:
+            resultado = resultado_jogo(jogo)
+            mando = DIMENSOES_BITMAP["local"](jogo)
+            por_mando[None][resultado] += 1
+            por_mando[mando][resultado] += 1
+            adversario = DIMENSOES_BITMAP["adversario"](jogo).casefold()
+            confrontos.setdefault((adversario, mando), Counter())[resultado] += 1
+        self.partidas = []
+        for futuro in futuros:
+            em_casa = futuro.get("em_casa")
+            mando = None if em_casa is None else ("casa" if em_casa else "fora")
+            adversario = str(futuro.get("adversario", "")).strip()
+            direto = Counter()
+            if mando is None:
+                for local in ("casa", "fora"):
+                    direto.update(confrontos.get((adversario.casefold(), local), Counter()))
+            else:
+                direto = confrontos.get((adversario.casefold(), mando), Counter())
+            prior = _taxas(por_mando[mando])
+            total = sum(direto.values()) + peso_prior
+            probabilidades = tuple(
+                (direto[resultado] + peso_prior * taxa) / total if total else taxa
+                for resultado, taxa in zip(("V", "E", "D"), prior)
+            )
+            self.partidas.append(dict(
+                futuro,
+                adversario=adversario,
+                confrontos=sum(direto.values()),
+                prob_vitoria=probabilidades[0],
+                prob_empate=probabilidades[1],
+                prob_derrota=probabilidades[2],
+            ))
+
+    def pontos_esperados(self) -> float:
+        return sum(3 * partida["prob_vitoria"] + partida["prob_empate"] for partida in self.partidas)
+
+    def _sortear_numpy(self, simulacoes: int, semente, bloco: int = 20000) -> Counter:
+        gerador = np.random.default_rng(semente)
+        vitoria = np.array([partida["prob_vitoria"] for partida in self.partidas])
+        nao_derrota = vitoria + np.array([partida["prob_empate"] for partida in self.partidas])
+        total_jogos = len(self.partidas)
+        contagem = Counter()
+        for inicio in range(0, simulacoes, bloco):
+            sorteio = gerador.random((min(bloco, simulacoes - inicio), total_jogos))
+            vitorias = (sorteio < vitoria).sum(axis=1, dtype=np.int64)
+            empates = (sorteio < nao_derrota).sum(axis=1, dtype=np.int64) - vitorias
+            codigos = (vitorias << 32) | (empates << 16) | (total_jogos - vitorias - empates)
+            valores, frequencias = np.unique(codigos, return_counts=True)
+            contagem.update(dict(zip(valores.tolist(), frequencias.tolist())))
+        return contagem
+
+    def _sortear_python(self, simulacoes: int, semente) -> Counter:
+        gerador = random.Random(semente)
+        codigos = (_CODIGO_RESULTADO["V"], _CODIGO_RESULTADO["E"], _CODIGO_RESULTADO["D"])
+        somas = [0] * simulacoes
+        for partida in self.partidas:
+            limites = list(accumulate((partida["prob_vitoria"], partida["prob_empate"], partida["prob_derrota"])))
+            somas = list(map(add, somas, gerador.choices(codigos, cum_weights=limites, k=simulacoes)))
+        return Counter(somas)
+
+    def simular(self, simulacoes: int = 100_000, semente=None, usar_numpy: bool | None = None) -> dict:
+        """Distribuição de pontos e de V/E/D ao fim dos jogos futuros."""
+        simulacoes = max(1, int(simulacoes))
+        if usar_numpy is None:
+            usar_numpy = NUMPY_OK
+        if usar_numpy and NUMPY_OK:
+            contagem = self._sortear_numpy(simulacoes, semente)
+        else:
+            contagem = self._sortear_python(simulacoes, semente)
+        mascara = (1 << 16) - 1
+        distribuicoes = {"pontos": Counter(), "vitorias": Counter(), "empates": Counter(), "derrotas": Counter()}
+        for codigo, frequencia in contagem.items():
+            vitorias, empates, derrotas = codigo >> 32, (codigo >> 16) & mascara, codigo & mascara
+            distribuicoes["pontos"][3 * vitorias + empates] += frequencia
+            distribuicoes["vitorias"][vitorias] += frequencia
+            distribuicoes["empates"][empates] += frequencia
+            distribuicoes["derrotas"][derrotas] += frequencia
+        return {
+            "simulacoes": simulacoes,
+            "jogos": len(self.partidas),
+            "pontos_esperados": round(self.pontos_esperados(), 2),
+            **{campo: _resumir_distribuicao(dist, simulacoes) for campo, dist in distribuicoes.items()},
+        }
+
+
+class RankingOrdenado:
+    """Ranking (nome, valor) ordenado uma única vez, para top-K, páginas e busca por prefixo.
+
+    Aceita um `Counter`/dict nome -> valor, pares (nome, valor) ou linhas dict
+    com `campo_valor` (as linhas de `load_scorer_leaderboard`, por exemplo).
+    A ordem é valor decrescente e nome sem acentos. A busca usa uma lista
+    ordenada de (palavra normalizada, posição) e bissecção, então casa o início
+    do nome ou de qualquer palavra dele sem percorrer o ranking.
+    """
+
+    def __init__(self, itens, campo_valor: str = "gols"):
+        if isinstance(itens, dict):
+            itens = itens.items()
+        linhas = []
+        for item in itens:
+            if isinstance(item, dict):
+                linha = dict(item)
+                linha["valor"] = linha.get(campo_valor, 0)
+            else:
+                nome, valor = item
+                linha = {"nome": nome, "valor": valor}
+            linha.setdefault("chave", player_key(linha.get("nome", "")))
+            linhas.append(linha)
+        linhas.sort(key=lambda linha: (-linha["valor"], linha["chave"], str(linha.get("nome", ""))))
+        for posicao, linha in enumerate(linhas, start=1):
+            linha["posicao"] = posicao
+        self.linhas = linhas
+        self._palavras = sorted(
+            (palavra, posicao)
+            for posicao, linha in enumerate(linhas)
+            for palavra in {linha["chave"], *linha["chave"].split()}
+            if palavra
+        )
+
+    def __len__(self) -> int:
+        return len(self.linhas)
+
+    def top(self, k: int) -> list[dict]:
+        return self.linhas[:max(0, k)]
+
+    def pagina(self, numero: int, tamanho: int = 20) -> dict:
+        """Página `numero` (a partir de 0, limitada ao intervalo válido) do ranking."""
+        tamanho = max(1, int(tamanho))
+        total = len(self.linhas)
+        paginas = max(1, (total + tamanho - 1) // tamanho)
+        numero = max(0, min(int(numero), paginas - 1))
+        inicio = numero * tamanho
+        return {
+            "items": self.linhas[inicio:inicio + tamanho],
+            "pagina": numero,
+            "paginas": paginas,
+            "inicio": inicio,
+            "total": total,
+        }
+
+    def filtrar(self, termo: str) -> list[dict]:
+        """Linhas cujo nome contém `termo` (sem diferenciar caixa), na ordem do ranking.
+
+        Varredura linear sobre a lista já ordenada; para busca por início de
+        palavra, `buscar` evita a varredura.
+        """
+        termo = str(termo or "").strip().casefold()
+        if not termo:
+            return self.linhas
+        return [linha for linha in self.linhas if termo in str(linha.get("nome", "")).casefold()]
+
+    def buscar(self, prefixo: str, limite: int | None = None) -> list[dict]:
+        """Linhas cujo nome (ou alguma palavra dele) começa com `prefixo`, na ordem do ranking."""
+        termo = player_key(prefixo)
+        if not termo:
+            return self.linhas if limite is None else self.top(limite)
+        posicoes = set()
+        for palavra, posicao in self._palavras[bisect_left(self._palavras, (termo,)):]:
+            if not palavra.startswith(termo):
+                break
+            posicoes.add(posicao)
+        return [self.linhas[posicao] for posicao in (nsmallest(limite, posicoes) if limite else sorted(posicoes))]
+
+
+def ranking_goleadores(jogos: list[dict], lado: str = "vasco") -> RankingOrdenado:
+    """Goleadores do Vasco (ou do adversário) agrupados pela chave sem acentos.
+
+    Mesmo critério de `load_scorer_leaderboard`: gols válidos somados, jogos
+    distintos em que marcou e a grafia preferida de `_nome_preferido`. Gols
+    sem nome contam como `GOLEADOR_DESCONHECIDO`; o SQLite os descarta ao
+    gravar, então só aparecem em listas ainda não salvas.
+    """
+    campo = "gols_vasco" if lado == "vasco" else "gols_adversario"
+    totais = {}
+    nomes = {}
+    for jogo in jogos:
+        marcaram = set()
+        for nome, gols in contar_goleadores(jogo.get(campo, [])).items():
+            chave = player_key(nome)
+            if not chave:
+                continue
+            nomes[chave] = _nome_preferido(nomes.get(chave), nome)
+            atual = totais.setdefault(chave, [0, 0])
+            atual[0] += gols
+            if chave not in marcaram:
+                marcaram.add(chave)
+                atual[1] += 1
+    return RankingOrdenado(
+        {"nome": nomes[chave], "chave": chave, "gols": gols, "jogos": jogos_marcou}
+        for chave, (gols, jogos_marcou) in totais.items()
+    )
+
+
+class CacheIndices:
+    """Índices em memória da versão atual dos jogos, com uma única leitura por versão.
+
+    `carregar` devolve a lista de jogos e `ler_versao` o contador gravado no
+    banco (`load_matches_version`), que também muda quando outro processo grava.
+    Quando a versão muda, todos os índices são descartados e a lista é relida
+    uma vez na primeira consulta; cada índice é construído sob demanda a partir
+    dessa mesma lista, então índices usados juntos sempre descrevem os mesmos
+    jogos. Dentro de `mesma_versao()` a versão é lida uma vez só (uma
+    renderização completa das abas, por exemplo).
+    """
+
+    def __init__(self, carregar, ler_versao):
+        self._carregar = carregar
+        self._ler_versao = ler_versao
+        self.versao = None
+        self._jogos = None
+        self._indices = {}
+        self._fixada = 0
+
+    def atualizar(self) -> int:
+        """Relê a versão e descarta o que ficou para trás."""
+        if self._fixada:
+            return self.versao
+        versao = self._ler_versao()
+        if versao != self.versao:
+            self.versao = versao
+            self._jogos = None
+            self._indices = {}
+        return versao
+
+    @contextmanager
+    def mesma_versao(self):
+        """Lê a versão uma vez e a mantém fixa até o fim do bloco."""
+        self.atualizar()
+        self._fixada += 1
+        try:
+            yield self
+        finally:
+            self._fixada -= 1
+
+    def jogos(self) -> list[dict]:
+        """A lista de jogos da versão atual (compartilhada; não deve ser alterada)."""
+        self.atualizar()
+        if self._jogos is None:
+            self._jogos = self._carregar()
+        return self._jogos
+
+    def indice(self, nome: str, construir):
+        """Índice `nome`, construído com `construir(jogos)` se ainda não existir nesta versão."""
+        self.atualizar()
+        indice = self._indices.get(nome)
+        if indice is None:
+            indice = self._indices[nome] = construir(self.jogos())
+        return indice
+
+    def registrar_gravacao(self, versao_nova: int, delta=None, incrementais=("cubo",)):
+        """Ajusta o cache depois de uma gravação que deixou o banco em `versao_nova`.
+
+        Se o cache estava exatamente uma versão atrás, a única gravação no meio
+        foi esta: os índices em `incrementais` recebem `delta=(antigo, novo)`
+        por `substituir` e continuam valendo. Qualquer outro salto (outro
+        processo gravou no intervalo) descarta tudo.
+        """
+        if versao_nova == self.versao:
+            return
+        mantidos = {}
+        if delta is not None and self.versao is not None and versao_nova == self.versao + 1:
+            for nome in incrementais:
+                indice = self._indices.get(nome)
+                if indice is not None:
+                    indice.substituir(*delta)
+                    mantidos[nome] = indice
+        self.versao = versao_nova
+        self._jogos = None
+        self._indices = mantidos
+
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Compara `aggregate_matches` (GROUP BY no SQLite) com os laços em Python.
+
+Uso: python benchmarks/bench_aggregate_matches.py [quantidade_de_jogos]
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from storage_sqlite import aggregate_matches, load_matches, save_matches  # noqa: E402
+
+ADVERSARIOS = [f"Clube {i:02d}" for i in range(40)]
+COMPETICOES = ["Brasileirão Série A", "Copa do Brasil", "Campeonato Carioca", "Sul-Americana"]
+TECNICOS = [f"Técnico {i}" for i in range(12)]
+ESTADIOS = ["São Januário", "Maracanã", "Nilton Santos", "Mineirão", "Morumbi", ""]
+
+
+def gerar_jogos(quantidade: int, seed: int = 26) -> list[dict]:
+    rnd = random.Random(seed)
+    inicio = date(1990, 1, 1)
+    jogos = []
+    for i in range(quantidade):
+        dia = inicio + timedelta(days=i * 3)
+        jogos.append(
+            {
+                "data": dia.strftime("%d/%m/%Y"),
+                "adversario": rnd.choice(ADVERSARIOS),
+                "competicao": rnd.choice(COMPETICOES),
+                "local": rnd.choice(("casa", "fora")),
+                "estadio": rnd.choice(ESTADIOS),
+                "placar": {"vasco": rnd.randint(0, 4), "adversario": rnd.randint(0, 3)},
+                "gols_vasco": [],
+                "gols_adversario": [],
+                "tecnico": TECNICOS[(i // 60) % len(TECNICOS)],
+            }
+        )
+    return jogos
+
+
+CAMPOS_PYTHON = {
+    "season": lambda j: j["data"][-4:],
+    "competition": lambda j: j.get("competicao"),
+    "coach": lambda j: j.get("tecnico"),
+    "stadium": lambda j: j.get("estadio"),
+    "opponent": lambda j: j.get("adversario"),
+    "location": lambda j: j.get("local"),
+}
+
+
+def agregar_em_python(db_path: str, group_by: list[str]) -> dict:
+    grupos = defaultdict(lambda: [0, 0, 0, 0, 0, 0])
+    for jogo in load_matches(db_path):
+        chave = tuple(CAMPOS_PYTHON[dim](jogo) for dim in group_by)
+        gp = jogo["placar"]["vasco"]
+        gc = jogo["placar"]["adversario"]
+        info = grupos[chave]
+        info[0] += 1
+        info[1 if gp > gc else (2 if gp == gc else 3)] += 1
+        info[4] += gp
+        info[5] += gc
+    return grupos
+
+
+def medir(func, repeticoes: int = 5) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        ini = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - ini)
+    return melhor
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.sqlite3")
+        save_matches(db_path, gerar_jogos(quantidade))
+        print(f"{quantidade} jogos sintéticos")
+        print(f"{'agrupamento':<24}{'python (ms)':>14}{'sqlite (ms)':>14}{'ganho':>9}")
+        for group_by in ([], ["season"], ["competition"], ["coach"], ["stadium"], ["season", "competition"]):
+            t_py = medir(lambda: agregar_em_python(db_path, group_by))
+            t_sql = medir(lambda: aggregate_matches(db_path, group_by=group_by))
+            nome = "+".join(group_by) or "(total)"
+            print(f"{nome:<24}{t_py * 1000:>14.2f}{t_sql * 1000:>14.2f}{t_py / t_sql:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Mede `analytics.analisar_jogos` e as consultas sobre os índices, sem Tk.
+
+Uso: python benchmarks/bench_analytics.py [quantidade_de_jogos]
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import analytics  # noqa: E402
+from bench_aggregate_matches import ADVERSARIOS, TECNICOS, gerar_jogos, medir  # noqa: E402
+
+JOGADORES = [f"Jogador {i:03d}" for i in range(150)]
+
+
+def gerar_jogos_com_gols(quantidade: int, seed: int = 30) -> list[dict]:
+    rnd = random.Random(seed)
+    jogos = gerar_jogos(quantidade, seed)
+    for jogo in jogos:
+        jogo["gols_vasco"] = [{"nome": rnd.choice(JOGADORES), "gols": 1} for _ in range(jogo["placar"]["vasco"])]
+        elenco = rnd.sample(JOGADORES, 18)
+        jogo["escalacao_partida"] = {"titulares": elenco[:11], "reservas": elenco[11:]}
+        jogo["gols_adversario"] = [
+            {"nome": f"Atacante {rnd.randint(0, 400)}", "gols": 1} for _ in range(jogo["placar"]["adversario"])
+        ]
+    return jogos
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    jogos = gerar_jogos_com_gols(quantidade)
+    print(f"{quantidade} jogos sintéticos")
+
+    ini = time.perf_counter()
+    analise = analytics.analisar_jogos(jogos)
+    print(f"{'analisar_jogos':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms")
+
+    consultas = {
+        "resumo_geral": lambda: analytics.resumo_geral(analise),
+        "retrospecto (40 adv.)": lambda: [analytics.retrospecto(analise, adv) for adv in ADVERSARIOS],
+        "passagens (12 técnicos)": lambda: [analytics.passagens_tecnico(analise, tec) for tec in TECNICOS],
+        "series_forma": lambda: analytics.series_forma(jogos),
+        "series_forma_por técnico": lambda: analytics.series_forma_por(jogos, "tecnico"),
+        "campanha_titulo": lambda: analytics.campanha_titulo(analise, "Copa do Brasil", 2000),
+    }
+    ini = time.perf_counter()
+    sequencias = analytics.MotorSequencias(jogos)
+    sequencias.maior_sequencia("invicto")
+    print(f"{'MotorSequencias (1ª consulta)':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms")
+    consultas["sequência por período"] = lambda: [
+        sequencias.maior_sequencia("invicto", f"01/01/{ano}", f"31/12/{ano}") for ano in range(1990, 2030)
+    ]
+    ini = time.perf_counter()
+    bitmap = analytics.IndiceBitmap(jogos)
+    print(f"{'IndiceBitmap':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms")
+    consultas["bitmap (3 filtros)"] = lambda: bitmap.resumo(
+        bitmap.mascara(competicao="Copa do Brasil", local="casa", resultado=["V", "E"])
+    )
+    consultas["bitmap por estádio"] = lambda: bitmap.linhas_por("estadio", bitmap.mascara(temporada=2001))
+    ini = time.perf_counter()
+    parcerias = analytics.MatrizParcerias(jogos)
+    print(f"{'MatrizParcerias':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms")
+    consultas["parceiros (1 jogador)"] = lambda: parcerias.parceiros(JOGADORES[0])
+    consultas["matriz (30 jogadores)"] = lambda: parcerias.matriz(JOGADORES[:30])
+    ini = time.perf_counter()
+    comparativo = analytics.ComparativoPrefixos(jogos)
+    print(f"{'ComparativoPrefixos':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms")
+    anos = comparativo.chaves("temporada")
+    consultas["comparativo (todos os pares)"] = lambda: [
+        comparativo.resumo_ate("temporada", b, comparativo.total("temporada", a)) for a in anos for b in anos
+    ]
+    ini = time.perf_counter()
+    cubo = analytics.CuboAgregados(jogos)
+    print(f"{'CuboAgregados':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms")
+    consultas["cubo (fatia de 4 filtros)"] = lambda: cubo.resumo(
+        tecnico=TECNICOS[0], local="casa", competicao="Copa do Brasil", temporada_inicio=2000
+    )
+    consultas["cubo por temporada/local"] = lambda: cubo.agrupar(("temporada", "local"))
+    editado = dict(jogos[-1], placar={"vasco": 3, "adversario": 0})
+    consultas["delta de edição"] = lambda: (
+        cubo.substituir(jogos[-1], editado),
+        cubo.substituir(editado, jogos[-1]),
+    )
+    ini = time.perf_counter()
+    recordes = analytics.MotorRecordes(jogos)
+    print(f"{'MotorRecordes':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms")
+    consultas["recordes (todas, 1 técnico)"] = lambda: [
+        recordes.recordes(categoria, "tecnico", TECNICOS[0]) for categoria in analytics.CATEGORIAS_RECORDE
+    ]
+    ini = time.perf_counter()
+    historico = analytics.HistoricoAteData(jogos)
+    print(f"{'HistoricoAteData':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms")
+    consultas["foto até data (40 datas)"] = lambda: [historico.foto(f"15/06/{ano}") for ano in range(1990, 2030)]
+    ini = time.perf_counter()
+    carrascos = analytics.IndiceCarrascos(jogos)
+    print(f"{'IndiceCarrascos':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms")
+    consultas["carrascos (1 clube)"] = lambda: carrascos.ranking(10, clube=ADVERSARIOS[0])
+    consultas["carrascos top por clube"] = lambda: carrascos.top_por_clube(1)
+    ini = time.perf_counter()
+    ranking = analytics.ranking_goleadores(jogos)
+    print(f"{'ranking_goleadores':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms")
+    consultas["ranking (10 páginas)"] = lambda: [ranking.pagina(pagina) for pagina in range(10)]
+    consultas["ranking busca por prefixo"] = lambda: ranking.buscar("jogador 01")
+    futuros = [{"adversario": ADVERSARIOS[i % len(ADVERSARIOS)], "em_casa": i % 2 == 0} for i in range(38)]
+    projecao = analytics.ProjecaoTemporada(jogos, futuros)
+    ini = time.perf_counter()
+    projecao.simular(100_000, semente=1)
+    motor = "NumPy" if analytics.NUMPY_OK else "Python puro"
+    print(f"{'projeção 100k x 38 jogos':<28}{(time.perf_counter() - ini) * 1000:>10.2f} ms ({motor})")
+    for nome, func in consultas.items():
+        print(f"{nome:<28}{medir(func) * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Compara o laço original de `_montar_series_evolucao` com `analytics.series_evolucao`.
+
+Mede o caminho em Python puro e, se o NumPy estiver instalado, o vetorizado.
+
+Uso: python benchmarks/bench_series_evolucao.py [quantidade_de_jogos]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import analytics  # noqa: E402
+from bench_aggregate_matches import gerar_jogos  # noqa: E402
+
+
+def laco_original(jogos: list[dict]) -> dict:
+    """Cópia do laço jogo a jogo que `_montar_series_evolucao` usava."""
+    jogos_ordenados = sorted(jogos, key=lambda j: analytics.data_ordinal(j) or 0)
+    x, gols_pro_acum, gols_contra_acum, saldo_acum = [], [], [], []
+    vit_acum, emp_acum, der_acum, pontos_acum, posicao_rodada = [], [], [], [], []
+    gp = gc = v = e = d = 0
+    for i, jogo in enumerate(jogos_ordenados, start=1):
+        placar = jogo.get("placar", {"vasco": 0, "adversario": 0})
+        vasco = placar.get("vasco", 0)
+        adv = placar.get("adversario", 0)
+        gp += vasco
+        gc += adv
+        if vasco > adv:
+            v += 1
+        elif vasco == adv:
+            e += 1
+        else:
+            d += 1
+        x.append(i)
+        gols_pro_acum.append(gp)
+        gols_contra_acum.append(gc)
+        saldo_acum.append(gp - gc)
+        vit_acum.append(v)
+        emp_acum.append(e)
+        der_acum.append(d)
+        pontos_acum.append(v * 3 + e)
+        try:
+            posicao_rodada.append(int(jogo.get("posicao_tabela")))
+        except (TypeError, ValueError):
+            posicao_rodada.append(None)
+    return {
+        "x": x,
+        "gols_pro_acum": gols_pro_acum,
+        "gols_contra_acum": gols_contra_acum,
+        "saldo_acum": saldo_acum,
+        "vit_acum": vit_acum,
+        "emp_acum": emp_acum,
+        "der_acum": der_acum,
+        "pontos_acum": pontos_acum,
+        "posicao_rodada": posicao_rodada,
+    }
+
+
+def medir(func, repeticoes: int = 3) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        ini = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - ini)
+    return melhor
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    jogos = gerar_jogos(quantidade)
+    for posicao, jogo in enumerate(jogos):
+        # Como em `load_matches`, cada jogo já chega com o ordinal da data.
+        jogo["data_ordinal"] = analytics.data_ordinal(jogo)
+        if jogo["competicao"] == "Brasileirão Série A":
+            jogo["posicao_tabela"] = posicao % 20 + 1
+    print(f"{quantidade} jogos sintéticos")
+
+    referencia = laco_original(jogos)
+    caminhos = {
+        "laço original": lambda: laco_original(jogos),
+        "Python puro (accumulate)": lambda: analytics.series_evolucao(jogos, usar_numpy=False),
+    }
+    if analytics.NUMPY_OK:
+        caminhos["NumPy (cumsum)"] = lambda: analytics.series_evolucao(jogos, usar_numpy=True)
+    else:
+        print("NumPy não instalado: medindo só o caminho em Python puro.")
+
+    base = None
+    for nome, func in caminhos.items():
+        if func() != referencia:
+            raise SystemExit(f"{nome}: séries diferentes do laço original")
+        tempo = medir(func)
+        base = base or tempo
+        print(f"{nome:<28}{tempo * 1000:>10.2f} ms{base / tempo:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,9 +14,9 @@ except Exception:
     TKCALENDAR_OK = False
 import tkinter.font as tkFont
 import re
-import unicodedata
-from datetime import datetime
+from datetime import date, datetime
 from storage_sqlite import (
+    aggregate_matches as db_aggregate_matches,
     backup_database_snapshot,
     bootstrap_database,
     db_path_for,
@@ -27,13 +27,59 @@ from storage_sqlite import (
     load_historic_players as db_load_historic_players,
     load_listas as db_load_listas,
     load_matches as db_load_matches,
+    load_matches_version as db_load_matches_version,
+    load_scorer_leaderboard as db_load_scorer_leaderboard,
     load_titles as db_load_titles,
+    load_top_scorers_by as db_load_top_scorers_by,
+    player_key as db_player_key,
     save_current_squad as db_save_current_squad,
     save_future_matches as db_save_future_matches,
     save_historic_players as db_save_historic_players,
     save_listas as db_save_listas,
     save_matches as db_save_matches,
     save_titles as db_save_titles,
+    upsert_future_matches as db_upsert_future_matches,
+)
+from analytics import (
+    RESULTADO_TEXTO,
+    CATEGORIAS_RECORDE,
+    NUMPY_OK,
+    SEM_ESTADIO,
+    SIMULACOES_MAX_SEM_NUMPY,
+    CacheIndices,
+    ComparativoPrefixos,
+    CuboAgregados,
+    HistoricoAteData,
+    IndiceCarrascos,
+    IndiceBitmap,
+    MatrizParcerias,
+    MotorRecordes,
+    MotorSequencias,
+    ProjecaoTemporada,
+    RankingOrdenado,
+    analisar_jogos,
+    campanhas_titulos,
+    contar_goleadores,
+    data_ordinal,
+    estatisticas_jogador_periodo,
+    formatar_goleadores,
+    indexar_adversarios,
+    indexar_capitaes,
+    indexar_jogadores,
+    listar_adversarios,
+    normalizar_tecnico,
+    novo_resumo,
+    passagens_tecnico,
+    placar_jogo,
+    posicao_mais_recente,
+    ranking_goleadores,
+    resultado_jogo,
+    resumir_jogos,
+    retrospecto,
+    series_forma,
+    series_evolucao,
+    series_forma_por,
+    temporada_jogo,
 )
 
 # --- Matplotlib (gráficos) ---
@@ -219,6 +265,76 @@ def carregar_dados_jogos():
     return db_load_matches(DB_PATH)
 
 
+# Índices em memória derivados de uma única leitura dos jogos por versão gravada
+# no banco: gravações de outro processo (o app web) também os invalidam.
+_indices = CacheIndices(carregar_dados_jogos, lambda: db_load_matches_version(DB_PATH))
+
+
+def carregar_analise():
+    return _indices.indice("analise", analisar_jogos)
+
+
+def carregar_indice_jogadores():
+    return _indices.indice("jogadores", indexar_jogadores)
+
+
+def carregar_indice_capitaes():
+    return _indices.indice("capitaes", indexar_capitaes)
+
+
+def carregar_carrascos():
+    return _indices.indice("carrascos", IndiceCarrascos)
+
+
+def carregar_ranking(lado="vasco"):
+    """Goleadores já ordenados para a versão atual dos jogos (top-K, páginas e busca)."""
+    return _indices.indice(f"ranking_{lado}", lambda jogos: ranking_goleadores(jogos, lado))
+
+
+def carregar_ranking_carrascos():
+    return _indices.indice(
+        "ranking_carrascos",
+        lambda _jogos: RankingOrdenado(
+            {"nome": f"{item['nome']} ({item['clube']})", "gols": item["gols"]}
+            for item in carregar_carrascos().ranking(por_clube=True)
+        ),
+    )
+
+
+def carregar_indice_bitmap():
+    return _indices.indice("bitmap", IndiceBitmap)
+
+
+def carregar_parcerias():
+    return _indices.indice("parcerias", MatrizParcerias)
+
+
+def carregar_comparativo():
+    return _indices.indice("comparativo", ComparativoPrefixos)
+
+
+def carregar_sequencias():
+    return _indices.indice("sequencias", MotorSequencias)
+
+
+def carregar_recordes():
+    return _indices.indice("recordes", MotorRecordes)
+
+
+def carregar_historico():
+    return _indices.indice("historico", HistoricoAteData)
+
+
+def _texto_sequencia(info):
+    if not info["tamanho"]:
+        return "0"
+    return f"{info['tamanho']}\n{info['inicio_data']} até {info['fim_data']}"
+
+
+def carregar_cubo():
+    return _indices.indice("cubo", CuboAgregados)
+
+
 def carregar_jogos_futuros():
     return db_load_future_matches(DB_PATH)
 
@@ -269,15 +385,22 @@ def salvar_listas(data):
 def salvar_jogo(jogo):
     dados = carregar_dados_jogos()
     dados.append(jogo)
-    salvar_lista_jogos(dados)
+    salvar_lista_jogos(dados, delta=(None, jogo))
 
 
-def salvar_lista_jogos(dados):
-    db_save_matches(DB_PATH, dados)
+def salvar_lista_jogos(dados, delta=None):
+    """Grava os jogos; `delta=(antigo, novo)` descreve a única alteração feita na lista."""
+    _indices.registrar_gravacao(db_save_matches(DB_PATH, dados), delta)
 
 
 def salvar_lista_futuros(dados):
-    db_save_future_matches(DB_PATH, dados)
+    """Regrava os jogos futuros; retorna quantos repetidos (mesma chave natural) foram descartados."""
+    return db_save_future_matches(DB_PATH, dados)
+
+
+def inserir_jogos_futuros(dados):
+    """Insere só os jogos futuros novos; retorna (adicionados, duplicados)."""
+    return db_upsert_future_matches(DB_PATH, dados)
 
 
 def carregar_estadio_adversario(nome_time: str) -> str:
@@ -623,12 +746,12 @@ def salvar_jogadores_historico(dados):
 
 
 def _chave_nome_jogador(nome):
-    nome_limpo = re.sub(r"\s+", " ", str(nome or "").strip())
-    nome_sem_acentos = "".join(
-        ch for ch in unicodedata.normalize("NFKD", nome_limpo)
-        if not unicodedata.combining(ch)
-    )
-    return nome_sem_acentos.casefold()
+    return db_player_key(nome)
+
+
+def carregar_ranking_artilheiros(lado="vasco", filtros=None, limite=None, inicio=0):
+    """Ranking de goleadores calculado no SQLite (chave sem acentos, sem gols anulados)."""
+    return db_load_scorer_leaderboard(DB_PATH, side=lado, filters=filtros, limit=limite, offset=inicio)
 
 
 def _parse_data_ptbr(s: str) -> datetime:
@@ -648,61 +771,11 @@ def _hoje_ptbr() -> str:
 
 
 def _normalizar_nome_tecnico(nome: str) -> str:
-    tecnico = str(nome or "").strip()
-    return tecnico or "(Sem Técnico)"
+    return normalizar_tecnico(nome)
 
 
 def _criar_stats_tecnico():
-    return {
-        "jogos": 0,
-        "casa": 0,
-        "fora": 0,
-        "vitorias": 0,
-        "empates": 0,
-        "derrotas": 0,
-        "gols_pro": 0,
-        "gols_contra": 0,
-        "artilheiros": Counter(),
-    }
-
-
-def _acumular_stats_tecnico(info: dict, jogo: dict):
-    info["jogos"] += 1
-    local = jogo.get("local", "casa")
-    if local == "fora":
-        info["fora"] += 1
-    else:
-        info["casa"] += 1
-
-    placar = jogo.get("placar", {"vasco": 0, "adversario": 0})
-    gols_vasco = int(placar.get("vasco", 0) or 0)
-    gols_adv = int(placar.get("adversario", 0) or 0)
-    info["gols_pro"] += gols_vasco
-    info["gols_contra"] += gols_adv
-
-    for g in jogo.get("gols_vasco", []):
-        if isinstance(g, dict):
-            nome = str(g.get("nome", "Desconhecido")).strip() or "Desconhecido"
-            info["artilheiros"][nome] += int(g.get("gols", 0) or 0)
-        elif isinstance(g, str):
-            nome = g.strip()
-            if nome:
-                info["artilheiros"][nome] += 1
-
-    if gols_vasco > gols_adv:
-        info["vitorias"] += 1
-    elif gols_vasco < gols_adv:
-        info["derrotas"] += 1
-    else:
-        info["empates"] += 1
-
-
-def _texto_artilheiro_counter(artilheiros: Counter) -> str:
-    top = artilheiros.most_common(1)
-    if not top:
-        return "—"
-    nome, gols = top[0]
-    return f"{nome} ({gols})"
+    return novo_resumo()
 
 
 def _calcular_aproveitamento_stats(info: dict) -> float:
@@ -713,98 +786,15 @@ def _calcular_aproveitamento_stats(info: dict) -> float:
     return round((pontos / (jogos * 3)) * 100, 1)
 
 
-def _ordenar_jogos_por_data(jogos):
-    return sorted(
-        jogos,
-        key=lambda j: (
-            _parse_data_ptbr_safe(str(j.get("data", "")).strip()) or datetime.min,
-            str(j.get("adversario", "")).casefold(),
-        ),
-    )
-
-
-def _resumo_partida_tecnico(jogo: dict) -> str:
-    adversario = str(jogo.get("adversario", "Adversário não informado")).strip() or "Adversário não informado"
-    placar = jogo.get("placar", {"vasco": 0, "adversario": 0})
-    gols_vasco = int(placar.get("vasco", 0) or 0)
-    gols_adv = int(placar.get("adversario", 0) or 0)
-    competicao = str(jogo.get("competicao", "")).strip()
-    resumo = f"Vasco {gols_vasco} x {gols_adv} {adversario}"
-    if competicao:
-        resumo = f"{resumo} | {competicao}"
-    return resumo
-
-
 def _resultado_jogo_tecnico(jogo: dict) -> str:
-    placar = jogo.get("placar", {"vasco": 0, "adversario": 0})
-    gols_vasco = int(placar.get("vasco", 0) or 0)
-    gols_adv = int(placar.get("adversario", 0) or 0)
-    if gols_vasco > gols_adv:
-        return "Vitória"
-    if gols_vasco < gols_adv:
-        return "Derrota"
-    return "Empate"
+    return RESULTADO_TEXTO[resultado_jogo(jogo)]
 
 
 def _placar_jogo_tecnico(jogo: dict) -> str:
-    placar = jogo.get("placar", {"vasco": 0, "adversario": 0})
-    gols_vasco = int(placar.get("vasco", 0) or 0)
-    gols_adv = int(placar.get("adversario", 0) or 0)
+    gols_vasco, gols_adv = placar_jogo(jogo)
     return f"Vasco {gols_vasco} x {gols_adv} {str(jogo.get('adversario', '')).strip() or 'Adversário não informado'}"
 
 
-def _gerar_passagens_tecnico(jogos, tecnico_nome: str):
-    jogos_ordenados = _ordenar_jogos_por_data(jogos)
-    tecnico_alvo = _normalizar_nome_tecnico(tecnico_nome)
-    passagens = []
-    passagem_atual = None
-
-    for jogo in jogos_ordenados:
-        tecnico_jogo = _normalizar_nome_tecnico(jogo.get("tecnico"))
-        if tecnico_jogo != tecnico_alvo:
-            passagem_atual = None
-            continue
-
-        if passagem_atual is None:
-            passagem_atual = {
-                "tecnico": tecnico_alvo,
-                "jogos_lista": [],
-                "stats": _criar_stats_tecnico(),
-            }
-            passagens.append(passagem_atual)
-
-        passagem_atual["jogos_lista"].append(jogo)
-        _acumular_stats_tecnico(passagem_atual["stats"], jogo)
-
-    rows = []
-    for idx, passagem in enumerate(passagens, start=1):
-        jogos_passagem = passagem["jogos_lista"]
-        inicio = jogos_passagem[0]
-        fim = jogos_passagem[-1]
-        info = passagem["stats"]
-        rows.append({
-            "passagem": idx,
-            "periodo": f"{str(inicio.get('data', '—')).strip() or '—'} a {str(fim.get('data', '—')).strip() or '—'}",
-            "inicio_data": str(inicio.get("data", "—")).strip() or "—",
-            "primeiro_jogo": _resumo_partida_tecnico(inicio),
-            "fim_data": str(fim.get("data", "—")).strip() or "—",
-            "ultimo_jogo": _resumo_partida_tecnico(fim),
-            "jogos_lista": jogos_passagem,
-            "jogos": info["jogos"],
-            "casa": info["casa"],
-            "fora": info["fora"],
-            "vitorias": info["vitorias"],
-            "empates": info["empates"],
-            "derrotas": info["derrotas"],
-            "gols_pro": info["gols_pro"],
-            "gols_contra": info["gols_contra"],
-            "saldo": info["gols_pro"] - info["gols_contra"],
-            "aproveitamento": _calcular_aproveitamento_stats(info),
-            "artilheiro": _texto_artilheiro_counter(info["artilheiros"]),
-        })
-    return rows
-
-
 def _extrair_adversario_de_jogo(jogo_txt: str) -> str:
     if not jogo_txt:
         return ""
@@ -1018,6 +1008,7 @@ class App:
         self.frame_registro = ttk.Frame(self.notebook, padding=10)
         self.frame_temporadas = ttk.Frame(self.notebook, padding=10)
         self.frame_geral = ttk.Frame(self.notebook, padding=10)
+        self.frame_recordes = ttk.Frame(self.notebook, padding=10)
         self.frame_estadios = ttk.Frame(self.notebook, padding=10)
         self.frame_comparativo = ttk.Frame(self.notebook, padding=10)
         self.frame_tecnicos = ttk.Frame(self.notebook, padding=10)
@@ -1029,6 +1020,7 @@ class App:
         self.notebook.add(self.frame_registro, text="Registrar Jogo")
         self.notebook.add(self.frame_retro, text="Retrospecto")
         self.notebook.add(self.frame_geral, text="Geral")
+        self.notebook.add(self.frame_recordes, text="Recordes")
         self.notebook.add(self.frame_temporadas, text="Temporadas")
         self.notebook.add(self.frame_comparativo, text="Comparativo")
         self.notebook.add(self.frame_graficos, text="Evolução")
@@ -1045,6 +1037,7 @@ class App:
         self._sincronizar_jogadores_historico()
         self._carregar_temporadas()
         self._carregar_geral()
+        self._carregar_recordes()
         self._carregar_estadios()
         self._carregar_comparativo()
         self._carregar_graficos()
@@ -1210,9 +1203,100 @@ class App:
         self._retro_sort_col = "data"
         self._retro_sort_reverse = True
 
+        self._criar_painel_projecao(frame)
         self._render_lista_futuros()
         self._atualizar_retro_futuro_selecionado()
 
+    def _criar_painel_projecao(self, frame):
+        projecao_frame = ttk.Labelframe(frame, text="Projeção dos jogos futuros (Monte Carlo)", padding=8)
+        projecao_frame.grid(row=6, column=0, columnspan=2, sticky="nsew", pady=(10, 0))
+        projecao_frame.columnconfigure(0, weight=1)
+        projecao_frame.rowconfigure(1, weight=1)
+
+        controles = ttk.Frame(projecao_frame)
+        controles.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 8))
+        ttk.Label(controles, text="Simulações:").pack(side="left")
+        self.projecao_simulacoes_var = tk.IntVar(value=100000 if NUMPY_OK else SIMULACOES_MAX_SEM_NUMPY)
+        ttk.Spinbox(
+            controles,
+            from_=1000,
+            to=1000000,
+            increment=10000,
+            textvariable=self.projecao_simulacoes_var,
+            width=10,
+        ).pack(side="left", padx=(6, 6))
+        ttk.Button(controles, text="Simular", command=self._simular_projecao).pack(side="left")
+        if not NUMPY_OK:
+            ttk.Label(
+                controles,
+                text=f"NumPy indisponível: no máximo {SIMULACOES_MAX_SEM_NUMPY} simulações.",
+            ).pack(side="left", padx=(8, 0))
+
+        self.projecao_resumo_var = tk.StringVar(
+            value="Simula os jogos futuros com as taxas do confronto direto e do mando de campo."
+        )
+        ttk.Label(projecao_frame, textvariable=self.projecao_resumo_var, justify="left").grid(
+            row=1, column=0, sticky="nw"
+        )
+
+        cols = ("pontos", "percentual", "pelo_menos")
+        self.tv_projecao = ttk.Treeview(projecao_frame, columns=cols, show="headings", height=6)
+        for col, titulo, largura in (("pontos", "Pontos", 70), ("percentual", "Chance (%)", 90), ("pelo_menos", "Pelo menos (%)", 110)):
+            self.tv_projecao.heading(col, text=titulo)
+            self.tv_projecao.column(col, width=largura, anchor="center")
+        self.tv_projecao.tag_configure("odd", background=self.colors["row_alt_bg"])
+        self.tv_projecao.grid(row=1, column=1, sticky="ns", padx=(10, 0))
+        sy = ttk.Scrollbar(projecao_frame, orient="vertical", command=self.tv_projecao.yview)
+        sy.grid(row=1, column=2, sticky="ns")
+        self.tv_projecao.configure(yscrollcommand=sy.set)
+
+    def _jogos_futuros_pendentes(self):
+        hoje = datetime.now().date()
+        pendentes = []
+        for item in carregar_jogos_futuros():
+            normalizado = _normalizar_futuro_item(item)
+            if not normalizado:
+                continue
+            data_obj = _parse_data_ptbr_safe(normalizado["data"])
+            if not data_obj or data_obj.date() < hoje:
+                continue
+            normalizado["adversario"] = _extrair_adversario_de_jogo(normalizado.get("jogo", ""))
+            pendentes.append(normalizado)
+        return pendentes
+
+    def _simular_projecao(self):
+        try:
+            simulacoes = int(self.projecao_simulacoes_var.get())
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Erro", "Informe um número válido de simulações.")
+            return
+        projecao = ProjecaoTemporada(carregar_dados_jogos(), self._jogos_futuros_pendentes())
+        self.tv_projecao.delete(*self.tv_projecao.get_children())
+        if not projecao.partidas:
+            self.projecao_resumo_var.set("Nenhum jogo futuro pendente para simular.")
+            return
+        limitado = not NUMPY_OK and simulacoes > SIMULACOES_MAX_SEM_NUMPY
+        if limitado:
+            simulacoes = SIMULACOES_MAX_SEM_NUMPY
+        resultado = projecao.simular(simulacoes)
+        pontos = resultado["pontos"]
+        self.projecao_resumo_var.set(
+            f"{resultado['simulacoes']} simulações de {resultado['jogos']} jogos"
+            f"{' (limite sem NumPy)' if limitado else ''}\n"
+            f"Pontos: média {pontos['media']} (esperado {resultado['pontos_esperados']}), "
+            f"90% entre {pontos['p5']} e {pontos['p95']}, mediana {pontos['p50']}\n"
+            f"Vitórias: média {resultado['vitorias']['media']} | "
+            f"Empates: média {resultado['empates']['media']} | "
+            f"Derrotas: média {resultado['derrotas']['media']}"
+        )
+        for i, linha in enumerate(reversed(pontos["distribuicao"]), start=1):
+            self.tv_projecao.insert(
+                "",
+                "end",
+                values=(linha["valor"], f"{linha['percentual']:.2f}", f"{linha['pelo_menos']:.2f}"),
+                tags=("odd",) if i % 2 else (),
+            )
+
     def _importar_jogos_futuros(self):
         raw = self.futuros_json_text.get("1.0", "end").strip()
         if not raw:
@@ -1250,42 +1334,14 @@ class App:
             messagebox.showerror("Erro", "Nenhum jogo válido encontrado no JSON.")
             return
 
-        existentes = carregar_jogos_futuros()
-        base = list(existentes)
-
-        def chave_futuro(item):
-            return (
-                str(item.get("data", "")).strip(),
-                str(item.get("jogo", "")).strip(),
-                item.get("em_casa"),
-                str(item.get("campeonato", "")).strip(),
-            )
-
-        chaves_existentes = set()
-        for item in existentes:
-            normalizado = _normalizar_futuro_item(item)
-            if normalizado:
-                chaves_existentes.add(chave_futuro(normalizado))
-
-        adicionados = 0
-        duplicados = 0
-        for item in validos:
-            chave = chave_futuro(item)
-            if chave in chaves_existentes:
-                duplicados += 1
-                continue
-            base.append(item)
-            chaves_existentes.add(chave)
-            adicionados += 1
-
-        salvar_lista_futuros(base)
-        self._render_lista_futuros()
+        adicionados, duplicados = inserir_jogos_futuros(validos)
+        total_cadastrado = self._render_lista_futuros()
         message = f"Novos adicionados: {adicionados}"
         if duplicados:
             message += f" | Já existiam: {duplicados}"
         if invalidos:
             message += f" | Inválidos: {invalidos}"
-        message += f" | Total cadastrado: {len(base)}"
+        message += f" | Total cadastrado: {total_cadastrado}"
         messagebox.showinfo("Importação concluída", message)
 
     def _criar_aba_retro(self, frame):
@@ -1475,14 +1531,7 @@ class App:
         self._atualizar_opcoes_aba_retro()
 
     def _listar_adversarios_com_historico(self):
-        return sorted(
-            {
-                str(j.get("adversario", "")).strip()
-                for j in carregar_dados_jogos()
-                if str(j.get("adversario", "")).strip()
-            },
-            key=lambda s: s.casefold()
-        )
+        return listar_adversarios(carregar_analise())
 
     def _atualizar_opcoes_aba_retro(self):
         if not hasattr(self, "retro_adversario_combo"):
@@ -1580,43 +1629,16 @@ class App:
                     melhor = p
             return "—" if melhor is None else _fmt_partida_card(melhor)
 
-        def _maior_jejum(partidas, sem_vencer_resultados):
-            max_len = 0
-            cur_len = 0
-            inicio = fim = None
-            cur_inicio = None
-            streak_atual = False
-            for p in partidas:  # cronológico (mais antigo -> mais novo)
-                res = str(p.get("resultado", "")).strip()
-                if res in sem_vencer_resultados:
-                    cur_len += 1
-                    if cur_inicio is None:
-                        cur_inicio = p
-                    cur_fim = p
-                    if cur_len > max_len:
-                        max_len = cur_len
-                        inicio, fim = cur_inicio, cur_fim
-                        streak_atual = False
-                else:
-                    cur_len = 0
-                    cur_inicio = None
-            if partidas:
-                ultimo = partidas[-1]
-                if str(ultimo.get("resultado", "")).strip() in sem_vencer_resultados and inicio is not None and fim is not None:
-                    # Se o maior jejum termina no último jogo, considera em andamento.
-                    streak_atual = str(fim.get("data", "")) == str(ultimo.get("data", ""))
-            return {"qtd": max_len, "inicio": inicio, "fim": fim, "em_andamento": streak_atual}
-
         def _fmt_jejum_card(info):
-            qtd = int(info.get("qtd", 0) or 0)
+            qtd = info["tamanho"]
             if qtd <= 0:
                 return "0 jogo(s)\nPeríodo: —"
-            inicio = info.get("inicio") or {}
-            fim = info.get("fim") or {}
-            data_ini = str(inicio.get("data", "—")).strip() or "—"
-            data_fim = "hoje" if info.get("em_andamento") else (str(fim.get("data", "—")).strip() or "—")
+            data_ini = info["inicio_data"] or "—"
+            data_fim = "hoje" if info["em_andamento"] else (info["fim_data"] or "—")
             return f"{qtd} jogo(s)\n{data_ini} até {data_fim}"
 
+        sequencias = carregar_sequencias()
+
         aproveitamento = ((retro["vitorias"] * 3 + retro["empates"]) / (total * 3)) * 100 if total else 0.0
         self.retro_aba_total_var.set(str(total))
         self.retro_aba_aproveitamento_var.set(f"{aproveitamento:.0f}%")
@@ -1632,8 +1654,8 @@ class App:
         self.retro_aba_elastico_adv_titulo_var.set(f"Para o {adversario}")
         self.retro_aba_jejum_adv_titulo_var.set(f"{adversario} sem vencer")
         self.retro_aba_jejum_vasco_titulo_var.set("Vasco sem vencer")
-        self.retro_aba_jejum_adv_var.set(_fmt_jejum_card(_maior_jejum(retro["partidas"], {"Vitória", "Empate"})))
-        self.retro_aba_jejum_vasco_var.set(_fmt_jejum_card(_maior_jejum(retro["partidas"], {"Derrota", "Empate"})))
+        self.retro_aba_jejum_adv_var.set(_fmt_jejum_card(sequencias.maior_sequencia("invicto", adversario=adversario)))
+        self.retro_aba_jejum_vasco_var.set(_fmt_jejum_card(sequencias.maior_sequencia("sem_vitoria", adversario=adversario)))
         self.retro_aba_art_vasco_var.set(artilheiros_vasco)
         self.retro_aba_art_adv_titulo_var.set(f"Artilheiros do {adversario}")
         self.retro_aba_art_adv_var.set(artilheiros_adv)
@@ -1749,9 +1771,10 @@ class App:
             messagebox.showerror("Erro", "Data inválida. Use o formato dd/mm/aaaa.")
             return
 
-        jogos = carregar_jogos_futuros()
-        jogos.append(normalizado)
-        salvar_lista_futuros(jogos)
+        adicionados, _ = inserir_jogos_futuros([normalizado])
+        if not adicionados:
+            messagebox.showwarning("Jogo já cadastrado", "Esse jogo futuro já está na lista.")
+            return
         self._render_lista_futuros()
         self.fut_manual_adversario_var.set("")
         self.fut_manual_campeonato_var.set("")
@@ -1793,30 +1816,13 @@ class App:
                 tags=tuple(tags)
             )
         self._atualizar_retro_futuro_selecionado()
+        return len(jogos)
 
     def _contagem_goleadores(self, gols_lista):
-        contagem = Counter()
-        for item in gols_lista or []:
-            if isinstance(item, dict):
-                nome = str(item.get("nome", "")).strip() or "Desconhecido"
-                try:
-                    qtd = int(item.get("gols", 1))
-                except (ValueError, TypeError):
-                    qtd = 1
-                contagem[nome] += max(1, qtd)
-            elif isinstance(item, str):
-                nome = item.strip()
-                if nome:
-                    contagem[nome] += 1
-        return contagem
+        return contar_goleadores(gols_lista)
 
     def _formatar_goleadores(self, contagem):
-        if not contagem:
-            return "—"
-        partes = []
-        for nome, qtd in contagem.most_common():
-            partes.append(f"{nome} x{qtd}" if qtd > 1 else nome)
-        return ", ".join(partes)
+        return formatar_goleadores(contagem)
 
     def _formatar_resultado_com_bolinha(self, resultado):
         resultado_txt = str(resultado or "").strip()
@@ -1831,71 +1837,16 @@ class App:
         return f"{bolinha} {resultado_txt}".strip()
 
     def _coletar_retro_por_adversario(self, adversario):
-        retrospecto = {
-            "partidas": [],
-            "vitorias": 0,
-            "empates": 0,
-            "derrotas": 0,
-            "gols_vasco": 0,
-            "gols_adversario": 0,
-            "artilheiros_vasco": Counter(),
-            "artilheiros_adversario": Counter(),
-        }
         if not adversario:
-            return retrospecto
-
-        jogos = carregar_dados_jogos()
-        alvo = adversario.casefold()
-        for jogo in jogos:
-            adv_jogo = str(jogo.get("adversario", "")).strip()
-            if not adv_jogo or adv_jogo.casefold() != alvo:
-                continue
-
-            placar = jogo.get("placar", {})
-            try:
-                gols_vasco = int(placar.get("vasco", 0))
-            except (ValueError, TypeError):
-                gols_vasco = 0
-            try:
-                gols_adv = int(placar.get("adversario", 0))
-            except (ValueError, TypeError):
-                gols_adv = 0
-
-            if gols_vasco > gols_adv:
-                resultado = "Vitória"
-                retrospecto["vitorias"] += 1
-            elif gols_vasco < gols_adv:
-                resultado = "Derrota"
-                retrospecto["derrotas"] += 1
-            else:
-                resultado = "Empate"
-                retrospecto["empates"] += 1
-
-            retrospecto["gols_vasco"] += gols_vasco
-            retrospecto["gols_adversario"] += gols_adv
-
-            goleadores_vasco = self._contagem_goleadores(jogo.get("gols_vasco", []))
-            goleadores_adv = self._contagem_goleadores(jogo.get("gols_adversario", []))
-            retrospecto["artilheiros_vasco"].update(goleadores_vasco)
-            retrospecto["artilheiros_adversario"].update(goleadores_adv)
-
-            local = "Casa" if jogo.get("local", "casa") == "casa" else "Fora"
-            data_txt = str(jogo.get("data", "")).strip()
-            data_ord = _parse_data_ptbr_safe(data_txt) or datetime.min
-
-            retrospecto["partidas"].append({
-                "data": data_txt or "—",
-                "data_ord": data_ord,
-                "competicao": str(jogo.get("competicao", "")).strip() or "—",
-                "local": local,
-                "placar": f"{gols_vasco} x {gols_adv}",
-                "resultado": resultado,
-                "gols_vasco": self._formatar_goleadores(goleadores_vasco),
-                "gols_adversario": self._formatar_goleadores(goleadores_adv),
-            })
-
-        retrospecto["partidas"].sort(key=lambda p: p["data_ord"])
-        return retrospecto
+            return retrospecto(indexar_adversarios([]), "")
+        retro = retrospecto(carregar_analise(), adversario)
+        for partida in retro["partidas"]:
+            partida["data_ord"] = partida["data_ord"] or 0
+            partida["resultado"] = partida["resultado_texto"]
+        retro["artilheiros_adversario"] = Counter(
+            {linha["nome"]: linha["gols"] for linha in carregar_carrascos().ranking(clube=adversario)}
+        )
+        return retro
 
     def _atualizar_retro_futuro_selecionado(self, _event=None):
         if not hasattr(self, "tv_retro_futuros"):
@@ -1947,7 +1898,7 @@ class App:
 
     def _chave_ordenacao_retro(self, partida, coluna):
         if coluna == "data":
-            return partida.get("data_ord") or datetime.min
+            return partida.get("data_ord") or 0
         if coluna == "placar":
             placar_txt = str(partida.get("placar", "0 x 0")).strip()
             m = re.match(r"^\s*(\d+)\s*x\s*(\d+)\s*$", placar_txt)
@@ -2624,14 +2575,11 @@ class App:
         return ""
 
     def _jogadores_que_foram_capitaes(self) -> set[str]:
-        capitaes = set()
+        """Chaves normalizadas (`_chave_nome_jogador`) de quem já foi capitão, mais o capitão atual."""
+        capitaes = set(carregar_indice_capitaes())
         capitao_atual = self._nome_capitao_elenco_atual()
         if capitao_atual:
-            capitaes.add(capitao_atual.casefold())
-        for jogo in carregar_dados_jogos():
-            nome = str(jogo.get("capitao", "")).strip()
-            if nome:
-                capitaes.add(nome.casefold())
+            capitaes.add(_chave_nome_jogador(capitao_atual))
         return capitaes
 
     def _opcoes_capitao_partida(self):
@@ -3152,7 +3100,7 @@ class App:
             posicao = _normalizar_posicao_elenco(jogador.get("posicao"))
             cond = atuais.get(nome.casefold())
             status = cond if cond else "Ex-jogador"
-            foi_capitao = nome.casefold() in capitaes
+            foi_capitao = _chave_nome_jogador(nome) in capitaes
             icone_capitao = "🎗" if foi_capitao else ""
             if termo:
                 haystack = f"{posicao} {nome} {status} {'sim' if foi_capitao else 'nao'}".casefold()
@@ -3250,10 +3198,50 @@ class App:
         detalhes = self._coletar_detalhes_jogador_historico(nome)
         self.jogador_hist_titulo_var.set(f"Jogador: {nome}")
         self._render_detalhes_jogador_historico(detalhes)
+        self._render_parcerias_jogador_historico(nome)
+
+    def _render_parcerias_jogador_historico(self, nome):
+        parceiros = carregar_parcerias().parceiros(nome)
+        if not parceiros:
+            return
+        frame = ttk.Frame(self.detalhes_jogador_notebook, padding=(0, 4, 0, 0))
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        cols = ("parceiro", "jogos_juntos", "titulares_juntos", "ved", "aproveitamento")
+        tv = ttk.Treeview(frame, columns=cols, show="headings", height=16)
+        titulos = {
+            "parceiro": "Parceiro",
+            "jogos_juntos": "Jogos juntos",
+            "titulares_juntos": "Titulares juntos",
+            "ved": "V/E/D (titulares)",
+            "aproveitamento": "Aproveitamento (%)",
+        }
+        for col, largura in zip(cols, (200, 90, 110, 120, 120)):
+            tv.heading(col, text=titulos[col])
+            tv.column(col, width=largura, anchor="w" if col == "parceiro" else "center")
+        tv.tag_configure("odd", background=self.colors["row_alt_bg"])
+        tv.grid(row=0, column=0, sticky="nsew")
+        sy = ttk.Scrollbar(frame, orient="vertical", command=tv.yview)
+        sy.grid(row=0, column=1, sticky="ns")
+        tv.configure(yscrollcommand=sy.set)
+        for i, row in enumerate(parceiros, start=1):
+            tv.insert(
+                "",
+                "end",
+                values=(
+                    row["parceiro"],
+                    row["jogos_juntos"],
+                    row["titulares_juntos"],
+                    f"{row['vitorias']}/{row['empates']}/{row['derrotas']}",
+                    row["aproveitamento"],
+                ),
+                tags=("odd",) if i % 2 else (),
+            )
+        self.detalhes_jogador_notebook.add(frame, text="Parcerias")
+        self._detalhes_jogador_abas["parcerias"] = tv
 
     def _coletar_detalhes_jogador_historico(self, nome):
         alvo = _chave_nome_jogador(nome)
-        jogos = carregar_dados_jogos()
         data_registro = ""
         data_entrada = ""
         data_saida = ""
@@ -3295,7 +3283,7 @@ class App:
         for indice, passagem in enumerate(passagens, start=1):
             entrada = str(passagem.get("data_entrada", "")).strip()
             saida = str(passagem.get("data_saida", "")).strip()
-            stats_passagem = self._coletar_estatisticas_jogador_periodo(nome, jogos, entrada, saida)
+            stats_passagem = self._coletar_estatisticas_jogador_periodo(nome, entrada, saida)
             estatisticas_passagens.append(stats_passagem)
             titulo = f"{entrada or '—'} a {saida or 'Atual'}"
             itens = [
@@ -3321,140 +3309,15 @@ class App:
         else:
             detalhes["geral"].extend(
                 self._formatar_detalhes_estatisticas_jogador(
-                    self._coletar_estatisticas_jogador_periodo(nome, jogos, data_entrada, data_saida)
+                    self._coletar_estatisticas_jogador_periodo(nome, data_entrada, data_saida)
                 )
             )
         return detalhes
 
-    def _coletar_estatisticas_jogador_periodo(self, nome, jogos, data_entrada="", data_saida=""):
-        alvo = _chave_nome_jogador(nome)
-        data_entrada_dt = _parse_data_ptbr_safe(data_entrada) if data_entrada else None
-        data_saida_dt = _parse_data_ptbr_safe(data_saida) if data_saida else None
-        jogos_com_escalacao = 0
-        jogos_com_participacao = 0
-        jogos_titular = 0
-        jogos_reserva = 0
-        jogos_nao_rel = 0
-        jogos_lesionado = 0
-        gols = 0
-        partidas_com_gol = 0
-        gols_banco = 0
-        gols_titular = 0
-        jogos_como_capitao = 0
-        vitorias = empates = derrotas = 0
-
-        for jogo in jogos:
-            data_jogo = str(jogo.get("data", "")).strip()
-            data_jogo_dt = _parse_data_ptbr_safe(data_jogo)
-            if data_entrada_dt and data_jogo_dt and data_jogo_dt < data_entrada_dt:
-                continue
-            if data_saida_dt and data_jogo_dt and data_jogo_dt > data_saida_dt:
-                continue
-            participou = False
-            gol_no_jogo = 0
-            gol_banco_jogo = 0
-            esc = jogo.get("escalacao_partida", jogo.get("escalacao"))
-            em_titulares = False
-            em_reservas = False
-            em_nao_rel = False
-            em_lesionados = False
-
-            if isinstance(esc, dict):
-                jogos_com_escalacao += 1
-                tit_por_pos = esc.get("titulares_por_posicao", {})
-                if isinstance(tit_por_pos, dict):
-                    for pos in POSICOES_ELENCO:
-                        for nm in tit_por_pos.get(pos, []):
-                            if _chave_nome_jogador(nm) == alvo:
-                                em_titulares = True
-                                break
-                        if em_titulares:
-                            break
-                if not em_titulares:
-                    for nm in esc.get("titulares", []):
-                        if _chave_nome_jogador(nm) == alvo:
-                            em_titulares = True
-                            break
-                em_reservas = any(_chave_nome_jogador(nm) == alvo for nm in esc.get("reservas", []))
-                em_nao_rel = any(_chave_nome_jogador(nm) == alvo for nm in esc.get("nao_relacionados", []))
-                em_lesionados = any(_chave_nome_jogador(nm) == alvo for nm in esc.get("lesionados", []))
-
-            for g in jogo.get("gols_vasco", []):
-                if isinstance(g, dict):
-                    nome_g = str(g.get("nome", "")).strip()
-                    if _chave_nome_jogador(nome_g) != alvo:
-                        continue
-                    try:
-                        qtd = int(g.get("gols", 0))
-                    except Exception:
-                        qtd = 0
-                    if qtd <= 0:
-                        continue
-                    gol_no_jogo += qtd
-                    saiu_do_banco = bool(g.get("saiu_do_banco", False))
-                    if not saiu_do_banco and em_reservas and not em_titulares:
-                        saiu_do_banco = True
-                    if saiu_do_banco:
-                        gol_banco_jogo += qtd
-                elif isinstance(g, str):
-                    nome_g = g.strip()
-                    if _chave_nome_jogador(nome_g) == alvo:
-                        gol_no_jogo += 1
-                        if em_reservas and not em_titulares:
-                            gol_banco_jogo += 1
-
-            if gol_no_jogo > 0:
-                participou = True
-                gols += gol_no_jogo
-                partidas_com_gol += 1
-                gols_banco += gol_banco_jogo
-                gols_titular += max(0, gol_no_jogo - gol_banco_jogo)
-
-            if _chave_nome_jogador(jogo.get("capitao", "")) == alvo:
-                jogos_como_capitao += 1
-
-            if isinstance(esc, dict):
-                if em_titulares:
-                    jogos_titular += 1
-                    participou = True
-                elif em_reservas:
-                    jogos_reserva += 1
-                    participou = True
-                elif em_nao_rel:
-                    jogos_nao_rel += 1
-                elif em_lesionados:
-                    jogos_lesionado += 1
-
-            if participou:
-                jogos_com_participacao += 1
-                placar = jogo.get("placar", {})
-                try:
-                    vasco = int(placar.get("vasco", 0))
-                    adv = int(placar.get("adversario", 0))
-                except Exception:
-                    vasco = adv = 0
-                if vasco > adv:
-                    vitorias += 1
-                elif vasco == adv:
-                    empates += 1
-                else:
-                    derrotas += 1
-
-        media_gols = round(gols / jogos_com_participacao, 2) if jogos_com_participacao else 0.0
-        return {
-            "jogos_com_participacao": jogos_com_participacao,
-            "jogos_titular": jogos_titular,
-            "jogos_reserva": jogos_reserva,
-            "jogos_nao_rel": jogos_nao_rel,
-            "jogos_lesionado": jogos_lesionado,
-            "gols": gols,
-            "jogos_como_capitao": jogos_como_capitao,
-            "partidas_com_gol": partidas_com_gol,
-            "gols_titular": gols_titular,
-            "gols_banco": gols_banco,
-            "media_gols": media_gols,
-            "participacao_ved": f"{vitorias}/{empates}/{derrotas}",
-        }
+    def _coletar_estatisticas_jogador_periodo(self, nome, data_entrada="", data_saida=""):
+        return estatisticas_jogador_periodo(
+            carregar_indice_jogadores(), nome, data_entrada, data_saida, capitaes=carregar_indice_capitaes()
+        )
 
     def _formatar_detalhes_estatisticas_jogador(self, stats):
         return [
@@ -4612,15 +4475,17 @@ class App:
         jogos = carregar_dados_jogos()
         if self.editing_index is not None:
             if 0 <= self.editing_index < len(jogos):
+                antigo = jogos[self.editing_index]
+                jogo["db_match_id"] = antigo.get("db_match_id")
                 jogos[self.editing_index] = jogo
-                salvar_lista_jogos(jogos)
+                salvar_lista_jogos(jogos, delta=(antigo, jogo))
                 msg = "Partida atualizada com sucesso!"
             else:
                 messagebox.showerror("Erro", "Não foi possível localizar o jogo selecionado para edição.")
                 return
         else:
             jogos.append(jogo)
-            salvar_lista_jogos(jogos)
+            salvar_lista_jogos(jogos, delta=(None, jogo))
             msg = "Partida registrada com sucesso!"
 
         self._atualizar_condicoes_elenco_por_escalacao(escalacao_partida)
@@ -4913,7 +4778,7 @@ class App:
             return
 
         jogos.pop(jogo_idx)
-        salvar_lista_jogos(jogos)
+        salvar_lista_jogos(jogos, delta=(jogo, None))
 
         if self.editing_index == jogo_idx:
             self._limpar_formulario()
@@ -4929,18 +4794,22 @@ class App:
         self.jogadores_historico = carregar_jogadores_historico()
         self._sincronizar_jogadores_historico()
         self._atualizar_elenco_disponivel_partida()
-        self._carregar_temporadas()
-        self._carregar_geral()
-        self._carregar_estadios()
-        self._carregar_comparativo()
-        self._carregar_tecnicos()
-        self._carregar_titulos()
-        self._carregar_graficos()
-        self._render_aba_jogadores_historico()
-        if hasattr(self, "retro_adversario_combo"):
-            self._atualizar_opcoes_aba_retro()
-            if self.retro_adversario_var.get().strip():
-                self._atualizar_retro_aba_adversario()
+        # Uma leitura da versão e, se ela mudou, uma única releitura dos jogos
+        # para todos os índices usados pelas abas abaixo.
+        with _indices.mesma_versao():
+            self._carregar_temporadas()
+            self._carregar_geral()
+            self._carregar_recordes()
+            self._carregar_estadios()
+            self._carregar_comparativo()
+            self._carregar_tecnicos()
+            self._carregar_titulos()
+            self._carregar_graficos()
+            self._render_aba_jogadores_historico()
+            if hasattr(self, "retro_adversario_combo"):
+                self._atualizar_opcoes_aba_retro()
+                if self.retro_adversario_var.get().strip():
+                    self._atualizar_retro_aba_adversario()
 
     # --------------------- Menu de contexto ---------------------
     def mostrar_menu_contexto(self, event, tipo):
@@ -5191,41 +5060,17 @@ class App:
             widget.destroy()
         self._temporadas_filtros_vars = []
 
-        jogos = carregar_dados_jogos()
+        # A lista e as máscaras da busca saem do mesmo índice: os idx das linhas batem com os bits.
+        indice = carregar_indice_bitmap()
+        jogos = indice.jogos
         if not jogos:
             ttk.Label(self.frame_temporadas, text="Ainda não há jogos registrados.").pack(anchor="w")
             return
 
         temporadas = defaultdict(list)
-        artilheiros_totais = Counter()
-        carrascos_totais = Counter()
         for idx, jogo in enumerate(jogos):
             ano = jogo["data"][-4:]
             temporadas[ano].append((idx, jogo))
-            for g in jogo.get("gols_vasco", []):
-                if isinstance(g, dict):
-                    artilheiros_totais[g["nome"]] += g["gols"]
-            for g in jogo.get("gols_adversario", []):
-                if isinstance(g, dict):
-                    carrascos_totais[g["nome"]] += g["gols"]
-        invicto_totais = 0
-        invicto_max_totais = 0
-        derrota_totais = 0
-        derrota_max_totais = 0
-        streak_inv = 0
-        streak_der = 0
-        for jogo in sorted(jogos, key=lambda j: _parse_data_ptbr(j["data"])):
-            placar = jogo.get("placar", {"vasco": 0, "adversario": 0})
-            vasco = placar.get("vasco", 0)
-            adv = placar.get("adversario", 0)
-            if vasco >= adv:
-                streak_inv += 1
-                invicto_max_totais = max(invicto_max_totais, streak_inv)
-                streak_der = 0
-            else:
-                streak_der += 1
-                derrota_max_totais = max(derrota_max_totais, streak_der)
-                streak_inv = 0
 
         if not temporadas:
             ttk.Label(self.frame_temporadas, text="Não foi possível agrupar as temporadas.").pack(anchor="w")
@@ -5273,7 +5118,7 @@ class App:
                     return
                 for child in container_temporada_antiga.winfo_children():
                     child.destroy()
-                self._montar_conteudo_temporada(container_temporada_antiga, ano_sel, temporadas[ano_sel])
+                self._montar_conteudo_temporada(container_temporada_antiga, ano_sel, temporadas[ano_sel], indice)
 
             combo_temporadas_antigas.bind("<<ComboboxSelected>>", _render_temporada_antiga)
             ttk.Button(seletor_wrap, text="Carregar", command=_render_temporada_antiga).pack(side="left")
@@ -5282,7 +5127,7 @@ class App:
         for idx, ano in enumerate(anos_visiveis):
             frame_ano = ttk.Frame(nb, padding=10)
             nb.add(frame_ano, text=str(ano))
-            self._montar_conteudo_temporada(frame_ano, ano, temporadas[ano])
+            self._montar_conteudo_temporada(frame_ano, ano, temporadas[ano], indice)
 
         try:
             if nb.tabs():
@@ -5290,16 +5135,12 @@ class App:
         except tk.TclError:
             pass
 
-    def _montar_conteudo_temporada(self, frame_ano, ano, jogos_ano):
+    def _montar_conteudo_temporada(self, frame_ano, ano, jogos_ano, indice):
         vitorias = empates = derrotas = 0
         gols_pro = gols_contra = 0
-        artilheiros = Counter()
-        carrascos = Counter()
 
         rows = []
-        streak_inv = streak_sem_vitoria = 0
-        invicto_max = sem_vitoria_max = 0
-        for idx_global, jogo in sorted(jogos_ano, key=lambda j: _parse_data_ptbr(j[1]["data"])):
+        for idx_global, jogo in sorted(jogos_ano, key=lambda j: data_ordinal(j[1]) or 0):
             local = jogo.get("local", "desconhecido").capitalize()
             placar = jogo.get("placar", {"vasco": 0, "adversario": 0})
             competicao = jogo.get("competicao", "Competição Desconhecida")
@@ -5310,32 +5151,15 @@ class App:
             if placar["vasco"] > placar["adversario"]:
                 resultado = "Vitória"
                 vitorias += 1
-                streak_inv += 1
-                invicto_max = max(invicto_max, streak_inv)
-                streak_sem_vitoria = 0
             elif placar["vasco"] < placar["adversario"]:
                 resultado = "Derrota"
                 derrotas += 1
-                streak_sem_vitoria += 1
-                sem_vitoria_max = max(sem_vitoria_max, streak_sem_vitoria)
-                streak_inv = 0
             else:
                 empates += 1
-                streak_inv += 1
-                invicto_max = max(invicto_max, streak_inv)
-                streak_sem_vitoria += 1
-                sem_vitoria_max = max(sem_vitoria_max, streak_sem_vitoria)
 
             gols_pro += placar.get("vasco", 0)
             gols_contra += placar.get("adversario", 0)
 
-            for g in jogo.get("gols_vasco", []):
-                if isinstance(g, dict):
-                    artilheiros[g["nome"]] += g["gols"]
-            for g in jogo.get("gols_adversario", []):
-                if isinstance(g, dict):
-                    carrascos[g["nome"]] += g["gols"]
-
             rows.append({
                 "data": data,
                 "local": local,
@@ -5352,6 +5176,13 @@ class App:
         aproveitamento = round(((vitorias * 3 + empates) / (jogos_disputados * 3)) * 100, 1) if jogos_disputados else 0.0
         media_gols_pro = round(gols_pro / jogos_disputados, 2) if jogos_disputados else 0.0
         media_gols_contra = round(gols_contra / jogos_disputados, 2) if jogos_disputados else 0.0
+        sequencias = carregar_sequencias()
+        try:
+            periodo = (date(int(ano), 1, 1), date(int(ano), 12, 31))
+        except ValueError:
+            periodo = (None, None)
+        invicto_max = _texto_sequencia(sequencias.maior_sequencia("invicto", *periodo))
+        sem_vitoria_max = _texto_sequencia(sequencias.maior_sequencia("sem_vitoria", *periodo))
         cards = ttk.Frame(frame_ano)
         cards.pack(fill="x", pady=(0, 8))
         cards.columnconfigure((0, 1, 2, 3), weight=1)
@@ -5398,6 +5229,8 @@ class App:
             width=26,
         )
         combo_filtro_estadio.pack(side="left", padx=(6, 6))
+        resumo_filtro_var = tk.StringVar(value="")
+        rows_por_idx = {r["idx"]: r for r in rows}
 
         table_wrap = ttk.Frame(frame_ano)
         table_wrap.pack(fill="both", expand=True)
@@ -5486,14 +5319,7 @@ class App:
         ):
             termo_txt = str(termo_busca or "").strip()
             termo_cf = termo_txt.casefold()
-            termo_norm = _chave_nome_jogador(termo_txt)
-            resultado_por_termo = None
-            if termo_cf == "vv":
-                resultado_por_termo = "vitoria"
-            elif termo_cf == "ee":
-                resultado_por_termo = "empate"
-            elif termo_cf == "dd":
-                resultado_por_termo = "derrota"
+            resultado_por_termo = {"vv": "V", "ee": "E", "dd": "D"}.get(termo_cf)
             score_match = re.match(r"^\s*(\d+)\s*x\s*(\d+)\s*$", termo_txt, flags=re.IGNORECASE)
             tv_ref.delete(*tv_ref.get_children())
             tooltip_map_ref.clear()
@@ -5501,49 +5327,26 @@ class App:
             item_to_idx_ref.clear()
             obs_frame_ref.pack_forget()
 
-            linhas = rows_base
-            if termo_cf:
-                if score_match:
-                    vasco_q = int(score_match.group(1))
-                    adv_q = int(score_match.group(2))
-                    linhas = []
-                    for r in rows_base:
-                        placar = (r.get("raw") or {}).get("placar", {})
-                        try:
-                            v = int(placar.get("vasco", -999))
-                            a = int(placar.get("adversario", -999))
-                        except Exception:
-                            continue
-                        if v == vasco_q and a == adv_q:
-                            linhas.append(r)
-                else:
-                    linhas = [
-                        r for r in rows_base
-                        if (
-                            termo_cf in str(r.get("adversario", "")).casefold()
-                            or termo_norm in _chave_nome_jogador(r.get("adversario", ""))
-                            or termo_cf in str(r.get("competicao", "")).casefold()
-                            or termo_norm in _chave_nome_jogador(r.get("competicao", ""))
-                            or termo_cf in str(r.get("tecnico", "")).casefold()
-                            or termo_norm in _chave_nome_jogador(r.get("tecnico", ""))
-                            or (
-                                resultado_por_termo is not None
-                                and resultado_por_termo == _chave_nome_jogador(r.get("resultado", ""))
-                            )
-                        )
-                    ]
-            estadio_sel = str(estadio_sel or "").strip()
-            if estadio_sel and estadio_sel != "Todos":
-                linhas = [
-                    r for r in linhas
-                    if str((r.get("raw") or {}).get("estadio", "")).strip().casefold() == estadio_sel.casefold()
-                ]
+            mascara = indice.mascara_de(rows_por_idx) & indice.mascara(estadio=estadio_sel)
+            if score_match:
+                mascara &= indice.mascara(placar=f"{int(score_match.group(1))}x{int(score_match.group(2))}")
+            elif termo_cf:
+                busca = indice.buscar_texto(termo_txt, sem_acentos=True)
+                if resultado_por_termo:
+                    busca |= indice.mascara(resultado=resultado_por_termo)
+                mascara &= busca
+            linhas = [rows_por_idx[idx] for idx in indice.indices(mascara) if idx in rows_por_idx]
+            filtrado = indice.resumo(mascara)
+            resumo_filtro_var.set(
+                f"{filtrado['jogos']} jogo(s) | {filtrado['vitorias']}V {filtrado['empates']}E "
+                f"{filtrado['derrotas']}D | gols {filtrado['gols_pro']} x {filtrado['gols_contra']}"
+            )
 
             def _sort_key(r):
                 col = sort_state_ref["col"]
                 jogo_raw = r.get("raw", {})
                 if col == "data":
-                    return _parse_data_ptbr_safe(str(r.get("data", ""))) or datetime.min
+                    return data_ordinal(jogo_raw) or 0
                 if col == "local":
                     return str(r.get("local", "")).casefold()
                 if col == "competicao":
@@ -5619,6 +5422,7 @@ class App:
             render_fn(rows_ref, filtro_var.get(), filtro_estadio_var_ref.get())
 
         ttk.Button(filtros_temporada, text="Limpar", command=_limpar_filtro_temporada).pack(side="left")
+        ttk.Label(filtros_temporada, textvariable=resumo_filtro_var).pack(side="left", padx=(10, 0))
         filtro_adversario_var.trace_add(
             "write",
             lambda *_args, rows_ref=rows, filtro_var=filtro_adversario_var, filtro_estadio_var_ref=filtro_estadio_var, render_fn=_render_rows_temporada: render_fn(rows_ref, filtro_var.get(), filtro_estadio_var_ref.get())
@@ -5671,46 +5475,16 @@ class App:
         for widget in self.frame_geral.winfo_children():
             widget.destroy()
 
-        jogos = carregar_dados_jogos()
-        total = len(jogos)
-        vitorias = empates = derrotas = 0
-        gols_pro = gols_contra = 0
-        artilheiros = Counter()
-        carrascos = Counter()
-        streak_inv = streak_der = 0
-        invicto_max = derrota_max = 0
-
-        jogos_ord = sorted(jogos, key=lambda j: _parse_data_ptbr(j["data"]))
-        for jogo in jogos_ord:
-            placar = jogo.get("placar")
-            if not placar:
-                continue
-
-            gols_pro += placar.get("vasco", 0)
-            gols_contra += placar.get("adversario", 0)
-
-            if placar["vasco"] > placar["adversario"]:
-                vitorias += 1
-                streak_inv += 1
-                invicto_max = max(invicto_max, streak_inv)
-                streak_der = 0
-            elif placar["vasco"] < placar["adversario"]:
-                derrotas += 1
-                streak_der += 1
-                derrota_max = max(derrota_max, streak_der)
-                streak_inv = 0
-            else:
-                empates += 1
-                streak_inv += 1
-                invicto_max = max(invicto_max, streak_inv)
-                streak_der = 0
-
-            for g in jogo.get("gols_vasco", []):
-                if isinstance(g, dict):
-                    artilheiros[g["nome"]] += g["gols"]
-            for g in jogo.get("gols_adversario", []):
-                if isinstance(g, dict):
-                    carrascos[g["nome"]] += g["gols"]
+        totais = db_aggregate_matches(DB_PATH)[0]
+        total = totais["jogos"]
+        vitorias = totais["vitorias"]
+        empates = totais["empates"]
+        derrotas = totais["derrotas"]
+        gols_pro = totais["gols_pro"]
+        gols_contra = totais["gols_contra"]
+        sequencias = carregar_sequencias()
+        invicto_max = _texto_sequencia(sequencias.maior_sequencia("invicto"))
+        derrota_max = _texto_sequencia(sequencias.maior_sequencia("derrotas"))
 
         saldo = gols_pro - gols_contra
         aproveitamento = round(((vitorias * 3 + empates) / (total * 3)) * 100, 1) if total else 0.0
@@ -5741,11 +5515,13 @@ class App:
         make_card(cards, "Maior sequência invicta", invicto_max).grid(row=2, column=2, sticky="nsew", padx=6, pady=6)
         make_card(cards, "Maior sequência derrotas", derrota_max).grid(row=2, column=3, sticky="nsew", padx=6, pady=6)
 
+        self._montar_linha_do_tempo(self.frame_geral)
+
         # Tabelas
         tables = ttk.Frame(self.frame_geral)
         tables.pack(fill="both", expand=True)
 
-        def _criar_lista_filtravel(parent, titulo, heading_jogador, largura_jogador, dados, padx):
+        def _criar_lista_filtravel(parent, titulo, heading_jogador, largura_jogador, ranking, padx):
             frame = ttk.Labelframe(parent, text=titulo, padding=8)
             frame.pack(side="left", fill="both", expand=True, padx=padx)
 
@@ -5764,48 +5540,205 @@ class App:
             tv.tag_configure("odd", background=self.colors["row_alt_bg"])
             tv.pack(fill="both", expand=True)
 
-            def _render(lista):
+            def _render(linhas):
                 tv.delete(*tv.get_children())
-                for i, (nome, qtd) in enumerate(lista, start=1):
-                    tv.insert("", "end", values=(nome, qtd), tags=("odd" if i % 2 else "",))
+                for i, linha in enumerate(linhas, start=1):
+                    tv.insert("", "end", values=(linha["nome"], linha["valor"]), tags=("odd" if i % 2 else "",))
 
             def _aplicar_filtro(*_):
-                termo = termo_var.get().strip().casefold()
-                if not termo:
-                    _render(dados)
-                    return
-                filtrados = [(nome, qtd) for nome, qtd in dados if termo in str(nome).casefold()]
-                _render(filtrados)
+                _render(ranking.filtrar(termo_var.get()))
 
             def _limpar_filtro():
                 termo_var.set("")
-                _render(dados)
+                _render(ranking.linhas)
 
             ttk.Button(filtros, text="Limpar", command=_limpar_filtro).pack(side="left")
             termo_var.trace_add("write", _aplicar_filtro)
 
-            _render(dados)
-
-        artilheiros_lista = artilheiros.most_common()
-        carrascos_lista = carrascos.most_common()
+            _render(ranking.linhas)
 
         _criar_lista_filtravel(
             tables,
             "Artilheiros do Vasco",
             "Jogador",
             240,
-            artilheiros_lista,
+            carregar_ranking("vasco"),
             (0, 6),
         )
         _criar_lista_filtravel(
             tables,
             "Carrascos (Gols contra o Vasco)",
-            "Jogador (Adversário)",
+            "Jogador (Clube)",
             260,
-            carrascos_lista,
+            carregar_ranking_carrascos(),
             (6, 0),
         )
 
+    def _montar_linha_do_tempo(self, parent):
+        """Slider sobre o histórico: campanha geral, da temporada e artilharia até a data escolhida."""
+        historico = carregar_historico()
+        if not len(historico):
+            return
+        frame = ttk.Labelframe(parent, text="Linha do tempo", padding=8)
+        frame.pack(fill="x", pady=(0, 10))
+        frame.columnconfigure(0, weight=1)
+
+        controles = ttk.Frame(frame)
+        controles.grid(row=0, column=0, columnspan=2, sticky="ew")
+        controles.columnconfigure(0, weight=1)
+        posicao_var = tk.IntVar(value=len(historico))
+        escala = ttk.Scale(
+            controles,
+            from_=1,
+            to=len(historico),
+            orient="horizontal",
+            command=lambda valor: posicao_var.set(int(float(valor))),
+        )
+        escala.grid(row=0, column=0, sticky="ew")
+        escala.set(len(historico))
+        ttk.Label(controles, text="Data:").grid(row=0, column=1, padx=(10, 4))
+        data_var = tk.StringVar()
+        entry_data = ttk.Entry(controles, textvariable=data_var, width=12)
+        entry_data.grid(row=0, column=2)
+        self._forcar_cursor_visivel(entry_data)
+
+        info_var = tk.StringVar()
+        ttk.Label(frame, textvariable=info_var, justify="left").grid(row=1, column=0, sticky="nw", pady=(8, 0))
+        tv = ttk.Treeview(frame, columns=("jogador", "gols", "temporada"), show="headings", height=6)
+        for col, titulo, largura in (("jogador", "Artilheiro até a data", 220), ("gols", "Gols", 60), ("temporada", "Na temporada", 220)):
+            tv.heading(col, text=titulo)
+            tv.column(col, width=largura, anchor="w" if col != "gols" else "center")
+        tv.tag_configure("odd", background=self.colors["row_alt_bg"])
+        tv.grid(row=1, column=1, sticky="ne", pady=(8, 0), padx=(10, 0))
+
+        def _linha(resumo):
+            return (
+                f"{resumo['jogos']} jogos, {resumo['vitorias']}V {resumo['empates']}E {resumo['derrotas']}D, "
+                f"{resumo['gols_pro']}x{resumo['gols_contra']} gols, {resumo['aproveitamento']}%"
+            )
+
+        def _render(foto):
+            info_var.set(
+                f"Até {foto['data'] or '—'} (jogo {foto['jogos']} de {len(historico)})\n"
+                f"Geral: {_linha(foto['geral'])}\n"
+                f"Temporada {foto['temporada'] or '—'}: {_linha(foto['temporada_resumo'])}"
+            )
+            tv.delete(*tv.get_children())
+            geral = foto["artilheiros"]
+            temporada = foto["artilheiros_temporada"]
+            for i in range(max(len(geral), len(temporada))):
+                nome, gols = geral[i] if i < len(geral) else ("", "")
+                texto_temporada = f"{temporada[i][0]} ({temporada[i][1]})" if i < len(temporada) else ""
+                tv.insert("", "end", values=(nome, gols, texto_temporada), tags=("odd",) if i % 2 else ())
+
+        def _ao_mover(*_):
+            foto = historico.foto(historico.ordinais[posicao_var.get() - 1])
+            data_var.set(foto["data"])
+            _render(foto)
+
+        def _ir_para_data(_event=None):
+            if not _parse_data_ptbr_safe(data_var.get()):
+                return
+            posicao = max(1, historico.posicao(data_var.get()))
+            escala.set(posicao)
+            posicao_var.set(posicao)
+
+        posicao_var.trace_add("write", _ao_mover)
+        entry_data.bind("<Return>", _ir_para_data)
+        ttk.Button(controles, text="Ir", command=_ir_para_data).grid(row=0, column=3, padx=(4, 0))
+        _ao_mover()
+
+    # --------------------- Recordes ---------------------
+    def _carregar_recordes(self):
+        for widget in self.frame_recordes.winfo_children():
+            widget.destroy()
+
+        self.frame_recordes.columnconfigure(0, weight=1)
+        self.frame_recordes.rowconfigure(2, weight=1)
+
+        recordes = carregar_recordes()
+        recortes = {"Geral": None, "Competição": "competicao", "Técnico": "tecnico", "Adversário": "adversario"}
+        categorias = {rotulo: chave for chave, rotulo in CATEGORIAS_RECORDE.items()}
+
+        ttk.Label(
+            self.frame_recordes,
+            text=f"Os {recordes.limite} maiores recordes de cada categoria, no geral ou por competição, técnico e adversário.",
+        ).grid(row=0, column=0, sticky="w", pady=(0, 8))
+
+        filtros = ttk.Frame(self.frame_recordes)
+        filtros.grid(row=1, column=0, sticky="ew", pady=(0, 6))
+        ttk.Label(filtros, text="Categoria:").pack(side="left")
+        self.recordes_categoria_var = tk.StringVar(value=next(iter(categorias)))
+        ttk.Combobox(
+            filtros,
+            textvariable=self.recordes_categoria_var,
+            values=list(categorias),
+            state="readonly",
+            width=48,
+        ).pack(side="left", padx=(6, 6))
+        ttk.Label(filtros, text="Recorte:").pack(side="left", padx=(8, 0))
+        self.recordes_recorte_var = tk.StringVar(value="Geral")
+        ttk.Combobox(
+            filtros,
+            textvariable=self.recordes_recorte_var,
+            values=list(recortes),
+            state="readonly",
+            width=12,
+        ).pack(side="left", padx=(6, 6))
+        self.recordes_valor_var = tk.StringVar(value="")
+        combo_valor = ttk.Combobox(filtros, textvariable=self.recordes_valor_var, state="disabled", width=32)
+        combo_valor.pack(side="left", padx=(6, 6))
+
+        cols = ("posicao", "valor", "data", "descricao")
+        tv = ttk.Treeview(self.frame_recordes, columns=cols, show="headings", height=16)
+        for col, titulo, largura, anchor in (
+            ("posicao", "#", 50, "center"),
+            ("valor", "Valor", 80, "center"),
+            ("data", "Data", 100, "center"),
+            ("descricao", "Recorde", 520, "w"),
+        ):
+            tv.heading(col, text=titulo)
+            tv.column(col, width=largura, anchor=anchor, stretch=(col == "descricao"))
+        tv.tag_configure("odd", background=self.colors["row_alt_bg"])
+        tv.grid(row=2, column=0, sticky="nsew")
+        sy = ttk.Scrollbar(self.frame_recordes, orient="vertical", command=tv.yview)
+        sy.grid(row=2, column=1, sticky="ns")
+        tv.configure(yscrollcommand=sy.set)
+        item_to_idx = {}
+        tv._item_to_idx = item_to_idx
+        tv.bind("<Double-1>", self._on_tree_double_click)
+
+        def _ao_mudar_recorte(*_):
+            dimensao = recortes.get(self.recordes_recorte_var.get())
+            if dimensao is None:
+                combo_valor.configure(values=[], state="disabled")
+                self.recordes_valor_var.set("")
+            else:
+                valores = recordes.valores(dimensao)
+                combo_valor.configure(values=valores, state="readonly")
+                self.recordes_valor_var.set(valores[0] if valores else "")
+
+        def _render_recordes(*_):
+            tv.delete(*tv.get_children())
+            item_to_idx.clear()
+            categoria = categorias.get(self.recordes_categoria_var.get())
+            dimensao = recortes.get(self.recordes_recorte_var.get())
+            if categoria is None:
+                return
+            for i, entrada in enumerate(recordes.recordes(categoria, dimensao, self.recordes_valor_var.get()), start=1):
+                iid = tv.insert(
+                    "",
+                    "end",
+                    values=(i, entrada["valor"], entrada["data"], entrada["descricao"]),
+                    tags=("odd",) if i % 2 else (),
+                )
+                item_to_idx[iid] = entrada["idx"]
+
+        self.recordes_categoria_var.trace_add("write", _render_recordes)
+        self.recordes_recorte_var.trace_add("write", _ao_mudar_recorte)
+        self.recordes_valor_var.trace_add("write", _render_recordes)
+        _render_recordes()
+
     # --------------------- Estádios ---------------------
     def _carregar_estadios(self):
         for widget in self.frame_estadios.winfo_children():
@@ -5820,42 +5753,7 @@ class App:
             text="Resumo de todos os estádios em que o Vasco já jogou.",
         ).grid(row=0, column=0, sticky="w", pady=(0, 8))
 
-        jogos = carregar_dados_jogos()
-        agrupados = {}
-        for idx, jogo in enumerate(sorted(jogos, key=lambda j: _parse_data_ptbr_safe(str(j.get("data", ""))) or datetime.min)):
-            estadio = str(jogo.get("estadio", "")).strip() or "Não informado"
-            placar = jogo.get("placar") or {}
-            try:
-                gols_pro = int(placar.get("vasco", 0) or 0)
-                gols_contra = int(placar.get("adversario", 0) or 0)
-            except Exception:
-                gols_pro = 0
-                gols_contra = 0
-            bucket = agrupados.setdefault(
-                estadio,
-                {
-                    "estadio": estadio,
-                    "jogos": 0,
-                    "vitorias": 0,
-                    "empates": 0,
-                    "derrotas": 0,
-                    "gols_pro": 0,
-                    "gols_contra": 0,
-                    "saldo": 0,
-                    "partidas": [],
-                },
-            )
-            bucket["jogos"] += 1
-            bucket["gols_pro"] += gols_pro
-            bucket["gols_contra"] += gols_contra
-            if gols_pro > gols_contra:
-                bucket["vitorias"] += 1
-            elif gols_pro < gols_contra:
-                bucket["derrotas"] += 1
-            else:
-                bucket["empates"] += 1
-            bucket["saldo"] = bucket["gols_pro"] - bucket["gols_contra"]
-            bucket["partidas"].append((idx, jogo))
+        indice = carregar_indice_bitmap()
 
         esquerda = ttk.Labelframe(self.frame_estadios, text="Estádios", padding=8)
         esquerda.grid(row=1, column=0, sticky="nsew")
@@ -5869,6 +5767,24 @@ class App:
         entry_estadios_busca = ttk.Entry(filtros, textvariable=self.estadios_busca_var, width=24)
         entry_estadios_busca.pack(side="left", padx=(6, 6))
         self._forcar_cursor_visivel(entry_estadios_busca)
+        ttk.Label(filtros, text="Temporada:").pack(side="left", padx=(8, 0))
+        self.estadios_temporada_var = tk.StringVar(value="Todos")
+        ttk.Combobox(
+            filtros,
+            textvariable=self.estadios_temporada_var,
+            values=["Todos"] + [str(ano) for ano in sorted((a for a in indice.valores("temporada") if a), reverse=True)],
+            state="readonly",
+            width=8,
+        ).pack(side="left", padx=(6, 6))
+        ttk.Label(filtros, text="Competição:").pack(side="left", padx=(8, 0))
+        self.estadios_competicao_var = tk.StringVar(value="Todos")
+        ttk.Combobox(
+            filtros,
+            textvariable=self.estadios_competicao_var,
+            values=["Todos"] + sorted((c for c in indice.valores("competicao") if c), key=str.casefold),
+            state="readonly",
+            width=24,
+        ).pack(side="left", padx=(6, 6))
 
         cols_estadios = ("estadio", "jogos", "vitorias", "empates", "derrotas", "gols_pro", "gols_contra", "saldo")
         self.tv_estadios = ttk.Treeview(esquerda, columns=cols_estadios, show="headings", height=16)
@@ -5928,10 +5844,11 @@ class App:
         self.tv_estadios_jogos._item_to_idx = item_to_idx
         self.tv_estadios_jogos.bind("<Double-1>", self._on_tree_double_click)
 
-        estadios_rows = sorted(agrupados.values(), key=lambda item: (str(item.get("estadio", "")).casefold(),))
         iid_to_estadio = {}
+        mascara_estadios = indice.todos
 
         def _render_estadios():
+            nonlocal mascara_estadios
             termo = self.estadios_busca_var.get().strip().casefold() if hasattr(self, "estadios_busca_var") else ""
             selecionado = self.tv_estadios.selection()
             selecionado_nome = ""
@@ -5944,11 +5861,26 @@ class App:
             iid_to_estadio.clear()
             novo_sel = None
             exibidos = []
-            for item in estadios_rows:
-                estadio = str(item.get("estadio", "")).strip()
+            temporada = self.estadios_temporada_var.get()
+            competicao = self.estadios_competicao_var.get()
+            filtros_sql = {}
+            if temporada and temporada != "Todos":
+                filtros_sql["season"] = temporada
+            if competicao and competicao != "Todos":
+                filtros_sql["competition"] = competicao
+            # Números por estádio no SQLite; a lista de jogos de cada um sai do bitmap na seleção.
+            por_estadio = {}
+            for linha in db_aggregate_matches(DB_PATH, group_by=["stadium"], filters=filtros_sql):
+                estadio = str(linha.get("stadium") or "").strip() or SEM_ESTADIO
+                item = por_estadio.setdefault(estadio, dict.fromkeys(cols_estadios[1:], 0))
+                for chave in cols_estadios[1:]:
+                    item[chave] += linha[chave]
+                item["estadio"] = estadio
+            mascara_estadios = indice.mascara(temporada=temporada, competicao=competicao)
+            for estadio in sorted(por_estadio, key=str.casefold):
                 if termo and termo not in estadio.casefold():
                     continue
-                exibidos.append(item)
+                exibidos.append(por_estadio[estadio])
             for i, item in enumerate(exibidos, start=1):
                 iid = self.tv_estadios.insert(
                     "",
@@ -5992,7 +5924,9 @@ class App:
             self.tv_estadios_jogos.delete(*self.tv_estadios_jogos.get_children())
             tooltip_map.clear()
             item_to_idx.clear()
-            for i, (idx_global, jogo_raw) in enumerate(item.get("partidas", []), start=1):
+            recorte = mascara_estadios & indice.mascara(estadio=estadio)
+            partidas = [(idx, indice.jogos[idx]) for idx in indice.indices(recorte)]
+            for i, (idx_global, jogo_raw) in enumerate(partidas, start=1):
                 placar = jogo_raw.get("placar", {"vasco": 0, "adversario": 0})
                 vasco_g = int(placar.get("vasco", 0) or 0)
                 adv_g = int(placar.get("adversario", 0) or 0)
@@ -6024,8 +5958,15 @@ class App:
                 item_to_idx[iid] = idx_global
 
         self.tv_estadios.bind("<<TreeviewSelect>>", _ao_selecionar_estadio)
+        def _limpar_filtros_estadios():
+            self.estadios_busca_var.set("")
+            self.estadios_temporada_var.set("Todos")
+            self.estadios_competicao_var.set("Todos")
+
         self.estadios_busca_var.trace_add("write", lambda *_: _render_estadios())
-        ttk.Button(filtros, text="Limpar", command=lambda: self.estadios_busca_var.set("")).pack(side="left")
+        self.estadios_temporada_var.trace_add("write", lambda *_: _render_estadios())
+        self.estadios_competicao_var.trace_add("write", lambda *_: _render_estadios())
+        ttk.Button(filtros, text="Limpar", command=_limpar_filtros_estadios).pack(side="left")
         _render_estadios()
 
     # --------------------- Comparativo ---------------------
@@ -6056,9 +5997,8 @@ class App:
 
         canvas.bind_all("<MouseWheel>", _on_mousewheel)
 
-        jogos = carregar_dados_jogos()
-        temporadas = self._agrupar_por_temporada(jogos)
-        anos = sorted(temporadas.keys())
+        comparativo = carregar_comparativo()
+        anos = comparativo.chaves("temporada")
         if len(anos) < 2:
             ttk.Label(
                 scroll_frame,
@@ -6066,24 +6006,63 @@ class App:
             ).pack(anchor="w")
             return
 
-        ano_atual = anos[-1]
-        ano_anterior = anos[-2]
-        jogos_atual = temporadas.get(ano_atual, [])
-        jogos_anterior = temporadas.get(ano_anterior, [])
-        if not jogos_atual:
-            ttk.Label(
-                scroll_frame,
-                text=f"A temporada {ano_atual} ainda não possui jogos registrados."
-            ).pack(anchor="w")
-            return
-
-        jogos_equivalentes_anterior = jogos_anterior[:len(jogos_atual)]
-        stats_atual = self._resumir_jogos(jogos_atual)
-        stats_anterior = self._resumir_jogos(jogos_equivalentes_anterior)
-        series_atual = self._montar_series_evolucao(jogos_atual)
-        series_anterior = self._montar_series_evolucao(jogos_equivalentes_anterior) if jogos_equivalentes_anterior else None
+        recortes = {f"Temporada {ano}": ("temporada", ano) for ano in reversed(anos)}
+        for tecnico in comparativo.chaves("tecnico"):
+            recortes[f"Técnico: {tecnico}"] = ("tecnico", tecnico)
+        opcoes = list(recortes)
+
+        seletor = ttk.Frame(scroll_frame)
+        seletor.pack(fill="x", pady=(0, 8))
+        ttk.Label(seletor, text="Comparar:").pack(side="left")
+        atual_var = tk.StringVar(value=f"Temporada {anos[-1]}")
+        ttk.Combobox(seletor, textvariable=atual_var, values=opcoes, state="readonly", width=30).pack(side="left", padx=(6, 6))
+        ttk.Label(seletor, text="com").pack(side="left")
+        anterior_var = tk.StringVar(value=f"Temporada {anos[-2]}")
+        ttk.Combobox(seletor, textvariable=anterior_var, values=opcoes, state="readonly", width=30).pack(side="left", padx=(6, 12))
+        ttk.Label(seletor, text="Até o jogo nº:").pack(side="left")
+        jogos_var = tk.StringVar(value="")
+        spin_jogos = ttk.Spinbox(seletor, textvariable=jogos_var, from_=1, to=1, width=6)
+        spin_jogos.pack(side="left", padx=(6, 0))
+
+        corpo = ttk.Frame(scroll_frame)
+        corpo.pack(fill="both", expand=True)
+        estado = {"atual": None}
+
+        def _render(*_):
+            atual = recortes.get(atual_var.get())
+            anterior = recortes.get(anterior_var.get())
+            if not atual or not anterior:
+                return
+            total_atual = comparativo.total(*atual)
+            total_anterior = comparativo.total(*anterior)
+            if estado["atual"] != atual:
+                # Trocou o recorte principal: volta para "todos os jogos" dele.
+                estado["atual"] = atual
+                spin_jogos.configure(to=max(1, total_atual))
+                jogos_var.set(str(total_atual))
+                return
+            try:
+                quantidade = max(1, min(int(jogos_var.get()), total_atual))
+            except ValueError:
+                return
+            for widget in corpo.winfo_children():
+                widget.destroy()
+            self._render_comparativo(corpo, comparativo, atual, anterior, quantidade, total_anterior)
+
+        atual_var.trace_add("write", _render)
+        anterior_var.trace_add("write", _render)
+        jogos_var.trace_add("write", _render)
+        _render()
+
+    def _render_comparativo(self, container, comparativo, atual, anterior, quantidade, total_anterior):
+        rotulo_atual = str(atual[1])
+        rotulo_anterior = str(anterior[1])
+        stats_atual = comparativo.resumo_ate(*atual, quantidade)
+        stats_anterior = comparativo.resumo_ate(*anterior, quantidade)
+        series_atual = comparativo.series_ate(*atual, quantidade)
+        series_anterior = comparativo.series_ate(*anterior, quantidade) if total_anterior else None
 
-        nb = ttk.Notebook(scroll_frame)
+        nb = ttk.Notebook(container)
         nb.pack(fill="both", expand=True)
 
         frame_totais = ttk.Frame(nb, padding=10)
@@ -6094,12 +6073,20 @@ class App:
             stats_anterior,
             series_atual,
             series_anterior,
-            ano_atual,
-            ano_anterior,
-            len(jogos_anterior)
+            rotulo_atual,
+            rotulo_anterior,
+            total_anterior
         )
+        if atual[0] != "temporada" or anterior[0] != "temporada":
+            return
 
-        comps_por_ano = self._agrupar_competicoes_por_ano(temporadas)
+        ano_atual = atual[1]
+        ano_anterior = anterior[1]
+        # A temporada atual vale até o jogo escolhido; a anterior entra inteira e é cortada por competição.
+        comps_por_ano = {
+            ano_atual: comparativo.competicoes(ano_atual, quantidade),
+            ano_anterior: comparativo.competicoes(ano_anterior),
+        }
         comps_atual = comps_por_ano.get(ano_atual, {})
         comps_anterior = comps_por_ano.get(ano_anterior, {})
         todas_competicoes = sorted(set(list(comps_atual.keys()) + list(comps_anterior.keys())),
@@ -6121,13 +6108,14 @@ class App:
                 nome_comp,
                 comps_por_ano,
                 ano_atual,
-                ano_anterior
+                ano_anterior,
+                comparativo,
             )
 
     def _render_tab_totais(self, container, stats_atual, stats_anterior, series_atual, series_anterior, ano_atual, ano_anterior, total_jogos_anterior):
         geral_section = ttk.Labelframe(
             container,
-            text=f"Temporada {ano_atual} x {ano_anterior} (mesmo número de jogos)",
+            text=f"{ano_atual} x {ano_anterior} (mesmo número de jogos)",
             padding=10
         )
         geral_section.pack(fill="both", expand=True)
@@ -6238,7 +6226,7 @@ class App:
                 text="Matplotlib não disponível: os gráficos do comparativo geral estão desativados."
             ).pack(anchor="w", pady=(8, 0))
 
-    def _render_tab_competicao(self, container, competicao, comps_por_ano, ano_atual, ano_anterior):
+    def _render_tab_competicao(self, container, competicao, comps_por_ano, ano_atual, ano_anterior, comparativo):
         jogos_atual = list(comps_por_ano.get(ano_atual, {}).get(competicao, []))
         competicao_anterior = competicao
         comps_ano_anterior = comps_por_ano.get(ano_anterior, {})
@@ -6253,11 +6241,13 @@ class App:
             ).pack(anchor="w")
             return
 
-        jogos_equivalentes_anterior = jogos_anterior[:len(jogos_atual)]
-        stats_atual = self._resumir_jogos(jogos_atual)
-        stats_anterior = self._resumir_jogos(jogos_equivalentes_anterior)
-        series_atual = self._montar_series_evolucao(jogos_atual)
-        series_anterior = self._montar_series_evolucao(jogos_equivalentes_anterior) if jogos_equivalentes_anterior else None
+        quantidade = len(jogos_atual)
+        chave_atual = (ano_atual, competicao)
+        chave_anterior = (ano_anterior, competicao_anterior)
+        stats_atual = comparativo.resumo_ate("competicao", chave_atual, quantidade)
+        stats_anterior = comparativo.resumo_ate("competicao", chave_anterior, quantidade)
+        series_atual = comparativo.series_ate("competicao", chave_atual, quantidade)
+        series_anterior = comparativo.series_ate("competicao", chave_anterior, quantidade) if jogos_anterior else None
 
         titulo = ttk.Label(
             container,
@@ -6422,77 +6412,19 @@ class App:
     def _agrupar_por_temporada(self, jogos):
         temporadas = defaultdict(list)
         for jogo in jogos:
-            data_txt = jogo.get("data")
-            if not data_txt:
-                continue
-            try:
-                ano = _parse_data_ptbr(data_txt).year
-            except Exception:
+            ano = temporada_jogo(jogo)
+            if not ano:
                 continue
             temporadas[ano].append(jogo)
         for ano in temporadas:
-            temporadas[ano].sort(key=lambda j: _parse_data_ptbr(j["data"]))
+            temporadas[ano].sort(key=data_ordinal)
         return dict(sorted(temporadas.items()))
 
-    def _agrupar_competicoes_por_ano(self, temporadas):
-        agrupado = {}
-        for ano, jogos in temporadas.items():
-            comp_dict = defaultdict(list)
-            for jogo in jogos:
-                nome = jogo.get("competicao") or "Competição desconhecida"
-                comp_dict[nome].append(jogo)
-            for nome in comp_dict:
-                comp_dict[nome].sort(key=lambda j: _parse_data_ptbr(j["data"]))
-            agrupado[ano] = comp_dict
-        return agrupado
-
     def _resumir_jogos(self, jogos):
-        stats = {
-            "jogos": len(jogos),
-            "vitorias": 0,
-            "empates": 0,
-            "derrotas": 0,
-            "gols_pro": 0,
-            "gols_contra": 0,
-            "pontos": 0,
-            "saldo": 0,
-            "aproveitamento": 0.0,
-            "media_gols_pro": 0.0,
-            "media_gols_contra": 0.0,
-            "posicao": None,
-        }
-        for jogo in jogos:
-            placar = jogo.get("placar", {"vasco": 0, "adversario": 0})
-            vasco = placar.get("vasco", 0)
-            adv = placar.get("adversario", 0)
-            stats["gols_pro"] += vasco
-            stats["gols_contra"] += adv
-            if vasco > adv:
-                stats["vitorias"] += 1
-            elif vasco == adv:
-                stats["empates"] += 1
-            else:
-                stats["derrotas"] += 1
-        stats["pontos"] = stats["vitorias"] * 3 + stats["empates"]
-        stats["saldo"] = stats["gols_pro"] - stats["gols_contra"]
-        if stats["jogos"]:
-            stats["aproveitamento"] = round((stats["pontos"] / (stats["jogos"] * 3)) * 100, 1)
-            stats["media_gols_pro"] = round(stats["gols_pro"] / stats["jogos"], 2)
-            stats["media_gols_contra"] = round(stats["gols_contra"] / stats["jogos"], 2)
-        stats["posicao"] = self._posicao_mais_recente(jogos)
-        return stats
+        return resumir_jogos(jogos)
 
     def _posicao_mais_recente(self, jogos):
-        posicao = None
-        for jogo in jogos:
-            valor = jogo.get("posicao_tabela")
-            if valor in (None, ""):
-                continue
-            try:
-                posicao = int(valor)
-            except (ValueError, TypeError):
-                continue
-        return posicao
+        return posicao_mais_recente(jogos)
 
     def _montar_tabela_comparativo(self, parent, metricas, stats_atual, stats_anterior, cabec_atual, cabec_anterior):
         cols = ("metrica", "anterior", "atual", "diferenca")
@@ -6545,8 +6477,7 @@ class App:
             widget.destroy()
         self._limpar_tecnicos_cell_overlays()
 
-        jogos = carregar_dados_jogos()
-        self._tecnicos_jogos = list(jogos)
+        self._tecnicos_analise = carregar_analise()
 
         stats = defaultdict(_criar_stats_tecnico)
 
@@ -6555,10 +6486,15 @@ class App:
             if nome:
                 _ = stats[nome]
 
-        for jogo in jogos:
-            tecnico = _normalizar_nome_tecnico(jogo.get("tecnico"))
-            info = stats[tecnico]
-            _acumular_stats_tecnico(info, jogo)
+        for linha in db_aggregate_matches(DB_PATH, group_by=["coach"]):
+            info = stats[_normalizar_nome_tecnico(linha.get("coach"))]
+            for chave in ("jogos", "casa", "fora", "vitorias", "empates", "derrotas", "gols_pro", "gols_contra"):
+                info[chave] += linha[chave]
+
+        artilheiro_por_tecnico = {
+            _normalizar_nome_tecnico(item.get("coach")): f"{item['nome']} ({item['gols']})"
+            for item in db_load_top_scorers_by(DB_PATH, ["coach"])
+        }
 
         if not stats:
             ttk.Label(self.frame_tecnicos, text="Nenhum técnico cadastrado.").pack(anchor="w")
@@ -6649,7 +6585,7 @@ class App:
                 "gols_contra": info["gols_contra"],
                 "saldo": saldo,
                 "aproveitamento": _calcular_aproveitamento_stats(info),
-                "artilheiro": _texto_artilheiro_counter(info["artilheiros"]),
+                "artilheiro": artilheiro_por_tecnico.get(tecnico, "—"),
             })
 
         self._tecnicos_sort_col = "jogos"
@@ -6915,7 +6851,8 @@ class App:
         self._modal_tecnico_passagem_jogos = tv_jogos
         self._modal_tecnico_passagens_iid_map = {}
 
-        passagens = _gerar_passagens_tecnico(getattr(self, "_tecnicos_jogos", []), tecnico)
+        analise = getattr(self, "_tecnicos_analise", None) or carregar_analise()
+        passagens = passagens_tecnico(analise, tecnico)
         total_jogos = sum(int(item.get("jogos", 0)) for item in passagens)
         total_vitorias = sum(int(item.get("vitorias", 0)) for item in passagens)
         total_empates = sum(int(item.get("empates", 0)) for item in passagens)
@@ -7031,10 +6968,7 @@ class App:
         tv.column("artilheiro", width=280, anchor="w")
         tv.tag_configure("odd", background=self.colors["row_alt_bg"])
 
-        campanhas = []
-        for item in self.titulos_vasco:
-            campanhas.append(self._resumir_campanha_titulo(jogos, item["campeonato"], item["ano"]))
-        campanhas.sort(key=lambda x: (x["ano"], x["campeonato"].casefold()))
+        campanhas = campanhas_titulos(carregar_analise(), self.titulos_vasco)
 
         for i, info in enumerate(campanhas, start=1):
             tv.insert(
@@ -7266,70 +7200,6 @@ class App:
         self._carregar_titulos()
         messagebox.showinfo("Sucesso", "Título excluído com sucesso.")
 
-    def _resumir_campanha_titulo(self, jogos, campeonato, ano):
-        jogos_titulo = []
-        camp_cf = str(campeonato).strip().casefold()
-        for jogo in jogos:
-            data_txt = str(jogo.get("data", "")).strip()
-            dt = _parse_data_ptbr_safe(data_txt)
-            if not dt or dt.year != int(ano):
-                continue
-            comp = str(jogo.get("competicao", "")).strip().casefold()
-            if comp != camp_cf:
-                continue
-            jogos_titulo.append(jogo)
-
-        if not jogos_titulo:
-            return {
-                "campeonato": campeonato,
-                "ano": int(ano),
-                "vitorias": "Sem registro",
-                "empates": "Sem registro",
-                "derrotas": "Sem registro",
-                "artilheiro": "Sem registro",
-            }
-
-        vitorias = empates = derrotas = 0
-        artilheiros = Counter()
-
-        for jogo in jogos_titulo:
-            placar = jogo.get("placar", {"vasco": 0, "adversario": 0})
-            gols_vasco = int(placar.get("vasco", 0))
-            gols_adv = int(placar.get("adversario", 0))
-            if gols_vasco > gols_adv:
-                vitorias += 1
-            elif gols_vasco == gols_adv:
-                empates += 1
-            else:
-                derrotas += 1
-
-            for g in jogo.get("gols_vasco", []):
-                if isinstance(g, dict):
-                    nome = str(g.get("nome", "")).strip()
-                    if not nome:
-                        continue
-                    artilheiros[nome] += int(g.get("gols", 0))
-                elif isinstance(g, str):
-                    nome = g.strip()
-                    if nome:
-                        artilheiros[nome] += 1
-
-        if not artilheiros:
-            artilheiro_txt = "—"
-        else:
-            max_gols = max(artilheiros.values())
-            nomes = sorted([nome for nome, gols in artilheiros.items() if gols == max_gols], key=str.casefold)
-            artilheiro_txt = " / ".join(nomes) + f" ({max_gols})"
-
-        return {
-            "campeonato": campeonato,
-            "ano": int(ano),
-            "vitorias": vitorias,
-            "empates": empates,
-            "derrotas": derrotas,
-            "artilheiro": artilheiro_txt,
-        }
-
     # --------------------- Gráficos ---------------------
     def _carregar_graficos(self):
         for widget in self.frame_graficos.winfo_children():
@@ -7354,7 +7224,7 @@ class App:
 
         frame_geral = ttk.Frame(nb_root, padding=6)
         nb_root.add(frame_geral, text="Geral")
-        self._render_graficos_para_dataset(frame_geral, jogos, is_geral=True)
+        self._render_graficos_para_dataset(frame_geral, jogos, is_geral=True, filtros_artilheiros={})
 
         anos_ordenados = sorted(temporadas.keys())
         limite_abas = 10
@@ -7440,6 +7310,7 @@ class App:
             is_geral=False,
             prev_jogos=prev,
             prev_label=prev_label,
+            filtros_artilheiros={"season": ano},
         )
 
     def _render_graficos_barras_por_ano(self, container, temporadas):
@@ -7490,10 +7361,12 @@ class App:
 
         anos = sorted(temporadas.keys(), reverse=True)
         labels = [str(ano) for ano in anos]
+        resumo_temporadas = carregar_cubo().agrupar("temporada")
         resumo_por_ano = []
         for ano in anos:
-            jogos_ano = temporadas.get(ano, [])
-            stats = self._resumir_jogos(jogos_ano)
+            stats = resumo_temporadas.get(ano)
+            if stats is None or stats["jogos"] != len(temporadas.get(ano, [])):
+                stats = self._resumir_jogos(temporadas.get(ano, []))
             resumo_por_ano.append(stats)
 
         graficos = [
@@ -7514,7 +7387,9 @@ class App:
                 widget.bind("<Button-4>", _scroll_canvas, add="+")
                 widget.bind("<Button-5>", _scroll_canvas, add="+")
 
-    def _render_graficos_para_dataset(self, container, jogos, is_geral=False, prev_jogos=None, prev_label=None):
+    def _render_graficos_para_dataset(
+        self, container, jogos, is_geral=False, prev_jogos=None, prev_label=None, filtros_artilheiros=None
+    ):
         if not jogos:
             ttk.Label(container, text="Sem partidas registradas neste contexto.").pack(anchor="w")
             return
@@ -7524,7 +7399,13 @@ class App:
             ttk.Label(container, text="Sem dados suficientes para montar a evolução.").pack(anchor="w")
             return
 
-        artilheiros = self._contar_artilheiros(jogos)
+        artilheiros = None
+        if filtros_artilheiros == {}:
+            artilheiros = carregar_ranking("vasco")
+        elif filtros_artilheiros is not None:
+            artilheiros = RankingOrdenado(carregar_ranking_artilheiros("vasco", filtros_artilheiros)["items"])
+        if artilheiros is None:
+            artilheiros = self._contar_artilheiros(jogos)
         prev_series = None
         if prev_jogos and not is_geral:
             prev_series = self._montar_series_evolucao(prev_jogos)
@@ -7537,17 +7418,19 @@ class App:
         tab_art = ttk.Frame(nb, padding=8)
         nb.add(tab_art, text="Artilheiros")
         if artilheiros:
-            top = sorted(artilheiros.items(), key=lambda item: (-item[1], item[0].casefold()))
-            top_plot = top
+            if not isinstance(artilheiros, RankingOrdenado):
+                artilheiros = RankingOrdenado(artilheiros)
+            top_plot = artilheiros.linhas
             if is_geral:
-                page_size = max(1, int(getattr(self, "_evolucao_geral_art_page_size", 20)))
-                total = len(top)
-                total_pages = max(1, (total + page_size - 1) // page_size)
-                page_idx = int(getattr(self, "_evolucao_geral_art_page", 0))
-                page_idx = max(0, min(page_idx, total_pages - 1))
-                self._evolucao_geral_art_page = page_idx
-                ini = page_idx * page_size
-                fim = min(ini + page_size, total)
+                pagina = artilheiros.pagina(
+                    getattr(self, "_evolucao_geral_art_page", 0),
+                    getattr(self, "_evolucao_geral_art_page_size", 20),
+                )
+                total = pagina["total"]
+                total_pages = pagina["paginas"]
+                page_idx = self._evolucao_geral_art_page = pagina["pagina"]
+                ini = pagina["inicio"]
+                fim = ini + len(pagina["items"])
 
                 controles = ttk.Frame(tab_art)
                 controles.pack(fill="x", pady=(0, 8))
@@ -7565,6 +7448,7 @@ class App:
                         is_geral=True,
                         prev_jogos=prev_jogos,
                         prev_label=prev_label,
+                        filtros_artilheiros=filtros_artilheiros,
                     )
 
                 ttk.Button(
@@ -7584,10 +7468,10 @@ class App:
                     state=("normal" if page_idx < total_pages - 1 else "disabled"),
                 ).pack(side="left")
 
-                top_plot = top[ini:fim]
+                top_plot = pagina["items"]
 
-            labels = [n for n, _ in top_plot]
-            values = [q for _, q in top_plot]
+            labels = [linha["nome"] for linha in top_plot]
+            values = [linha["valor"] for linha in top_plot]
             self._plot_barras_h(tab_art, labels, values, "Artilheiros (Gols válidos)", "Gols", top_to_bottom=True)
         else:
             ttk.Label(tab_art, text="Ainda não há artilheiros registrados.").pack(anchor="w")
@@ -7622,6 +7506,11 @@ class App:
                           ["Saldo (acum.)"], "Saldo de Gols (Acum.)", "Jogo", "Saldo",
                           comparativos=[comparativo_saldo] if comparativo_saldo else None)
 
+        # Forma recente (janelas móveis)
+        tab_forma = ttk.Frame(nb, padding=8)
+        nb.add(tab_forma, text="Forma")
+        self._montar_aba_forma(tab_forma, jogos)
+
         # V/E/D acumulados
         tab_ved = ttk.Frame(nb, padding=8)
         nb.add(tab_ved, text="VED (Totais)")
@@ -7633,6 +7522,55 @@ class App:
                             colors=["green", "yellow", "red"])
 
         self._configurar_tabs_evolucao(nb)
+
+    def _montar_aba_forma(self, container, jogos):
+        metricas = {
+            "Aproveitamento (%)": "aproveitamento",
+            "Pontos": "pontos",
+            "Saldo de gols": "saldo",
+            "Gols por jogo": "gols_por_jogo",
+        }
+        recortes = {"Todos os jogos": series_forma(jogos)}
+        for dimensao, rotulo in (("tecnico", "Técnico"), ("competicao", "Competição")):
+            por_valor = series_forma_por(jogos, dimensao)
+            for chave in sorted(por_valor, key=lambda c: str(c).casefold()):
+                recortes[f"{rotulo}: {chave}"] = por_valor[chave]
+
+        controles = ttk.Frame(container)
+        controles.pack(fill="x", pady=(0, 6))
+        ttk.Label(controles, text="Recorte:").pack(side="left")
+        recorte_var = tk.StringVar(value="Todos os jogos")
+        ttk.Combobox(
+            controles, textvariable=recorte_var, values=list(recortes), state="readonly", width=36
+        ).pack(side="left", padx=(6, 12))
+        ttk.Label(controles, text="Métrica:").pack(side="left")
+        metrica_var = tk.StringVar(value="Aproveitamento (%)")
+        ttk.Combobox(
+            controles, textvariable=metrica_var, values=list(metricas), state="readonly", width=20
+        ).pack(side="left", padx=(6, 0))
+        grafico = ttk.Frame(container)
+        grafico.pack(fill="both", expand=True)
+
+        def _render(*_):
+            for widget in grafico.winfo_children():
+                widget.destroy()
+            series = recortes.get(recorte_var.get()) or recortes["Todos os jogos"]
+            chave = metricas.get(metrica_var.get(), "aproveitamento")
+            self._plot_linhas(
+                grafico,
+                series["x"],
+                [series[f"{chave}_5"], series[f"{chave}_10"]],
+                ["Últimos 5 jogos", "Últimos 10 jogos"],
+                f"Forma recente - {metrica_var.get()}",
+                "Jogo",
+                metrica_var.get(),
+                line_colors=["#2563eb", "#f97316"],
+            )
+
+        recorte_var.trace_add("write", _render)
+        metrica_var.trace_add("write", _render)
+        _render()
+
     def _criar_overlay_series(self, base_series, prev_series, keys, label_prefix, labels_desc, color_override=None):
         if not prev_series or not base_series:
             return None
@@ -7681,14 +7619,7 @@ class App:
             jogos = carregar_dados_jogos()
         c = Counter()
         nomes_exibicao = {}
-
-        def chave_nome(nome):
-            nome_limpo = re.sub(r"\s+", " ", str(nome or "").strip())
-            nome_sem_acentos = "".join(
-                ch for ch in unicodedata.normalize("NFKD", nome_limpo)
-                if not unicodedata.combining(ch)
-            )
-            return nome_sem_acentos.casefold()
+        chave_nome = _chave_nome_jogador
 
         def preferir_exibicao(atual, novo):
             if not atual:
@@ -7729,65 +7660,7 @@ class App:
     def _montar_series_evolucao(self, jogos=None):
         if jogos is None:
             jogos = carregar_dados_jogos()
-        if not jogos:
-            return {"x": []}
-
-        jogos_ordenados = sorted(jogos, key=lambda j: _parse_data_ptbr(j["data"]))
-
-        x = []
-        gols_pro_acum = []
-        gols_contra_acum = []
-        saldo_acum = []
-        vit_acum = []
-        emp_acum = []
-        der_acum = []
-        pontos_acum = []
-        posicao_rodada = []
-
-        gp = gc = s = v = e = d = p = 0
-
-        for i, jogo in enumerate(jogos_ordenados, start=1):
-            placar = jogo.get("placar", {"vasco": 0, "adversario": 0})
-            vasco = placar.get("vasco", 0)
-            adv = placar.get("adversario", 0)
-
-            gp += vasco
-            gc += adv
-            s = gp - gc
-
-            if vasco > adv:
-                v += 1
-            elif vasco == adv:
-                e += 1
-            else:
-                d += 1
-
-            p = v * 3 + e
-
-            x.append(i)
-            gols_pro_acum.append(gp)
-            gols_contra_acum.append(gc)
-            saldo_acum.append(s)
-            vit_acum.append(v)
-            emp_acum.append(e)
-            der_acum.append(d)
-            pontos_acum.append(p)
-            try:
-                posicao_rodada.append(int(jogo.get("posicao_tabela")))
-            except (TypeError, ValueError):
-                posicao_rodada.append(None)
-
-        return {
-            "x": x,
-            "gols_pro_acum": gols_pro_acum,
-            "gols_contra_acum": gols_contra_acum,
-            "saldo_acum": saldo_acum,
-            "vit_acum": vit_acum,
-            "emp_acum": emp_acum,
-            "der_acum": der_acum,
-            "pontos_acum": pontos_acum,
-            "posicao_rodada": posicao_rodada,
-        }
+        return series_evolucao(jogos)
 
     # --------- Helpers de plot ---------
     def _plot_linhas(self, container, x, series_list, labels, titulo, xlabel, ylabel, comparativos=None, line_colors=None, invert_y=False, integer_x_ticks=False):
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import re
 import shutil
 import sqlite3
-from datetime import datetime
+import sys
+import unicodedata
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Any
 
 DB_FILENAME = "stats_vasco.sqlite3"
+PLAYER_KEY_CACHE_SIZE = 16384
 DEFAULT_TECNICO = "Fernando Diniz"
 DEFAULT_TEAM_STADIUMS = {
     "Atlético-MG": "Arena MRV",
@@ -47,6 +53,15 @@ LIST_TYPES = (
     "estadios",
 )
 
+AGGREGATE_DIMENSIONS = {
+    "season": "CAST(substr(m.date_iso, 1, 4) AS INTEGER)",
+    "competition": "c.name",
+    "coach": "ch.name",
+    "stadium": "m.stadium",
+    "opponent": "t.name",
+    "location": "m.location",
+}
+
 
 def db_path_for(data_dir: str) -> str:
     os.makedirs(data_dir, exist_ok=True)
@@ -63,6 +78,37 @@ def _parse_data_iso(data_txt: str | None) -> str | None:
         return None
 
 
+def _iso_ordinal(date_iso: str | None) -> int | None:
+    """Ordinal (`date.toordinal`) da data ISO gravada; calculado uma vez por carga."""
+    if not date_iso:
+        return None
+    try:
+        return date.fromisoformat(date_iso).toordinal()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=PLAYER_KEY_CACHE_SIZE)
+def _player_key_cached(name: str) -> str:
+    nome_limpo = re.sub(r"\s+", " ", name.strip())
+    nome_sem_acentos = "".join(
+        ch for ch in unicodedata.normalize("NFKD", nome_limpo)
+        if not unicodedata.combining(ch)
+    )
+    return sys.intern(nome_sem_acentos.casefold())
+
+
+def player_key(name: str | None) -> str:
+    """Chave de agrupamento de jogador: espaços colapsados, sem acentos, casefold.
+
+    O resultado é memorizado em um cache LRU limitado e internado, então nomes
+    repetidos custam uma consulta de dicionário e chaves iguais são o mesmo objeto.
+    """
+    if not isinstance(name, str):
+        name = "" if name is None else str(name)
+    return _player_key_cached(name)
+
+
 def _open(db_path: str) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
@@ -202,6 +248,7 @@ def _create_schema(conn: sqlite3.Connection) -> None:
             coach_id INTEGER,
             table_position INTEGER,
             lineup_json TEXT NOT NULL DEFAULT '{}',
+            content_hash TEXT NOT NULL DEFAULT '',
             FOREIGN KEY (opponent_team_id) REFERENCES teams (id),
             FOREIGN KEY (competition_id) REFERENCES competitions (id),
             FOREIGN KEY (coach_id) REFERENCES coaches (id)
@@ -216,6 +263,7 @@ def _create_schema(conn: sqlite3.Connection) -> None:
             goals INTEGER NOT NULL DEFAULT 1,
             club_name TEXT,
             is_disallowed INTEGER NOT NULL DEFAULT 0,
+            player_key TEXT NOT NULL DEFAULT '',
             FOREIGN KEY (match_id) REFERENCES matches (id) ON DELETE CASCADE,
             FOREIGN KEY (player_id) REFERENCES players (id)
         );
@@ -228,6 +276,7 @@ def _create_schema(conn: sqlite3.Connection) -> None:
             is_home INTEGER,
             competition_id INTEGER,
             opponent_team_id INTEGER,
+            natural_key TEXT,
             FOREIGN KEY (competition_id) REFERENCES competitions (id),
             FOREIGN KEY (opponent_team_id) REFERENCES teams (id)
         );
@@ -241,6 +290,9 @@ def _create_schema(conn: sqlite3.Connection) -> None:
         );
 
         CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(date_iso, id);
+        CREATE INDEX IF NOT EXISTS idx_matches_competition ON matches(competition_id, date_iso);
+        CREATE INDEX IF NOT EXISTS idx_matches_coach ON matches(coach_id, date_iso);
+        CREATE INDEX IF NOT EXISTS idx_matches_opponent ON matches(opponent_team_id, date_iso);
         CREATE INDEX IF NOT EXISTS idx_goals_match ON match_goals(match_id);
         CREATE INDEX IF NOT EXISTS idx_future_date ON future_matches(date_iso, id);
         CREATE INDEX IF NOT EXISTS idx_titles_year ON vasco_titles(year, id);
@@ -257,6 +309,28 @@ def _create_schema(conn: sqlite3.Connection) -> None:
         conn.execute("ALTER TABLE matches ADD COLUMN match_time TEXT NOT NULL DEFAULT ''")
     if "captain_name" not in match_cols:
         conn.execute("ALTER TABLE matches ADD COLUMN captain_name TEXT NOT NULL DEFAULT ''")
+    if "content_hash" not in match_cols:
+        conn.execute("ALTER TABLE matches ADD COLUMN content_hash TEXT NOT NULL DEFAULT ''")
+
+    goal_cols = {row["name"] for row in conn.execute("PRAGMA table_info(match_goals)").fetchall()}
+    if "player_key" not in goal_cols:
+        conn.execute("ALTER TABLE match_goals ADD COLUMN player_key TEXT NOT NULL DEFAULT ''")
+        names = conn.execute("SELECT DISTINCT player_name FROM match_goals").fetchall()
+        conn.executemany(
+            "UPDATE match_goals SET player_key = ? WHERE player_name = ?",
+            [(player_key(row["player_name"]), row["player_name"]) for row in names],
+        )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_goals_player_key ON match_goals(side, is_disallowed, player_key)"
+    )
+
+    future_cols = {row["name"] for row in conn.execute("PRAGMA table_info(future_matches)").fetchall()}
+    if "natural_key" not in future_cols:
+        conn.execute("ALTER TABLE future_matches ADD COLUMN natural_key TEXT")
+        _backfill_future_natural_keys(conn)
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_future_natural_key ON future_matches(natural_key)"
+    )
 
     historic_cols = {row["name"] for row in conn.execute("PRAGMA table_info(historic_players)").fetchall()}
     if "registered_date_text" not in historic_cols:
@@ -480,120 +554,238 @@ def load_listas(db_path: str) -> dict[str, Any]:
     return out
 
 
-def save_matches(db_path: str, jogos: list[dict[str, Any]]) -> None:
+_LINEUP_ENCODER = json.JSONEncoder(ensure_ascii=False)
+_MATCH_HASH_FIELDS = (
+    "date_text",
+    "adversario",
+    "competicao",
+    "tecnico",
+    "location",
+    "stadium",
+    "match_time",
+    "vasco_goals",
+    "opponent_goals",
+    "observation",
+    "captain_name",
+    "table_position",
+    "lineup_json",
+    "goals",
+)
+
+
+def _match_payload(jogo: dict[str, Any]) -> dict[str, Any]:
+    adversario = str(jogo.get("adversario", "")).strip()
+    placar = jogo.get("placar") if isinstance(jogo.get("placar"), dict) else {}
+    try:
+        vasco_goals = int(placar.get("vasco", 0))
+    except Exception:
+        vasco_goals = 0
+    try:
+        adv_goals = int(placar.get("adversario", 0))
+    except Exception:
+        adv_goals = 0
+
+    lineup = jogo.get("escalacao_partida")
+    if not isinstance(lineup, dict):
+        lineup = jogo.get("escalacao") if isinstance(jogo.get("escalacao"), dict) else {}
+
+    goals: list[list[Any]] = []
+    anulados = jogo.get("gols_anulados") if isinstance(jogo.get("gols_anulados"), dict) else {}
+    for side, items, is_disallowed in (
+        ("vasco", jogo.get("gols_vasco"), 0),
+        ("adversario", jogo.get("gols_adversario"), 0),
+        ("vasco", anulados.get("vasco"), 1),
+        ("adversario", anulados.get("adversario"), 1),
+    ):
+        for item in items if isinstance(items, list) else []:
+            name, qtd, club = _parse_goal_item(item)
+            if not name:
+                continue
+            if side == "adversario":
+                club = club or adversario or None
+            goals.append([side, name, qtd, club, is_disallowed])
+
+    return {
+        "date_text": str(jogo.get("data", "")).strip(),
+        "adversario": adversario,
+        "competicao": str(jogo.get("competicao", "")).strip(),
+        "tecnico": str(jogo.get("tecnico", "")).strip(),
+        "location": str(jogo.get("local", "")).strip() or "casa",
+        "stadium": str(jogo.get("estadio", "")).strip(),
+        "match_time": str(jogo.get("horario", "")).strip(),
+        "vasco_goals": max(0, vasco_goals),
+        "opponent_goals": max(0, adv_goals),
+        "observation": str(jogo.get("observacao", "")).strip(),
+        "captain_name": str(jogo.get("capitao", "")).strip(),
+        "table_position": jogo.get("posicao_tabela") if isinstance(jogo.get("posicao_tabela"), int) else None,
+        "lineup_json": _LINEUP_ENCODER.encode(lineup),
+        "goals": goals,
+    }
+
+
+def _match_content_hash(payload: dict[str, Any]) -> str:
+    raw = repr(tuple(payload[key] for key in _MATCH_HASH_FIELDS))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _write_match(
+    conn: sqlite3.Connection,
+    payload: dict[str, Any],
+    content_hash: str,
+    match_id: int | None = None,
+) -> int:
+    adversario = payload["adversario"]
+    op_team_id = _ensure_team(conn, adversario, "adversario")
+    if payload["location"] == "fora" and payload["stadium"] and op_team_id is not None:
+        _ensure_team_stadium(conn, op_team_id, payload["stadium"], is_primary=False)
+    values = (
+        payload["date_text"],
+        _parse_data_iso(payload["date_text"]),
+        op_team_id,
+        _ensure_competition(conn, payload["competicao"]),
+        payload["location"],
+        payload["stadium"],
+        payload["match_time"],
+        payload["vasco_goals"],
+        payload["opponent_goals"],
+        payload["observation"],
+        payload["captain_name"],
+        _ensure_coach(conn, payload["tecnico"]),
+        payload["table_position"],
+        payload["lineup_json"],
+        content_hash,
+    )
+    if match_id is None:
+        cursor = conn.execute(
+            """
+            INSERT INTO matches(
+                date_text, date_iso, opponent_team_id, competition_id, location,
+                stadium, match_time, vasco_goals, opponent_goals, observation,
+                captain_name, coach_id, table_position, lineup_json, content_hash
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            values,
+        )
+        match_id = int(cursor.lastrowid)
+    else:
+        conn.execute(
+            """
+            UPDATE matches SET
+                date_text = ?, date_iso = ?, opponent_team_id = ?, competition_id = ?, location = ?,
+                stadium = ?, match_time = ?, vasco_goals = ?, opponent_goals = ?, observation = ?,
+                captain_name = ?, coach_id = ?, table_position = ?, lineup_json = ?, content_hash = ?
+            WHERE id = ?
+            """,
+            (*values, match_id),
+        )
+        conn.execute("DELETE FROM match_goals WHERE match_id = ?", (match_id,))
+
+    for side, name, goals, club, is_disallowed in payload["goals"]:
+        conn.execute(
+            """
+            INSERT INTO match_goals(
+                match_id, side, player_id, player_name, goals, club_name, is_disallowed, player_key
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (match_id, side, _ensure_player(conn, name), name, goals, club, is_disallowed, player_key(name)),
+        )
+    return match_id
+
+
+def save_matches(db_path: str, jogos: list[dict[str, Any]]) -> int:
+    """Persiste a lista completa de jogos gravando apenas o que mudou.
+
+    Cada linha guarda o hash do payload normalizado; jogos com `db_match_id`
+    e hash iguais não são tocados, os alterados são atualizados no lugar, os
+    ausentes são removidos e os novos inseridos. Se a ordem da lista não puder
+    ser preservada pelos ids (ordem de `load_matches`), a tabela é regravada.
+
+    Retorna a versão dos jogos (`load_matches_version`) lida na mesma
+    transação, já incrementada se algo mudou.
+    """
     if not isinstance(jogos, list):
         jogos = []
+    itens: list[tuple[int | None, dict[str, Any], str]] = []
+    for jogo in jogos:
+        if not isinstance(jogo, dict):
+            continue
+        payload = _match_payload(jogo)
+        db_id = jogo.get("db_match_id")
+        itens.append((db_id if isinstance(db_id, int) else None, payload, _match_content_hash(payload)))
+
     with _open(db_path) as conn:
         _create_schema(conn)
-        conn.execute("DELETE FROM match_goals")
-        conn.execute("DELETE FROM matches")
+        existentes = {
+            int(row["id"]): row["content_hash"]
+            for row in conn.execute("SELECT id, content_hash FROM matches").fetchall()
+        }
 
-        for jogo in jogos:
-            if not isinstance(jogo, dict):
+        planejados: list[tuple[int | None, dict[str, Any], str]] = []
+        usados: set[int] = set()
+        ultimo_id = 0
+        novo_antes = False
+        ordem_ok = True
+        for db_id, payload, content_hash in itens:
+            if db_id is not None and db_id in existentes and db_id not in usados:
+                if novo_antes or db_id <= ultimo_id:
+                    ordem_ok = False
+                    break
+                usados.add(db_id)
+                ultimo_id = db_id
+                planejados.append((db_id, payload, content_hash))
+            else:
+                novo_antes = True
+                planejados.append((None, payload, content_hash))
+
+        if not ordem_ok:
+            conn.execute("DELETE FROM match_goals")
+            conn.execute("DELETE FROM matches")
+            planejados = [(None, payload, content_hash) for _, payload, content_hash in itens]
+            usados = set()
+            existentes = {}
+
+        removidos = [(mid,) for mid in existentes if mid not in usados]
+        if removidos:
+            conn.executemany("DELETE FROM match_goals WHERE match_id = ?", removidos)
+            conn.executemany("DELETE FROM matches WHERE id = ?", removidos)
+
+        alterou = bool(removidos) or not ordem_ok
+        for db_id, payload, content_hash in planejados:
+            if db_id is not None and existentes.get(db_id) == content_hash:
                 continue
-            adversario = str(jogo.get("adversario", "")).strip()
-            competicao = str(jogo.get("competicao", "")).strip()
-            tecnico = str(jogo.get("tecnico", "")).strip()
-            estadio = str(jogo.get("estadio", "")).strip()
-            local = str(jogo.get("local", "")).strip() or "casa"
-            placar = jogo.get("placar") if isinstance(jogo.get("placar"), dict) else {}
-            try:
-                vasco_goals = int(placar.get("vasco", 0))
-            except Exception:
-                vasco_goals = 0
-            try:
-                adv_goals = int(placar.get("adversario", 0))
-            except Exception:
-                adv_goals = 0
-
-            op_team_id = _ensure_team(conn, adversario, "adversario")
-            if local == "fora" and estadio and op_team_id is not None:
-                _ensure_team_stadium(conn, op_team_id, estadio, is_primary=False)
-            comp_id = _ensure_competition(conn, competicao)
-            coach_id = _ensure_coach(conn, tecnico)
+            _write_match(conn, payload, content_hash, db_id)
+            alterou = True
+        if alterou:
+            conn.execute(
+                "INSERT INTO metadata(key, value) VALUES('matches_version', '1') "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+            )
+        return _matches_version(conn)
 
-            lineup = jogo.get("escalacao_partida")
-            if not isinstance(lineup, dict):
-                lineup = jogo.get("escalacao") if isinstance(jogo.get("escalacao"), dict) else {}
 
-            cursor = conn.execute(
-                """
-                INSERT INTO matches(
-                    date_text, date_iso, opponent_team_id, competition_id, location,
-                    stadium, match_time, vasco_goals, opponent_goals, observation,
-                    captain_name, coach_id, table_position, lineup_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    str(jogo.get("data", "")).strip(),
-                    _parse_data_iso(jogo.get("data")),
-                    op_team_id,
-                    comp_id,
-                    local,
-                    estadio,
-                    str(jogo.get("horario", "")).strip(),
-                    max(0, vasco_goals),
-                    max(0, adv_goals),
-                    str(jogo.get("observacao", "")).strip(),
-                    str(jogo.get("capitao", "")).strip(),
-                    coach_id,
-                    jogo.get("posicao_tabela") if isinstance(jogo.get("posicao_tabela"), int) else None,
-                    json.dumps(lineup, ensure_ascii=False),
-                ),
-            )
-            match_id = int(cursor.lastrowid)
+def _matches_version(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT value FROM metadata WHERE key = 'matches_version'").fetchone()
+    try:
+        return int(row["value"]) if row else 0
+    except (TypeError, ValueError):
+        return 0
 
-            for item in jogo.get("gols_vasco", []) if isinstance(jogo.get("gols_vasco"), list) else []:
-                name, goals, club = _parse_goal_item(item)
-                if not name:
-                    continue
-                player_id = _ensure_player(conn, name)
-                conn.execute(
-                    """
-                    INSERT INTO match_goals(match_id, side, player_id, player_name, goals, club_name, is_disallowed)
-                    VALUES (?, 'vasco', ?, ?, ?, ?, 0)
-                    """,
-                    (match_id, player_id, name, goals, club),
-                )
 
-            for item in jogo.get("gols_adversario", []) if isinstance(jogo.get("gols_adversario"), list) else []:
-                name, goals, club = _parse_goal_item(item)
-                if not name:
-                    continue
-                player_id = _ensure_player(conn, name)
-                conn.execute(
-                    """
-                    INSERT INTO match_goals(match_id, side, player_id, player_name, goals, club_name, is_disallowed)
-                    VALUES (?, 'adversario', ?, ?, ?, ?, 0)
-                    """,
-                    (match_id, player_id, name, goals, club or adversario or None),
-                )
+def load_matches_version(db_path: str) -> int:
+    """Contador incrementado por `save_matches` sempre que a tabela de jogos muda.
 
-            anulados = jogo.get("gols_anulados") if isinstance(jogo.get("gols_anulados"), dict) else {}
-            for item in anulados.get("vasco", []) if isinstance(anulados.get("vasco"), list) else []:
-                name, goals, club = _parse_goal_item(item)
-                if not name:
-                    continue
-                player_id = _ensure_player(conn, name)
-                conn.execute(
-                    """
-                    INSERT INTO match_goals(match_id, side, player_id, player_name, goals, club_name, is_disallowed)
-                    VALUES (?, 'vasco', ?, ?, ?, ?, 1)
-                    """,
-                    (match_id, player_id, name, goals, club),
-                )
-            for item in anulados.get("adversario", []) if isinstance(anulados.get("adversario"), list) else []:
-                name, goals, club = _parse_goal_item(item)
-                if not name:
-                    continue
-                player_id = _ensure_player(conn, name)
-                conn.execute(
-                    """
-                    INSERT INTO match_goals(match_id, side, player_id, player_name, goals, club_name, is_disallowed)
-                    VALUES (?, 'adversario', ?, ?, ?, ?, 1)
-                    """,
-                    (match_id, player_id, name, goals, club or adversario or None),
-                )
+    Serve para invalidar índices em memória mesmo quando outro processo grava.
+    É lido a cada acesso aos índices, então não passa por `_create_schema`
+    (o esquema já foi criado por `bootstrap_database`); um banco sem a tabela
+    de metadados conta como versão 0.
+    """
+    conn = _open(db_path)
+    try:
+        return _matches_version(conn)
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
 
 
 def load_matches(db_path: str) -> list[dict[str, Any]]:
@@ -601,7 +793,7 @@ def load_matches(db_path: str) -> list[dict[str, Any]]:
         _create_schema(conn)
         rows = conn.execute(
             """
-            SELECT m.id, m.date_text, t.name AS adversario, c.name AS competicao,
+            SELECT m.id, m.date_text, m.date_iso, t.name AS adversario, c.name AS competicao,
                    m.location, m.stadium, m.match_time, m.vasco_goals, m.opponent_goals, m.observation,
                    m.captain_name,
                    ch.name AS tecnico, m.coach_id, m.table_position, m.lineup_json
@@ -654,9 +846,12 @@ def load_matches(db_path: str) -> list[dict[str, Any]]:
         except Exception:
             lineup = {}
 
+        data_ordinal = _iso_ordinal(row["date_iso"])
         jogos.append(
             {
                 "data": row["date_text"] or "",
+                "data_ordinal": data_ordinal,
+                "temporada": date.fromordinal(data_ordinal).year if data_ordinal else None,
                 "adversario": row["adversario"] or "",
                 "competicao": row["competicao"] or "",
                 "local": row["location"] or "",
@@ -684,49 +879,366 @@ def load_matches(db_path: str) -> list[dict[str, Any]]:
     return jogos
 
 
-def save_future_matches(db_path: str, jogos: list[dict[str, Any]]) -> None:
-    if not isinstance(jogos, list):
-        jogos = []
+def _aggregate_where(filters: dict[str, Any] | None) -> tuple[str, list[Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    for key, value in (filters or {}).items():
+        if value is None:
+            continue
+        if key == "date_from":
+            clauses.append("m.date_iso >= ?")
+            params.append(str(value))
+            continue
+        if key == "date_to":
+            clauses.append("m.date_iso <= ?")
+            params.append(str(value))
+            continue
+        expr = AGGREGATE_DIMENSIONS.get(key)
+        if expr is None:
+            raise ValueError(f"Filtro de agregação desconhecido: {key}")
+        values = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        if key == "season":
+            try:
+                values = [int(v) for v in values]
+            except (TypeError, ValueError):
+                values = []
+        else:
+            values = [str(v).strip() for v in values]
+        if not values:
+            clauses.append("0")
+            continue
+        clauses.append(f"{expr} IN ({', '.join('?' for _ in values)})")
+        params.extend(values)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def aggregate_matches(
+    db_path: str,
+    group_by: list[str] | tuple[str, ...] | None = None,
+    filters: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Agrega jogos direto no SQLite (GROUP BY), sem carregar a lista completa.
+
+    `group_by` aceita as chaves de AGGREGATE_DIMENSIONS; `filters` aceita as
+    mesmas chaves (valor único ou lista) além de `date_from`/`date_to` em ISO.
+    Sem `group_by`, retorna uma única linha com o total do recorte.
+    """
+    dims = list(group_by or [])
+    for dim in dims:
+        if dim not in AGGREGATE_DIMENSIONS:
+            raise ValueError(f"Dimensão de agregação desconhecida: {dim}")
+    select_dims = "".join(f"{AGGREGATE_DIMENSIONS[dim]} AS {dim}, " for dim in dims)
+    group_sql = ""
+    if dims:
+        cols = ", ".join(AGGREGATE_DIMENSIONS[dim] for dim in dims)
+        group_sql = f" GROUP BY {cols} ORDER BY {cols}"
+    where_sql, params = _aggregate_where(filters)
+
     with _open(db_path) as conn:
         _create_schema(conn)
-        conn.execute("DELETE FROM future_matches")
-        for jogo in jogos:
-            if not isinstance(jogo, dict):
-                continue
-            match_text = str(jogo.get("jogo", "")).strip()
-            date_text = str(jogo.get("data", "")).strip()
-            is_home_raw = jogo.get("em_casa")
-            is_home = None if is_home_raw is None else (1 if bool(is_home_raw) else 0)
-            competicao = str(jogo.get("campeonato", "")).strip()
-
-            adversario = ""
-            if " x " in match_text:
-                p1, p2 = match_text.split(" x ", 1)
-                if "vasco" in p1.casefold():
-                    adversario = p2.strip()
-                elif "vasco" in p2.casefold():
-                    adversario = p1.strip()
+        rows = conn.execute(
+            f"""
+            SELECT {select_dims}
+                   COUNT(*) AS jogos,
+                   COALESCE(SUM(m.vasco_goals > m.opponent_goals), 0) AS vitorias,
+                   COALESCE(SUM(m.vasco_goals = m.opponent_goals), 0) AS empates,
+                   COALESCE(SUM(m.vasco_goals < m.opponent_goals), 0) AS derrotas,
+                   COALESCE(SUM(m.vasco_goals), 0) AS gols_pro,
+                   COALESCE(SUM(m.opponent_goals), 0) AS gols_contra,
+                   COALESCE(SUM(m.location = 'fora'), 0) AS fora
+            FROM matches m
+            LEFT JOIN teams t ON t.id = m.opponent_team_id
+            LEFT JOIN competitions c ON c.id = m.competition_id
+            LEFT JOIN coaches ch ON ch.id = m.coach_id
+            {where_sql}{group_sql}
+            """,
+            params,
+        ).fetchall()
+
+    out: list[dict[str, Any]] = []
+    for row in rows:
+        item: dict[str, Any] = {dim: row[dim] for dim in dims}
+        jogos = int(row["jogos"] or 0)
+        vitorias = int(row["vitorias"] or 0)
+        empates = int(row["empates"] or 0)
+        gols_pro = int(row["gols_pro"] or 0)
+        gols_contra = int(row["gols_contra"] or 0)
+        item.update(
+            {
+                "jogos": jogos,
+                "casa": jogos - int(row["fora"] or 0),
+                "fora": int(row["fora"] or 0),
+                "vitorias": vitorias,
+                "empates": empates,
+                "derrotas": int(row["derrotas"] or 0),
+                "gols_pro": gols_pro,
+                "gols_contra": gols_contra,
+                "saldo": gols_pro - gols_contra,
+                "pontos": vitorias * 3 + empates,
+            }
+        )
+        out.append(item)
+    return out
+
+
+def _scorer_ranking_sql(
+    side: str,
+    group_by: list[str],
+    filters: dict[str, Any] | None,
+) -> tuple[str, list[Any]]:
+    for dim in group_by:
+        if dim not in AGGREGATE_DIMENSIONS:
+            raise ValueError(f"Dimensão de agregação desconhecida: {dim}")
+    where_sql, params = _aggregate_where(filters)
+    where_sql = (where_sql + " AND" if where_sql else " WHERE") + (
+        " g.side = ? AND g.is_disallowed = 0 AND g.goals > 0 AND g.player_key <> ''"
+    )
+    params.append(side)
+    dims_base = "".join(f"{AGGREGATE_DIMENSIONS[dim]} AS {dim}, " for dim in group_by)
+    dims = "".join(f"{dim}, " for dim in group_by)
+    join_dims = "".join(f"n.{dim} IS tot.{dim} AND " for dim in group_by)
+    sql = f"""
+        WITH base AS (
+            SELECT {dims_base}g.player_key AS chave, g.player_name AS nome, g.goals AS gols, g.match_id AS match_id
+            FROM match_goals g
+            JOIN matches m ON m.id = g.match_id
+            LEFT JOIN teams t ON t.id = m.opponent_team_id
+            LEFT JOIN competitions c ON c.id = m.competition_id
+            LEFT JOIN coaches ch ON ch.id = m.coach_id
+            {where_sql}
+        ),
+        tot AS (
+            SELECT {dims}chave, SUM(gols) AS gols, COUNT(DISTINCT match_id) AS jogos
+            FROM base
+            GROUP BY {dims}chave
+        ),
+        n AS (
+            SELECT {dims}chave, nome,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY {dims}chave
+                       ORDER BY length(CAST(nome AS BLOB)) > length(nome) DESC, length(nome) DESC, nome
+                   ) AS rn
+            FROM (SELECT DISTINCT {dims}chave, nome FROM base)
+        )
+        SELECT {", ".join(f"tot.{dim}" for dim in group_by) + ", " if group_by else ""}tot.chave, n.nome, tot.gols, tot.jogos
+        FROM tot
+        JOIN n ON {join_dims}n.chave = tot.chave AND n.rn = 1
+    """
+    return sql, params
+
+
+def load_scorer_leaderboard(
+    db_path: str,
+    side: str = "vasco",
+    filters: dict[str, Any] | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> dict[str, Any]:
+    """Ranking de goleadores agrupado pela chave sem acentos (`player_key`).
+
+    `side` é 'vasco' ou 'adversario'; gols anulados não entram. `filters`
+    segue `aggregate_matches`. Retorna {"total", "items"} com a página pedida;
+    sem `limit` o ranking vem inteiro e `offset` é ignorado.
+    """
+    ranking_sql, params = _scorer_ranking_sql(side, [], filters)
+    page_sql = ""
+    page_params: list[Any] = []
+    if limit is not None:
+        page_sql = " LIMIT ? OFFSET ?"
+        page_params = [max(0, int(limit)), max(0, int(offset))]
+    with _open(db_path) as conn:
+        _create_schema(conn)
+        rows = conn.execute(
+            f"""
+            SELECT r.*, COUNT(*) OVER () AS total
+            FROM ({ranking_sql}) r
+            ORDER BY r.gols DESC, r.chave{page_sql}
+            """,
+            [*params, *page_params],
+        ).fetchall()
+        total = int(rows[0]["total"]) if rows else 0
+        if not rows and page_params and page_params[1]:
+            total = int(conn.execute(f"SELECT COUNT(*) FROM ({ranking_sql})", params).fetchone()[0])
+    return {
+        "total": total,
+        "items": [
+            {"nome": row["nome"], "chave": row["chave"], "gols": int(row["gols"]), "jogos": int(row["jogos"])}
+            for row in rows
+        ],
+    }
+
 
+def load_top_scorers_by(
+    db_path: str,
+    group_by: list[str] | tuple[str, ...],
+    side: str = "vasco",
+    filters: dict[str, Any] | None = None,
+    top: int = 1,
+) -> list[dict[str, Any]]:
+    """Os `top` maiores goleadores de cada grupo (ex.: por técnico ou temporada)."""
+    dims = list(group_by)
+    ranking_sql, params = _scorer_ranking_sql(side, dims, filters)
+    partition = ", ".join(dims) if dims else "NULL"
+    order_dims = "".join(f"{dim}, " for dim in dims)
+    with _open(db_path) as conn:
+        _create_schema(conn)
+        rows = conn.execute(
+            f"""
+            SELECT * FROM (
+                SELECT r.*, ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY r.gols DESC, r.chave) AS posicao
+                FROM ({ranking_sql}) r
+            )
+            WHERE posicao <= ?
+            ORDER BY {order_dims}posicao
+            """,
+            [*params, max(1, int(top))],
+        ).fetchall()
+    out: list[dict[str, Any]] = []
+    for row in rows:
+        item: dict[str, Any] = {dim: row[dim] for dim in dims}
+        item.update(
+            {
+                "nome": row["nome"],
+                "chave": row["chave"],
+                "gols": int(row["gols"]),
+                "jogos": int(row["jogos"]),
+                "posicao": int(row["posicao"]),
+            }
+        )
+        out.append(item)
+    return out
+
+
+def _future_opponent(match_text: str) -> str:
+    if " x " not in match_text:
+        return ""
+    p1, p2 = match_text.split(" x ", 1)
+    if "vasco" in p1.casefold():
+        return p2.strip()
+    if "vasco" in p2.casefold():
+        return p1.strip()
+    return ""
+
+
+def _future_natural_key(
+    date_text: str,
+    match_text: str,
+    is_home: int | None,
+    competition: str,
+) -> str:
+    """Chave natural (data, adversário, mando, competição) de um jogo futuro."""
+    adversario = _future_opponent(match_text) or match_text
+    return "|".join(
+        (
+            _parse_data_iso(date_text) or date_text.strip(),
+            " ".join(adversario.split()).casefold(),
+            "" if is_home is None else str(is_home),
+            " ".join(competition.split()).casefold(),
+        )
+    )
+
+
+def _backfill_future_natural_keys(conn: sqlite3.Connection) -> None:
+    rows = conn.execute(
+        """
+        SELECT f.id, f.date_text, f.match_text, f.is_home, c.name AS campeonato
+        FROM future_matches f
+        LEFT JOIN competitions c ON c.id = f.competition_id
+        ORDER BY f.id
+        """
+    ).fetchall()
+    seen: set[str] = set()
+    for row in rows:
+        key = _future_natural_key(
+            str(row["date_text"] or ""),
+            str(row["match_text"] or ""),
+            row["is_home"],
+            str(row["campeonato"] or ""),
+        )
+        if key in seen:
+            conn.execute("DELETE FROM future_matches WHERE id = ?", (row["id"],))
+            continue
+        seen.add(key)
+        conn.execute("UPDATE future_matches SET natural_key = ? WHERE id = ?", (key, row["id"]))
+
+
+def _future_match_rows(conn: sqlite3.Connection, jogos: list[dict[str, Any]]) -> list[tuple[Any, ...]]:
+    team_ids: dict[str, int | None] = {}
+    comp_ids: dict[str, int | None] = {}
+    rows: list[tuple[Any, ...]] = []
+    for jogo in jogos:
+        if not isinstance(jogo, dict):
+            continue
+        match_text = str(jogo.get("jogo", "")).strip()
+        date_text = str(jogo.get("data", "")).strip()
+        is_home_raw = jogo.get("em_casa")
+        is_home = None if is_home_raw is None else (1 if bool(is_home_raw) else 0)
+        competicao = str(jogo.get("campeonato", "")).strip()
+
+        adversario = _future_opponent(match_text)
+        if adversario not in team_ids:
             op_team_id = _ensure_team(conn, adversario, "adversario") if adversario else None
             if op_team_id is not None:
                 estadio_padrao = DEFAULT_TEAM_STADIUMS.get(adversario)
                 if estadio_padrao:
                     _ensure_team_stadium(conn, op_team_id, estadio_padrao, is_primary=True)
-            comp_id = _ensure_competition(conn, competicao)
-            conn.execute(
-                """
-                INSERT INTO future_matches(date_text, date_iso, match_text, is_home, competition_id, opponent_team_id)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    date_text,
-                    _parse_data_iso(date_text),
-                    match_text,
-                    is_home,
-                    comp_id,
-                    op_team_id,
-                ),
+            team_ids[adversario] = op_team_id
+        if competicao not in comp_ids:
+            comp_ids[competicao] = _ensure_competition(conn, competicao)
+        rows.append(
+            (
+                date_text,
+                _parse_data_iso(date_text),
+                match_text,
+                is_home,
+                comp_ids[competicao],
+                team_ids[adversario],
+                _future_natural_key(date_text, match_text, is_home, competicao),
             )
+        )
+    return rows
+
+
+_INSERT_FUTURE_MATCH_SQL = """
+    INSERT INTO future_matches(
+        date_text, date_iso, match_text, is_home, competition_id, opponent_team_id, natural_key
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(natural_key) DO NOTHING
+"""
+
+
+def save_future_matches(db_path: str, jogos: list[dict[str, Any]]) -> int:
+    """Regrava a lista de jogos futuros inteira.
+
+    A chave natural é única na tabela, então um jogo repetido na lista fica só
+    na primeira ocorrência. Retorna quantos foram descartados por isso.
+    """
+    if not isinstance(jogos, list):
+        jogos = []
+    with _open(db_path) as conn:
+        _create_schema(conn)
+        conn.execute("DELETE FROM future_matches")
+        rows = _future_match_rows(conn, jogos)
+        antes = conn.total_changes
+        conn.executemany(_INSERT_FUTURE_MATCH_SQL, rows)
+        gravados = conn.total_changes - antes
+    return len(rows) - gravados
+
+
+def upsert_future_matches(db_path: str, jogos: list[dict[str, Any]]) -> tuple[int, int]:
+    """Insere jogos futuros em lote, ignorando os que já existem pela chave natural.
+
+    Retorna (adicionados, duplicados).
+    """
+    if not isinstance(jogos, list):
+        jogos = []
+    with _open(db_path) as conn:
+        _create_schema(conn)
+        rows = _future_match_rows(conn, jogos)
+        antes = conn.total_changes
+        conn.executemany(_INSERT_FUTURE_MATCH_SQL, rows)
+        adicionados = conn.total_changes - antes
+    return adicionados, len(rows) - adicionados
 
 
 def load_future_matches(db_path: str) -> list[dict[str, Any]]:
@@ -734,7 +1246,7 @@ def load_future_matches(db_path: str) -> list[dict[str, Any]]:
         _create_schema(conn)
         rows = conn.execute(
             """
-            SELECT f.date_text, f.match_text, f.is_home, c.name AS campeonato
+            SELECT f.date_text, f.date_iso, f.match_text, f.is_home, c.name AS campeonato
             FROM future_matches f
             LEFT JOIN competitions c ON c.id = f.competition_id
             ORDER BY f.id
@@ -745,6 +1257,7 @@ def load_future_matches(db_path: str) -> list[dict[str, Any]]:
         {
             "jogo": row["match_text"] or "",
             "data": row["date_text"] or "",
+            "data_ordinal": _iso_ordinal(row["date_iso"]),
             "em_casa": None if row["is_home"] is None else bool(row["is_home"]),
             "campeonato": row["campeonato"] or "",
         }
@@ -0,0 +1,45 @@
+"""Jogos aleatórios no formato de `load_matches`, para os testes de equivalência."""
+
+import random
+from datetime import date, timedelta
+
+ADVERSARIOS = ["Flamengo", "Fluminense", "Botafogo", "Palmeiras", "Grêmio", "Bahia"]
+COMPETICOES = ["Campeonato Carioca", "Brasileirão Série A", "Copa do Brasil"]
+TECNICOS = ["Fernando Diniz", "Ramón Díaz", "", "Rafael Paiva"]
+ESTADIOS = ["São Januário", "Maracanã", "", "Nilton Santos"]
+JOGADORES = ["Vegetti", "Philippe Coutinho", "Payet", "Rayan", "David", "Puma Rodríguez"]
+
+
+def gerar_gols(gerador: random.Random, quantidade: int, nomes) -> list[dict]:
+    gols = []
+    while quantidade > 0:
+        qtd = gerador.randint(1, quantidade)
+        gols.append({"nome": gerador.choice(nomes), "gols": qtd})
+        quantidade -= qtd
+    return gols
+
+
+def gerar_jogo(gerador: random.Random, dia: date) -> dict:
+    vasco = gerador.choice([0, 0, 1, 1, 2, 3, 4])
+    adversario = gerador.choice([0, 0, 1, 1, 2, 3])
+    return {
+        "data": dia.strftime("%d/%m/%Y"),
+        "adversario": gerador.choice(ADVERSARIOS),
+        "competicao": gerador.choice(COMPETICOES),
+        "local": gerador.choice(["casa", "fora", "neutro"]),
+        "estadio": gerador.choice(ESTADIOS),
+        "tecnico": gerador.choice(TECNICOS),
+        "placar": {"vasco": vasco, "adversario": adversario},
+        "gols_vasco": gerar_gols(gerador, vasco, JOGADORES),
+        "gols_adversario": gerar_gols(gerador, adversario, ["Arrascaeta", "Cano", "Tiquinho"]),
+    }
+
+
+def gerar_jogos(quantidade: int, semente: int) -> list[dict]:
+    """`quantidade` jogos fora de ordem cronológica, às vezes dois no mesmo dia."""
+    gerador = random.Random(semente)
+    inicio = date(2019, 1, 15)
+    dias = sorted(inicio + timedelta(days=gerador.randrange(0, 5 * 365)) for _ in range(quantidade))
+    jogos = [gerar_jogo(gerador, dia) for dia in dias]
+    gerador.shuffle(jogos)
+    return jogos
@@ -0,0 +1,55 @@
+import random
+import unittest
+
+from analytics import ArvoreSequencias, MotorSequencias, ordenar_jogos_por_data, placar_jogo
+from jogos_sinteticos import gerar_jogos
+
+
+def _maior_corrida(valores, lo, hi):
+    """(tamanho, início) da maior corrida de True em valores[lo:hi]; empate fica com a mais antiga."""
+    melhor, inicio_melhor = 0, None
+    for inicio in range(lo, hi):
+        fim = inicio
+        while fim < hi and valores[fim]:
+            fim += 1
+        if fim - inicio > melhor:
+            melhor, inicio_melhor = fim - inicio, inicio
+    return melhor, inicio_melhor
+
+
+class ArvoreSequenciasTest(unittest.TestCase):
+    def test_consultas_e_atualizacoes_batem_com_a_varredura(self):
+        gerador = random.Random(35)
+        for tamanho in (0, 1, 2, 7, 8, 33, 100):
+            valores = [gerador.random() < 0.6 for _ in range(tamanho)]
+            arvore = ArvoreSequencias(valores)
+            for _ in range(200):
+                if tamanho and gerador.random() < 0.3:
+                    posicao = gerador.randrange(tamanho)
+                    valores[posicao] = not valores[posicao]
+                    arvore.atualizar(posicao, valores[posicao])
+                lo = gerador.randint(0, tamanho)
+                hi = gerador.randint(lo, tamanho)
+                self.assertEqual(arvore.consultar(lo, hi), _maior_corrida(valores, lo, hi), (tamanho, lo, hi))
+            self.assertEqual(arvore.consultar(), _maior_corrida(valores, 0, tamanho))
+
+    def test_maior_sequencia_por_periodo(self):
+        jogos = gerar_jogos(150, 35)
+        motor = MotorSequencias(jogos)
+        ordenados = ordenar_jogos_por_data(jogos)
+        invicto = [gols_pro >= gols_contra for gols_pro, gols_contra in map(placar_jogo, ordenados)]
+        for ano in range(2019, 2024):
+            dentro = [posicao for posicao, jogo in enumerate(ordenados) if jogo["data"].endswith(str(ano))]
+            if not dentro:
+                continue
+            lo, hi = dentro[0], dentro[-1] + 1
+            tamanho, inicio = _maior_corrida(invicto, lo, hi)
+            resultado = motor.maior_sequencia("invicto", f"01/01/{ano}", f"31/12/{ano}")
+            self.assertEqual(resultado["tamanho"], tamanho)
+            if tamanho:
+                self.assertIs(jogos[resultado["inicio"]], ordenados[inicio])
+                self.assertIs(jogos[resultado["fim"]], ordenados[inicio + tamanho - 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
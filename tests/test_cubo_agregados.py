@@ -0,0 +1,110 @@
+import random
+import unittest
+from datetime import date
+
+from analytics import DIMENSOES_BITMAP, CacheIndices, CuboAgregados, resumir_jogos
+from jogos_sinteticos import gerar_jogo, gerar_jogos
+
+
+def _resumo_varredura(jogos, **filtros):
+    escolhidos = [
+        jogo for jogo in jogos
+        if all(
+            str(DIMENSOES_BITMAP[dimensao](jogo)).strip().casefold() == str(valor).strip().casefold()
+            for dimensao, valor in filtros.items()
+        )
+    ]
+    resumo = resumir_jogos(escolhidos)
+    resumo.pop("posicao")
+    return resumo
+
+
+class CuboAgregadosTest(unittest.TestCase):
+    def setUp(self):
+        self.gerador = random.Random(44)
+
+    def _editar(self, jogos):
+        """Aplica uma inclusão, exclusão ou edição aleatória e devolve o delta `(antigo, novo)`."""
+        sorteio = self.gerador.random()
+        if sorteio < 0.3 or not jogos:
+            novo = gerar_jogo(self.gerador, date(2019 + self.gerador.randrange(5), 6, 1))
+            jogos.append(novo)
+            return None, novo
+        posicao = self.gerador.randrange(len(jogos))
+        if sorteio < 0.6:
+            return jogos.pop(posicao), None
+        novo = gerar_jogo(self.gerador, date(2019 + self.gerador.randrange(5), 6, 1))
+        antigo, jogos[posicao] = jogos[posicao], novo
+        return antigo, novo
+
+    def test_substituir_equivale_a_reconstruir(self):
+        jogos = gerar_jogos(200, 44)
+        cubo = CuboAgregados(jogos)
+        for _ in range(400):
+            cubo.substituir(*self._editar(jogos))
+        reconstruido = CuboAgregados(jogos)
+        self.assertEqual(cubo.resumo(), reconstruido.resumo())
+        for dimensao in ("temporada", "competicao", "tecnico", "local", "estadio"):
+            self.assertEqual(cubo.agrupar(dimensao), reconstruido.agrupar(dimensao), dimensao)
+        self.assertEqual(
+            cubo.agrupar(("temporada", "competicao"), local="casa"),
+            reconstruido.agrupar(("temporada", "competicao"), local="casa"),
+        )
+        self.assertEqual(len(cubo), len(reconstruido))
+
+    def test_fatias_batem_com_a_varredura(self):
+        jogos = gerar_jogos(200, 45)
+        cubo = CuboAgregados(jogos)
+        for _ in range(100):
+            cubo.substituir(*self._editar(jogos))
+        for temporada in range(2019, 2024):
+            for competicao in ("Copa do Brasil", "campeonato carioca"):
+                self.assertEqual(
+                    cubo.resumo(temporada=temporada, competicao=competicao),
+                    _resumo_varredura(jogos, temporada=temporada, competicao=competicao),
+                )
+        for estadio, resumo in cubo.agrupar("estadio", local="fora").items():
+            self.assertEqual(resumo, _resumo_varredura(jogos, estadio=estadio, local="fora"))
+
+
+class CacheIndicesTest(unittest.TestCase):
+    def setUp(self):
+        self.jogos = gerar_jogos(80, 46)
+        self.versao = 1
+        self.cargas = 0
+
+        def carregar():
+            self.cargas += 1
+            return list(self.jogos)
+
+        self.cache = CacheIndices(carregar, lambda: self.versao)
+
+    def test_delta_da_propria_gravacao_mantem_o_cubo_atualizado(self):
+        cubo = self.cache.indice("cubo", CuboAgregados)
+        antigo, novo = self.jogos[5], gerar_jogo(random.Random(1), date(2022, 3, 3))
+        self.jogos[5] = novo
+        self.versao += 1
+        self.cache.registrar_gravacao(self.versao, (antigo, novo))
+        self.assertIs(self.cache.indice("cubo", CuboAgregados), cubo)
+        self.assertEqual(cubo.agrupar("temporada"), CuboAgregados(self.jogos).agrupar("temporada"))
+
+    def test_gravacao_externa_descarta_os_indices(self):
+        cubo = self.cache.indice("cubo", CuboAgregados)
+        self.jogos.pop()
+        self.versao += 2
+        self.cache.registrar_gravacao(self.versao, (self.jogos[0], self.jogos[0]))
+        self.assertIsNot(self.cache.indice("cubo", CuboAgregados), cubo)
+        self.assertEqual(self.cache.indice("cubo", CuboAgregados).resumo(), CuboAgregados(self.jogos).resumo())
+
+    def test_uma_carga_por_versao(self):
+        with self.cache.mesma_versao():
+            self.cache.indice("cubo", CuboAgregados)
+            self.versao += 1
+            self.cache.indice("total", len)
+        self.assertEqual(self.cargas, 1)
+        self.cache.indice("cubo", CuboAgregados)
+        self.assertEqual(self.cargas, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
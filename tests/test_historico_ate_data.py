@@ -0,0 +1,70 @@
+import random
+import unittest
+from collections import Counter
+from datetime import date
+
+from analytics import HistoricoAteData, contar_goleadores, data_ordinal, ordenar_jogos_por_data, resumir_jogos
+from jogos_sinteticos import gerar_jogos
+
+
+def _resumo(jogos):
+    resumo = resumir_jogos(jogos)
+    resumo.pop("posicao")
+    return resumo
+
+
+def _foto_varredura(jogos, limite_ordinal):
+    disputados = [jogo for jogo in ordenar_jogos_por_data(jogos) if data_ordinal(jogo) <= limite_ordinal]
+    ultimo = disputados[-1] if disputados else None
+    ano = date.fromordinal(data_ordinal(ultimo)).year if ultimo else None
+    da_temporada = [jogo for jogo in disputados if date.fromordinal(data_ordinal(jogo)).year == ano]
+    ids_temporada = {id(jogo) for jogo in da_temporada}
+    artilheiros = Counter()
+    artilheiros_temporada = Counter()
+    for jogo in disputados:
+        goleadores = contar_goleadores(jogo.get("gols_vasco", []))
+        artilheiros.update(goleadores)
+        if id(jogo) in ids_temporada:
+            artilheiros_temporada.update(goleadores)
+    return {
+        "jogos": len(disputados),
+        "ultimo_jogo": ultimo,
+        "geral": _resumo(disputados),
+        "temporada_resumo": _resumo(da_temporada),
+        "artilheiros": dict(artilheiros),
+        "artilheiros_temporada": dict(artilheiros_temporada),
+    }
+
+
+class HistoricoAteDataTest(unittest.TestCase):
+    def test_foto_bate_com_a_varredura_em_qualquer_intervalo(self):
+        gerador = random.Random(46)
+        jogos = gerar_jogos(250, 46)
+        inicio, fim = date(2018, 12, 1).toordinal(), date(2024, 3, 1).toordinal()
+        datas = [date.fromordinal(gerador.randint(inicio, fim)) for _ in range(60)]
+        datas += [date.fromordinal(data_ordinal(jogo)) for jogo in gerador.sample(jogos, 20)]
+        esperados = {dia: _foto_varredura(jogos, dia.toordinal()) for dia in datas}
+        for intervalo in (1, 7, 50, 1000):
+            historico = HistoricoAteData(jogos, intervalo=intervalo)
+            for dia, esperado in esperados.items():
+                foto = historico.foto(dia.strftime("%d/%m/%Y"), limite=None)
+                obtido = {
+                    "jogos": foto["jogos"],
+                    "ultimo_jogo": foto["ultimo_jogo"],
+                    "geral": foto["geral"],
+                    "temporada_resumo": foto["temporada_resumo"],
+                    "artilheiros": dict(foto["artilheiros"]),
+                    "artilheiros_temporada": dict(foto["artilheiros_temporada"]),
+                }
+                self.assertEqual(obtido, esperado, (intervalo, dia))
+
+    def test_sem_data_e_o_historico_todo(self):
+        jogos = gerar_jogos(40, 47)
+        foto = HistoricoAteData(jogos).foto(limite=3)
+        self.assertEqual(foto["jogos"], len(jogos))
+        self.assertEqual(foto["geral"], _resumo(jogos))
+        self.assertEqual(len(foto["artilheiros"]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from analytics import DIMENSOES_BITMAP, IndiceBitmap, chave_cronologica, resumir_jogos
+from jogos_sinteticos import gerar_jogos
+
+
+def _filtrar(jogos, filtros):
+    """Índices dos jogos que passam em todos os filtros, em ordem cronológica."""
+    escolhidos = []
+    for idx, jogo in enumerate(jogos):
+        if all(
+            str(DIMENSOES_BITMAP[dimensao](jogo)).strip().casefold()
+            in {str(valor).strip().casefold() for valor in valores}
+            for dimensao, valores in filtros.items()
+        ):
+            escolhidos.append(idx)
+    return sorted(escolhidos, key=lambda idx: chave_cronologica(jogos[idx]))
+
+
+class IndiceBitmapTest(unittest.TestCase):
+    def setUp(self):
+        self.gerador = random.Random(39)
+        self.jogos = gerar_jogos(300, 39)
+        self.indice = IndiceBitmap(self.jogos)
+
+    def _filtros_aleatorios(self):
+        filtros = {}
+        for dimensao in self.gerador.sample(sorted(DIMENSOES_BITMAP), self.gerador.randint(0, 3)):
+            existentes = sorted({DIMENSOES_BITMAP[dimensao](jogo) for jogo in self.jogos}, key=str)
+            escolhidos = self.gerador.sample(existentes, min(len(existentes), self.gerador.randint(1, 2)))
+            filtros[dimensao] = [str(valor).upper() for valor in escolhidos]
+        return filtros
+
+    def test_filtros_combinados_batem_com_a_varredura(self):
+        for _ in range(300):
+            filtros = self._filtros_aleatorios()
+            mascara = self.indice.mascara(**filtros)
+            esperados = _filtrar(self.jogos, filtros)
+            self.assertEqual(self.indice.indices(mascara), esperados, filtros)
+            self.assertEqual(self.indice.contar(mascara), len(esperados))
+            varredura = resumir_jogos([self.jogos[idx] for idx in esperados])
+            varredura.pop("posicao")
+            self.assertEqual(self.indice.resumo(mascara), varredura)
+
+    def test_busca_de_texto_e_mascara_de_indices(self):
+        for termo in ("fla", "COPA", "diaz", "é", "inexistente"):
+            esperados = {
+                idx for idx, jogo in enumerate(self.jogos)
+                if any(
+                    termo.casefold() in str(DIMENSOES_BITMAP[dimensao](jogo)).casefold()
+                    for dimensao in ("adversario", "competicao", "tecnico")
+                )
+            }
+            self.assertEqual(set(self.indice.indices(self.indice.buscar_texto(termo))), esperados, termo)
+        for _ in range(50):
+            subconjunto = set(self.gerador.sample(range(len(self.jogos)), self.gerador.randint(0, 40)))
+            self.assertEqual(set(self.indice.indices(self.indice.mascara_de(subconjunto))), subconjunto)
+
+    def test_linhas_por_dimensao(self):
+        for linha in self.indice.linhas_por("estadio", self.indice.mascara(local="fora")):
+            esperados = _filtrar(self.jogos, {"estadio": [linha["estadio"]], "local": ["fora"]})
+            self.assertEqual([idx for idx, _jogo in linha["partidas"]], esperados)
+            self.assertEqual(linha["jogos"], len(esperados))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+import storage_sqlite
+from jogos_sinteticos import gerar_jogo, gerar_jogos
+
+
+_LEGADO_FUTUROS = """
+    CREATE TABLE competitions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE future_matches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date_text TEXT NOT NULL,
+        date_iso TEXT,
+        match_text TEXT NOT NULL,
+        is_home INTEGER,
+        competition_id INTEGER,
+        opponent_team_id INTEGER
+    );
+"""
+
+
+def _chave_ingenua(data_txt, jogo_txt, em_casa, competicao):
+    """Mesma identidade de jogo futuro, escrita sem reaproveitar o módulo."""
+    dia, mes, ano = (data_txt.strip().split("/") + ["", "", ""])[:3]
+    if dia.isdigit() and mes.isdigit() and ano.isdigit():
+        data = f"{int(ano):04d}-{int(mes):02d}-{int(dia):02d}"
+    else:
+        data = data_txt.strip()
+    adversario = jogo_txt
+    if " x " in jogo_txt:
+        esquerda, direita = jogo_txt.split(" x ", 1)
+        if "vasco" in esquerda.lower():
+            adversario = direita
+        elif "vasco" in direita.lower():
+            adversario = esquerda
+    return (data, " ".join(adversario.split()).lower(), em_casa, " ".join(competicao.split()).lower())
+
+
+class BackfillChaveNaturalTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._tmp.name, "vasco.sqlite3")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_migracao_mantem_primeira_ocorrencia_de_cada_jogo(self):
+        gerador = random.Random(27)
+        competicoes = ["Brasileirão Série A", "brasileirão  série a", "Copa do Brasil"]
+        jogos = ["Vasco x Flamengo", "Flamengo x Vasco", "Vasco x  flamengo", "Vasco x Botafogo", "amistoso"]
+        datas = ["01/05/2026", "1/5/2026", "02/05/2026", "data a definir"]
+        linhas = []
+        for _ in range(120):
+            linhas.append((
+                gerador.choice(datas),
+                gerador.choice(jogos),
+                gerador.choice([None, 0, 1]),
+                gerador.randrange(len(competicoes)) + 1,
+            ))
+
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_LEGADO_FUTUROS)
+        conn.executemany("INSERT INTO competitions(name) VALUES (?)", [(nome,) for nome in competicoes])
+        conn.executemany(
+            "INSERT INTO future_matches(date_text, match_text, is_home, competition_id) VALUES (?, ?, ?, ?)",
+            linhas,
+        )
+        conn.commit()
+        conn.close()
+
+        vistos = []
+        esperados = []
+        for data_txt, jogo_txt, em_casa, competicao_id in linhas:
+            chave = _chave_ingenua(data_txt, jogo_txt, em_casa, competicoes[competicao_id - 1])
+            if chave not in vistos:
+                vistos.append(chave)
+                esperados.append((data_txt, jogo_txt, em_casa, competicoes[competicao_id - 1]))
+
+        carregados = storage_sqlite.load_future_matches(self.db_path)
+        obtidos = [
+            (item["data"], item["jogo"], None if item["em_casa"] is None else int(item["em_casa"]), item["campeonato"])
+            for item in carregados
+        ]
+        self.assertEqual(obtidos, esperados)
+
+        conn = sqlite3.connect(self.db_path)
+        chaves = [row[0] for row in conn.execute("SELECT natural_key FROM future_matches")]
+        conn.close()
+        self.assertNotIn(None, chaves)
+        self.assertEqual(len(chaves), len(set(chaves)))
+
+
+def _conteudo(jogos):
+    """Jogos carregados sem os ids do banco, que dependem do histórico de gravações."""
+    return [
+        {campo: valor for campo, valor in jogo.items() if campo not in ("db_match_id", "db_tecnico_id")}
+        for jogo in jogos
+    ]
+
+
+class SaveMatchesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._tmp.name, "vasco.sqlite3")
+        self.gerador = random.Random(28)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _regravado_do_zero(self, jogos):
+        caminho = os.path.join(self._tmp.name, f"zero-{len(os.listdir(self._tmp.name))}.sqlite3")
+        storage_sqlite.save_matches(caminho, [
+            {campo: valor for campo, valor in jogo.items() if campo != "db_match_id"} for jogo in jogos
+        ])
+        return storage_sqlite.load_matches(caminho)
+
+    def _editar(self, jogos, inserir_no_meio=False):
+        editados = []
+        intactos = {}
+        for jogo in jogos:
+            sorteio = self.gerador.random()
+            if sorteio < 0.15:
+                continue
+            if sorteio < 0.35:
+                novo = gerar_jogo(self.gerador, datetime.strptime(jogo["data"], "%d/%m/%Y").date())
+                novo["db_match_id"] = jogo["db_match_id"]
+                editados.append(novo)
+                continue
+            intactos[jogo["db_match_id"]] = jogo
+            editados.append(jogo)
+        novos = gerar_jogos(8, self.gerador.randrange(1000))
+        if inserir_no_meio:
+            editados[len(editados) // 2:len(editados) // 2] = novos
+        else:
+            editados.extend(novos)
+        return editados, intactos
+
+    def test_gravacao_incremental_equivale_a_regravar_tudo(self):
+        versao = storage_sqlite.save_matches(self.db_path, gerar_jogos(60, 1))
+        self.assertEqual(versao, storage_sqlite.load_matches_version(self.db_path))
+        for _ in range(5):
+            editados, intactos = self._editar(storage_sqlite.load_matches(self.db_path))
+            nova_versao = storage_sqlite.save_matches(self.db_path, editados)
+            self.assertEqual(nova_versao, versao + 1)
+            self.assertEqual(nova_versao, storage_sqlite.load_matches_version(self.db_path))
+            versao = nova_versao
+
+            carregados = storage_sqlite.load_matches(self.db_path)
+            self.assertEqual(_conteudo(carregados), _conteudo(self._regravado_do_zero(editados)))
+            por_id = {jogo["db_match_id"]: jogo for jogo in carregados}
+            for db_id, jogo in intactos.items():
+                self.assertEqual(por_id[db_id], jogo)
+
+    def test_insercao_no_meio_regrava_na_ordem_da_lista(self):
+        storage_sqlite.save_matches(self.db_path, gerar_jogos(40, 2))
+        editados, _ = self._editar(storage_sqlite.load_matches(self.db_path), inserir_no_meio=True)
+        storage_sqlite.save_matches(self.db_path, editados)
+        carregados = storage_sqlite.load_matches(self.db_path)
+        self.assertEqual(_conteudo(carregados), _conteudo(self._regravado_do_zero(editados)))
+
+    def test_lista_igual_nao_muda_a_versao(self):
+        versao = storage_sqlite.save_matches(self.db_path, gerar_jogos(30, 3))
+        carregados = storage_sqlite.load_matches(self.db_path)
+        self.assertEqual(storage_sqlite.save_matches(self.db_path, carregados), versao)
+        self.assertEqual(storage_sqlite.load_matches(self.db_path), carregados)
+
+
+if __name__ == "__main__":
+    unittest.main()
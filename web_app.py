@@ -14,15 +14,34 @@ from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import parse_qs, urlparse
 from storage_sqlite import (
+    aggregate_matches as db_aggregate_matches,
     bootstrap_database,
     db_path_for,
     load_current_squad as db_load_current_squad,
     load_future_matches as db_load_future_matches,
     load_listas as db_load_listas,
     load_matches as db_load_matches,
+    load_matches_version as db_load_matches_version,
+    load_scorer_leaderboard as db_load_scorer_leaderboard,
     save_listas as db_save_listas,
     save_matches as db_save_matches,
 )
+from analytics import (
+    DIMENSOES_BITMAP,
+    DIMENSOES_CUBO,
+    CacheIndices,
+    CuboAgregados,
+    IndiceCarrascos,
+    IndiceBitmap,
+    MatrizParcerias,
+    RankingOrdenado,
+    data_ordinal,
+    formatar_goleadores,
+    indexar_adversarios,
+    listar_adversarios,
+    ranking_goleadores,
+    retrospecto,
+)
 
 PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
 ARQUIVO_JOGOS = os.path.join(PROJECT_ROOT, "jogos_vasco.json")
@@ -74,8 +93,36 @@ def salvar_listas(dados: dict):
     db_save_listas(DB_PATH, dados)
 
 
-def salvar_lista_jogos(dados: list):
-    db_save_matches(DB_PATH, dados)
+def salvar_lista_jogos(dados: list, delta=None):
+    """Grava os jogos; `delta=(antigo, novo)` descreve a única alteração feita na lista."""
+    _indices.registrar_gravacao(db_save_matches(DB_PATH, dados), delta)
+
+
+_indices = CacheIndices(carregar_jogos, lambda: db_load_matches_version(DB_PATH))
+
+
+def carregar_indice_adversarios() -> dict:
+    return _indices.indice("adversarios", indexar_adversarios)
+
+
+def carregar_indice_bitmap() -> IndiceBitmap:
+    return _indices.indice("bitmap", IndiceBitmap)
+
+
+def carregar_parcerias() -> MatrizParcerias:
+    return _indices.indice("parcerias", MatrizParcerias)
+
+
+def carregar_cubo() -> CuboAgregados:
+    return _indices.indice("cubo", CuboAgregados)
+
+
+def carregar_carrascos() -> IndiceCarrascos:
+    return _indices.indice("carrascos", IndiceCarrascos)
+
+
+def carregar_ranking(lado: str = "vasco") -> RankingOrdenado:
+    return _indices.indice(f"ranking_{lado}", lambda jogos: ranking_goleadores(jogos, lado))
 
 
 def _normalizar_posicao_elenco(posicao: str) -> str:
@@ -382,13 +429,16 @@ def _salvar_ou_atualizar_partida_web(payload: dict, edit_idx: int | None = None)
     jogos = carregar_jogos()
     if edit_idx is None:
         jogos.append(jogo)
+        delta = (None, jogo)
         msg_ok = "Partida registrada com sucesso!"
     else:
         if not (0 <= edit_idx < len(jogos)):
             return False, "Não foi possível localizar o jogo para edição.", None
+        jogo["db_match_id"] = jogos[edit_idx].get("db_match_id")
+        delta = (jogos[edit_idx], jogo)
         jogos[edit_idx] = jogo
         msg_ok = "Partida atualizada com sucesso!"
-    salvar_lista_jogos(jogos)
+    salvar_lista_jogos(jogos, delta=delta)
     return True, msg_ok, jogo
 
 
@@ -400,13 +450,6 @@ def editar_partida_web(idx: int, payload: dict):
     return _salvar_ou_atualizar_partida_web(payload, edit_idx=idx)
 
 
-def _parse_data_br(valor: str):
-    try:
-        return datetime.strptime((valor or "").strip(), "%d/%m/%Y")
-    except Exception:
-        return None
-
-
 def _resultado_jogo(jogo: dict) -> str:
     placar = jogo.get("placar") or {}
     v = placar.get("vasco")
@@ -420,70 +463,201 @@ def _resultado_jogo(jogo: dict) -> str:
     return "E"
 
 
-def resumo_geral(jogos: list[dict]) -> dict:
-    total = 0
-    vitorias = empates = derrotas = 0
-    gols_pro = gols_contra = 0
+def resumo_geral() -> dict:
+    total = db_aggregate_matches(DB_PATH)[0]
     por_comp = Counter()
-
-    for jogo in jogos:
-        placar = jogo.get("placar") or {}
-        gp = placar.get("vasco")
-        gc = placar.get("adversario")
-        if not isinstance(gp, int) or not isinstance(gc, int):
-            continue
-        total += 1
-        gols_pro += gp
-        gols_contra += gc
-        if gp > gc:
-            vitorias += 1
-        elif gp < gc:
-            derrotas += 1
-        else:
-            empates += 1
-        comp = (jogo.get("competicao") or "Sem competição").strip()
-        por_comp[comp] += 1
+    for linha in db_aggregate_matches(DB_PATH, group_by=["competition"]):
+        por_comp[str(linha["competition"] or "").strip() or "Sem competição"] += linha["jogos"]
 
     return {
-        "total_jogos": total,
-        "vitorias": vitorias,
-        "empates": empates,
-        "derrotas": derrotas,
-        "gols_pro": gols_pro,
-        "gols_contra": gols_contra,
-        "saldo": gols_pro - gols_contra,
+        "total_jogos": total["jogos"],
+        "vitorias": total["vitorias"],
+        "empates": total["empates"],
+        "derrotas": total["derrotas"],
+        "gols_pro": total["gols_pro"],
+        "gols_contra": total["gols_contra"],
+        "saldo": total["saldo"],
         "competicoes_top": por_comp.most_common(10),
     }
 
 
-def serializar_jogos(jogos: list[dict], limite: int | None = None, busca: str = "") -> list[dict]:
-    busca_cf = busca.strip().casefold()
-    itens = []
-    for idx, jogo in enumerate(jogos):
-        adversario = str(jogo.get("adversario") or "")
-        competicao = str(jogo.get("competicao") or "")
-        tecnico = str(jogo.get("tecnico") or "")
-        if busca_cf and busca_cf not in " | ".join([adversario, competicao, tecnico]).casefold():
+FILTROS_ARTILHEIROS = {
+    "temporada": "season",
+    "competicao": "competition",
+    "tecnico": "coach",
+    "adversario": "opponent",
+}
+
+
+def ranking_artilheiros(qs: dict) -> dict:
+    """Página do ranking de goleadores; `busca` filtra por prefixo do nome ou de uma palavra dele.
+
+    Sem filtros, a página sai do ranking já ordenado da versão atual dos jogos;
+    com filtros, o SQLite agrega só o recorte pedido.
+    """
+    lado = (qs.get("lado") or ["vasco"])[0]
+    if lado not in ("vasco", "adversario"):
+        lado = "vasco"
+    filtros = {}
+    for param, dimensao in FILTROS_ARTILHEIROS.items():
+        valor = (qs.get(param) or [""])[0].strip()
+        if not valor:
             continue
+        if dimensao == "season":
+            try:
+                valor = int(valor)
+            except ValueError:
+                continue
+        filtros[dimensao] = valor
+    try:
+        limit = int((qs.get("limit") or ["50"])[0])
+    except ValueError:
+        limit = 50
+    try:
+        offset = int((qs.get("offset") or ["0"])[0])
+    except ValueError:
+        offset = 0
+    limit = max(1, min(limit, 500))
+    offset = max(0, offset)
+    busca = (qs.get("busca") or [""])[0].strip()
+    if filtros and not busca:
+        ranking = db_load_scorer_leaderboard(DB_PATH, side=lado, filters=filtros, limit=limit, offset=offset)
+    else:
+        ordenado = (
+            RankingOrdenado(db_load_scorer_leaderboard(DB_PATH, side=lado, filters=filtros)["items"])
+            if filtros
+            else carregar_ranking(lado)
+        )
+        linhas = ordenado.buscar(busca) if busca else ordenado.linhas
+        ranking = {
+            "total": len(linhas),
+            "items": [
+                {"nome": linha["nome"], "chave": linha["chave"], "gols": linha["gols"], "jogos": linha["jogos"]}
+                for linha in linhas[offset:offset + limit]
+            ],
+        }
+    ranking.update({"lado": lado, "limit": limit, "offset": offset})
+    return ranking
+
+
+def consultar_cubo(qs: dict) -> dict:
+    """Fatia do cubo pelos filtros da query string, com roll-up opcional em `agrupar`.
+
+    Ex.: `?tecnico=Fernando Diniz&local=casa&competicao=Brasileirão Série A&temporada_inicio=2023`
+    ou `?agrupar=temporada,local`. Dimensões repetidas na query viram OR.
+    """
+    cubo = carregar_cubo()
+    filtros = {dim: qs[dim] for dim in DIMENSOES_CUBO if qs.get(dim)}
+    for limite in ("temporada_inicio", "temporada_fim"):
+        valor = (qs.get(limite) or [""])[0].strip()
+        if valor:
+            try:
+                filtros[limite] = int(valor)
+            except ValueError:
+                pass
+    agrupar = [dim.strip() for dim in (qs.get("agrupar") or [""])[0].split(",") if dim.strip()]
+    invalidas = [dim for dim in agrupar if dim not in DIMENSOES_CUBO]
+    if invalidas:
+        raise ValueError(f"Dimensão de agrupamento desconhecida: {', '.join(invalidas)}")
+    resposta = {"filtros": filtros, "resumo": cubo.resumo(**filtros)}
+    if agrupar:
+        grupos = cubo.agrupar(tuple(agrupar), **filtros)
+        resposta["agrupar"] = agrupar
+        resposta["grupos"] = sorted(
+            (dict(zip(agrupar, chave), **linha) for chave, linha in grupos.items()),
+            key=lambda item: tuple(str(item[dim]) for dim in agrupar),
+        )
+    return resposta
+
+
+def listar_carrascos(qs: dict) -> dict:
+    """Quem mais marcou contra o Vasco, filtrando por `clube`, `temporada` e `competicao`.
+
+    `por_clube=1` separa cada jogador por clube; `agrupar=clube` devolve o top
+    `limit` de cada clube.
+    """
+    try:
+        limit = max(1, min(int((qs.get("limit") or ["50"])[0]), 500))
+    except ValueError:
+        limit = 50
+    filtros = {}
+    for dimensao in ("clube", "temporada", "competicao"):
+        valor = (qs.get(dimensao) or [""])[0].strip()
+        if valor:
+            filtros[dimensao] = valor
+    indice = carregar_carrascos()
+    if (qs.get("agrupar") or [""])[0].strip() == "clube":
+        filtros.pop("clube", None)
+        por_clube = indice.top_por_clube(limit, **filtros)
+        return {"filtros": filtros, "total": len(por_clube), "clubes": [
+            {"clube": clube, "items": items} for clube, items in por_clube.items()
+        ]}
+    por_clube = (qs.get("por_clube") or [""])[0].strip() in ("1", "true", "sim")
+    items = indice.ranking(limit, por_clube=por_clube, **filtros)
+    return {"filtros": filtros, "por_clube": por_clube, "total": len(items), "items": items}
+
+
+def filtrar_jogos(indice: IndiceBitmap, busca: str = "", filtros: dict | None = None) -> int:
+    """Máscara dos jogos que passam na busca livre e nos filtros por dimensão."""
+    mascara = indice.mascara(**(filtros or {}))
+    if busca.strip():
+        mascara &= indice.buscar_texto(busca)
+    return mascara
+
+
+def listar_parcerias(qs: dict) -> dict:
+    """Duplas de um jogador (`jogador`), do elenco atual (`escopo=elenco`) ou de todos."""
+    try:
+        minimo = max(1, int((qs.get("minimo") or ["1"])[0]))
+    except ValueError:
+        minimo = 1
+    try:
+        limit = max(1, min(int((qs.get("limit") or ["200"])[0]), 2000))
+    except ValueError:
+        limit = 200
+    matriz = carregar_parcerias()
+    jogador = (qs.get("jogador") or [""])[0].strip()
+    escopo = (qs.get("escopo") or ["elenco"])[0].strip()
+    if jogador:
+        items = matriz.parceiros(jogador, minimo=minimo)
+    elif escopo == "todos":
+        items = matriz.matriz(minimo=minimo)
+    else:
+        elenco = carregar_elenco_atual().get("jogadores", [])
+        items = matriz.matriz([j.get("nome", "") for j in elenco], minimo=minimo)
+    return {"jogador": jogador, "escopo": "jogador" if jogador else escopo, "total": len(items), "items": items[:limit]}
+
+
+def serializar_jogos(
+    indice: IndiceBitmap,
+    limite: int | None = None,
+    busca: str = "",
+    filtros: dict | None = None,
+) -> tuple[list[dict], int]:
+    """Jogos filtrados, do mais recente para o mais antigo, e o total antes do limite."""
+    mascara = filtrar_jogos(indice, busca, filtros)
+    indices = indice.indices(mascara)
+    indices.reverse()
+    if limite:
+        indices = indices[:limite]
+    itens = []
+    for idx in indices:
+        jogo = indice.jogos[idx]
         placar = jogo.get("placar") or {}
         itens.append(
             {
                 "data": jogo.get("data", ""),
-                "adversario": adversario,
-                "competicao": competicao,
+                "adversario": str(jogo.get("adversario") or ""),
+                "competicao": str(jogo.get("competicao") or ""),
                 "local": jogo.get("local", ""),
                 "vasco": placar.get("vasco"),
                 "adversario_gols": placar.get("adversario"),
                 "resultado": _resultado_jogo(jogo),
-                "tecnico": tecnico,
+                "tecnico": str(jogo.get("tecnico") or ""),
                 "idx": idx,
-                "_sort_data": _parse_data_br(str(jogo.get("data") or "")),
             }
         )
-    itens.sort(key=lambda x: (x["_sort_data"] is None, x["_sort_data"] or datetime.min), reverse=True)
-    for item in itens:
-        item.pop("_sort_data", None)
-    return itens[:limite] if limite else itens
+    return itens, indice.contar(mascara)
 
 
 def detalhe_jogo_por_indice(idx: int):
@@ -524,144 +698,62 @@ def serializar_futuros(futuros: list[dict]) -> list[dict]:
                 "data": j.get("data", ""),
                 "em_casa": bool(j.get("em_casa", False)),
                 "campeonato": j.get("campeonato", ""),
-                "_sort_data": _parse_data_br(str(j.get("data") or "")),
+                "_sort_data": data_ordinal(j),
             }
         )
-    itens.sort(key=lambda x: (x["_sort_data"] is None, x["_sort_data"] or datetime.max))
+    itens.sort(key=lambda x: (x["_sort_data"] is None, x["_sort_data"] or 0))
     for item in itens:
         item.pop("_sort_data", None)
     return itens
 
 
-def _contagem_goleadores(lista) -> Counter:
-    contagem = Counter()
-    if not isinstance(lista, list):
-        return contagem
-    for item in lista:
-        if isinstance(item, dict):
-            nome = str(item.get("nome", "")).strip()
-            try:
-                qtd = int(item.get("gols", 1))
-            except (TypeError, ValueError):
-                qtd = 1
-            if nome:
-                contagem[nome] += max(1, qtd)
-        elif isinstance(item, str):
-            nome = item.strip()
-            if nome:
-                contagem[nome] += 1
-    return contagem
-
-
-def _formatar_goleadores(contagem: Counter) -> str:
-    if not contagem:
-        return "—"
-    partes = []
-    for nome, qtd in contagem.most_common():
-        partes.append(f"{nome} x{qtd}" if qtd > 1 else nome)
-    return ", ".join(partes)
-
-
 def coletar_retro_por_adversario(adversario: str) -> dict:
-    retro = {
-        "adversario": str(adversario or "").strip(),
-        "partidas": [],
-        "vitorias": 0,
-        "empates": 0,
-        "derrotas": 0,
-        "gols_vasco": 0,
-        "gols_adversario": 0,
-        "artilheiros_vasco": Counter(),
-        "artilheiros_adversario": Counter(),
-    }
-    if not retro["adversario"]:
+    nome = str(adversario or "").strip()
+    if not nome:
         return {
-            **retro,
+            "adversario": "",
+            "partidas": [],
+            "total_partidas": 0,
+            "vitorias": 0,
+            "empates": 0,
+            "derrotas": 0,
+            "gols_vasco": 0,
+            "gols_adversario": 0,
             "artilheiros_vasco": "—",
             "artilheiros_adversario": "—",
-            "total_partidas": 0,
         }
 
-    alvo = retro["adversario"].casefold()
-    for jogo in carregar_jogos():
-        adv_jogo = str(jogo.get("adversario", "")).strip()
-        if not adv_jogo or adv_jogo.casefold() != alvo:
-            continue
-
-        placar = jogo.get("placar") or {}
-        try:
-            gols_vasco = int(placar.get("vasco", 0))
-        except (TypeError, ValueError):
-            gols_vasco = 0
-        try:
-            gols_adv = int(placar.get("adversario", 0))
-        except (TypeError, ValueError):
-            gols_adv = 0
-
-        if gols_vasco > gols_adv:
-            resultado_txt = "Vitória"
-            resultado_sigla = "V"
-            retro["vitorias"] += 1
-        elif gols_vasco < gols_adv:
-            resultado_txt = "Derrota"
-            resultado_sigla = "D"
-            retro["derrotas"] += 1
-        else:
-            resultado_txt = "Empate"
-            resultado_sigla = "E"
-            retro["empates"] += 1
-
-        retro["gols_vasco"] += gols_vasco
-        retro["gols_adversario"] += gols_adv
-
-        goleadores_vasco = _contagem_goleadores(jogo.get("gols_vasco", []))
-        goleadores_adv = _contagem_goleadores(jogo.get("gols_adversario", []))
-        retro["artilheiros_vasco"].update(goleadores_vasco)
-        retro["artilheiros_adversario"].update(goleadores_adv)
-
-        data_txt = str(jogo.get("data", "")).strip() or "—"
-        data_ord = _parse_data_br(data_txt)
-        retro["partidas"].append(
+    retro = retrospecto(carregar_indice_adversarios(), nome)
+    partidas = []
+    for partida in reversed(retro["partidas"]):
+        partidas.append(
             {
-                "data": data_txt,
-                "competicao": str(jogo.get("competicao", "")).strip() or "—",
-                "local": "Casa" if str(jogo.get("local", "casa")).strip() == "casa" else "Fora",
-                "placar": f"{gols_vasco} x {gols_adv}",
-                "resultado": resultado_sigla,
-                "resultado_texto": resultado_txt,
-                "gols_vasco": _formatar_goleadores(goleadores_vasco),
-                "gols_adversario": _formatar_goleadores(goleadores_adv),
-                "_sort_data": data_ord,
+                "data": partida["data"],
+                "competicao": partida["competicao"],
+                "local": partida["local"],
+                "placar": partida["placar"],
+                "resultado": partida["resultado"],
+                "resultado_texto": partida["resultado_texto"],
+                "gols_vasco": partida["gols_vasco"],
+                "gols_adversario": partida["gols_adversario"],
             }
         )
-
-    retro["partidas"].sort(key=lambda p: (p["_sort_data"] is None, p["_sort_data"] or datetime.min), reverse=True)
-    for partida in retro["partidas"]:
-        partida.pop("_sort_data", None)
-
     return {
-        "adversario": retro["adversario"],
-        "partidas": retro["partidas"],
-        "total_partidas": len(retro["partidas"]),
+        "adversario": nome,
+        "partidas": partidas,
+        "total_partidas": len(partidas),
         "vitorias": retro["vitorias"],
         "empates": retro["empates"],
         "derrotas": retro["derrotas"],
         "gols_vasco": retro["gols_vasco"],
         "gols_adversario": retro["gols_adversario"],
-        "artilheiros_vasco": _formatar_goleadores(retro["artilheiros_vasco"]),
-        "artilheiros_adversario": _formatar_goleadores(retro["artilheiros_adversario"]),
+        "artilheiros_vasco": formatar_goleadores(retro["artilheiros_vasco"]),
+        "artilheiros_adversario": formatar_goleadores(retro["artilheiros_adversario"]),
     }
 
 
 def listar_adversarios_com_historico() -> list[str]:
-    return sorted(
-        {
-            str(jogo.get("adversario", "")).strip()
-            for jogo in carregar_jogos()
-            if str(jogo.get("adversario", "")).strip()
-        },
-        key=lambda s: s.casefold(),
-    )
+    return listar_adversarios(carregar_indice_adversarios())
 
 
 INDEX_HTML = """<!doctype html>
@@ -2377,19 +2469,33 @@ class StatsVascoWebHandler(BaseHTTPRequestHandler):
             return self._json_response({"ok": True})
 
         if path == "/api/resumo":
-            jogos = carregar_jogos()
-            return self._json_response(resumo_geral(jogos))
+            return self._json_response(resumo_geral())
+
+        if path == "/api/artilheiros":
+            return self._json_response(ranking_artilheiros(qs))
+
+        if path == "/api/parcerias":
+            return self._json_response(listar_parcerias(qs))
+
+        if path == "/api/carrascos":
+            return self._json_response(listar_carrascos(qs))
+
+        if path == "/api/cubo":
+            try:
+                return self._json_response(consultar_cubo(qs))
+            except ValueError as exc:
+                return self._json_response({"erro": str(exc)}, status=HTTPStatus.BAD_REQUEST)
 
         if path == "/api/jogos":
-            jogos = carregar_jogos()
             busca = (qs.get("busca") or [""])[0]
             try:
                 limit = int((qs.get("limit") or ["200"])[0])
             except ValueError:
                 limit = 200
             limit = max(1, min(limit, 5000))
-            items = serializar_jogos(jogos, limite=limit, busca=busca)
-            return self._json_response({"items": items, "total_filtrado": len(items)})
+            filtros = {dim: qs[dim] for dim in DIMENSOES_BITMAP if qs.get(dim)}
+            items, total = serializar_jogos(carregar_indice_bitmap(), limite=limit, busca=busca, filtros=filtros)
+            return self._json_response({"items": items, "total_filtrado": len(items), "total": total})
 
         if path.startswith("/api/jogos/"):
             try: